@@ -49,119 +49,46 @@ export const extractTextFromResume = async (
 };
 
 /**
- * Extract job data from pasted text using AI
+ * Extract job data from pasted text.
+ * The backend parses it with a rule-based extractor and only falls back to AI
+ * when needed; results are cached per job description.
  */
 export const extractJobDataFromText = async (jobDescription: string): Promise<JobData> => {
   try {
-    console.log('Extracting job data from text using AI...');
+    console.log('Extracting job data from text...');
 
-    if (!process.env.REACT_APP_OPENAI_API_KEY) {
-      throw new Error('OpenAI API key not configured. Please set REACT_APP_OPENAI_API_KEY in your .env file.');
-    }
-
-    const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 30000);
-
-    const response = await fetch('https://api.openai.com/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${process.env.REACT_APP_OPENAI_API_KEY}`
+    const response = await axios.post(
+      `${API_URL}/api/parse-job`,
+      {
+        job_description: jobDescription
       },
-      body: JSON.stringify({
-        model: 'gpt-4o-mini',
-        messages: [
-          {
-            role: 'system',
-            content: 'You are a job description analyzer. Extract structured data from job descriptions and return it as JSON.'
-          },
-          {
-            role: 'user',
-            content: `Extract the following information from this job description and return ONLY valid JSON (no markdown, no code blocks, just pure JSON):
-{
-  "title": "job title",
-  "company": "company name",
-  "location": "location",
-  "salary": "$XXk - $XXk or description",
-  "requirements": ["requirement 1", "requirement 2"],
-  "responsibilities": ["responsibility 1"],
-  "skills": ["skill 1", "skill 2"],
-  "technologies": ["tech 1", "tech 2"],
-  "tools": ["tool 1", "tool 2"],
-  "qualifications": ["qualification 1"]
-}
-
-Job Description:
-${jobDescription}`
-          }
-        ],
-        temperature: 0.3,
-        max_tokens: 2000
-      }),
-      signal: controller.signal
-    });
-
-    clearTimeout(timeoutId);
-
-    console.log('OpenAI API Response status:', response.status);
-
-    if (!response.ok) {
-      const errorText = await response.text();
-      let errorData;
-      try {
-        errorData = JSON.parse(errorText);
-      } catch {
-        errorData = { error: { message: errorText } };
-      }
-
-      console.error('OpenAI API error:', response.status, errorData);
-
-      if (response.status === 401) {
-        throw new Error('Invalid OpenAI API key. Please check your API key.');
-      } else if (response.status === 429) {
-        throw new Error('OpenAI rate limit exceeded. Please try again later.');
-      } else if (response.status === 404) {
-        throw new Error('OpenAI model not found. Please check the model name.');
-      } else {
-        throw new Error(`OpenAI API error (${response.status}): ${errorData.error?.message || 'Unknown error'}`);
+      {
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        timeout: 30000,
       }
-    }
-
-    const data = await response.json();
-    console.log('OpenAI API Response:', data);
-
-    if (!data.choices || !data.choices[0] || !data.choices[0].message) {
-      throw new Error('Invalid response structure from OpenAI API');
-    }
-
-    const jsonString = data.choices[0].message.content.trim();
-    console.log('Raw AI response:', jsonString);
+    );
 
-    // Parse the JSON response
-    let jobData;
-    try {
-      jobData = JSON.parse(jsonString);
-    } catch (parseError) {
-      console.error('Failed to parse AI response:', jsonString);
-      throw new Error('AI response is not valid JSON');
+    if (!response.data || !response.data.jobData) {
+      throw new Error('No response from server');
     }
 
-    console.log('Successfully extracted job data:', jobData);
+    console.log(`Job data extracted (source: ${response.data.source}, cached: ${response.data.cacheHit}):`, response.data.jobData);
 
-    return jobData;
+    return response.data.jobData;
   } catch (error: any) {
     console.error('Job data extraction failed:', error);
 
-    // Don't mask specific error messages
-    if (error.message.includes('OpenAI') ||
-        error.message.includes('API key') ||
-        error.message.includes('rate limit') ||
-        error.message.includes('not valid JSON') ||
-        error.message.includes('not configured')) {
-      throw error;
+    if (error.response?.data?.detail) {
+      throw new Error(error.response.data.detail);
+    }
+
+    if (error.code === 'ECONNABORTED') {
+      throw new Error('Job description parsing took too long. Please try again.');
     }
 
-    throw new Error('Failed to extract job data. Please check your OpenAI API key.');
+    throw new Error(error.message || 'Failed to extract job data. Please try again.');
   }
 };
 
@@ -4,6 +4,7 @@ FastAPI application entry point for ATS Resume Analyzer API.
 This module initializes the FastAPI application with proper configuration,
 middleware, and route registration following industry best practices.
 """
+import asyncio
 import os
 import sys
 import logging
@@ -37,7 +38,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import settings
+from src.config.logging_config import configure_logging
+from src.middleware import RequestIdMiddleware
 from src.route.index import register_routes
+from src.services.analysis_service import warm_skill_variations
+from src.services.artifact_sink import close_artifact_sink
+from src.services.extraction_engine import extraction_engine
+from src.services.llm_gateway import LLMGateway, set_llm_gateway
 
 
 # Verify API key is loaded
@@ -47,11 +54,8 @@ else:
     print("⚠ WARNING: OpenAI API key not configured!")
 
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (queued, non-blocking, with request IDs)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -66,8 +70,18 @@ def create_app() -> FastAPI:
     async def lifespan(app: FastAPI):
         """Handle application startup and shutdown using lifespan context."""
         logger.info("ATS Resume Analyzer API starting up...")
+        llm_gateway = LLMGateway.from_settings()
+        set_llm_gateway(llm_gateway)
+        app.state.llm_gateway = llm_gateway
+        # Warm the skill variation cache without delaying startup
+        variation_warmup = asyncio.create_task(warm_skill_variations())
         yield
         logger.info("ATS Resume Analyzer API shutting down...")
+        variation_warmup.cancel()
+        await llm_gateway.aclose()
+        set_llm_gateway(None)
+        await extraction_engine.aclose()
+        close_artifact_sink()
 
     # Initialize FastAPI app with metadata
     app = FastAPI(
@@ -88,6 +102,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Tag every request (and its log records) with a correlation ID
+    app.add_middleware(RequestIdMiddleware)
+
     # Register all routes
     register_routes(app)
     
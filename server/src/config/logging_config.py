@@ -0,0 +1,140 @@
+"""
+Logging setup for the API process and its extraction workers.
+
+Services log through the standard ``logging`` module with lazily formatted
+messages (``logger.info("... %s", value)``), so disabled levels cost almost
+nothing. Handlers never block the event loop: loggers only put records on an
+in-memory queue, and a listener thread formats and writes them. Every record
+carries the ID of the request it was logged for.
+
+Large payloads (resume text, raw LLM output) are logged with log_payload:
+only at DEBUG, only for a sample of calls, and redacted to their length and
+a hash unless LOG_RESUME_TEXT is set.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .settings import settings
+from ..request_context import get_request_id
+
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request ID (or "-") to every record as ``request_id``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "requestId": getattr(record, "request_id", "-"),
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.log_format.lower() == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through a queue to a listener thread writing to stderr.
+    Safe to call more than once; later calls replace the previous setup.
+    """
+    global _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_build_formatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Filters run in the logging thread, where the request ID is known
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
+
+    stop_logging()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def configure_worker_logging() -> None:
+    """
+    Logging setup for extraction worker processes: a forked worker inherits
+    the queue handler but not the listener thread draining it, so workers
+    write to stderr directly.
+    """
+    global _listener
+    _listener = None
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_build_formatter())
+    stream_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [stream_handler]
+    root.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def redact_text(text: str) -> str:
+    """Describe ``text`` by its length and hash instead of its contents."""
+    digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()[:12]
+    return f"<{len(text)} chars, sha256 {digest}>"
+
+
+def log_payload(logger: logging.Logger, label: str, text: str, level: int = logging.DEBUG) -> None:
+    """
+    Log a large payload such as resume text or a raw LLM response.
+
+    Logged only when ``level`` is enabled and for a LOG_PAYLOAD_SAMPLE_RATE
+    fraction of calls; the text is truncated to LOG_PAYLOAD_MAX_CHARS, or
+    redacted unless LOG_RESUME_TEXT is set.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if random.random() >= settings.log_payload_sample_rate:
+        return
+
+    if settings.log_resume_text:
+        shown = text[:settings.log_payload_max_chars]
+    else:
+        shown = redact_text(text)
+    logger.log(level, "%s: %s", label, shown)
@@ -4,6 +4,7 @@ Configuration settings for the ATS Resume Analyzer API.
 Settings are loaded from environment variables with sensible defaults.
 """
 import os
+from pathlib import Path
 from typing import List
 
 
@@ -19,6 +20,12 @@ class Settings:
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_format: str = os.getenv("LOG_FORMAT", "text")  # text or json (one object per line)
+    # Resume text and raw LLM output are only logged at DEBUG, for this fraction of
+    # calls, and redacted to a length and hash unless LOG_RESUME_TEXT is set
+    log_payload_sample_rate: float = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+    log_resume_text: bool = os.getenv("LOG_RESUME_TEXT", "false").lower() == "true"
+    log_payload_max_chars: int = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))
 
     # CORS configuration
     allowed_origins: List[str] = [
@@ -29,12 +36,119 @@ class Settings:
     ]
 
     # File upload configuration
-    allowed_file_types: List[str] = [".pdf", ".doc", ".docx", ".txt"]
+    allowed_file_types: List[str] = [".pdf", ".docx", ".txt"]
     max_file_size: int = 10 * 1024 * 1024  # 10MB in bytes
 
+    # Extraction engine configuration (PDF parsing and OCR run in worker processes)
+    extraction_workers: int = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+    extraction_max_queue: int = int(os.getenv("EXTRACTION_MAX_QUEUE", "16"))
+    extraction_timeout: float = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
+
+    # OCR configuration. Each extraction worker OCRs up to ocr_workers pages at once,
+    # so up to extraction_workers x ocr_workers Tesseract processes run together;
+    # by default every worker gets its share of the CPUs
+    ocr_max_pages: int = int(os.getenv("OCR_MAX_PAGES", "5"))
+    ocr_workers: int = int(os.getenv(
+        "OCR_WORKERS",
+        str(max(1, (os.cpu_count() or 2) // max(1, extraction_workers)))
+    ))
+    ocr_initial_dpi: int = int(os.getenv("OCR_INITIAL_DPI", "150"))
+    ocr_max_dpi: int = int(os.getenv("OCR_MAX_DPI", "300"))
+    ocr_min_confidence: float = float(os.getenv("OCR_MIN_CONFIDENCE", "70"))
+    ocr_target_chars: int = int(os.getenv("OCR_TARGET_CHARS", "8000"))
+    ocr_page_min_chars: int = int(os.getenv("OCR_PAGE_MIN_CHARS", "20"))  # Below this a page is treated as scanned
+
+    # Extraction cache configuration (backend: sqlite, disk or memory)
+    extraction_cache_backend: str = os.getenv("EXTRACTION_CACHE_BACKEND", "sqlite")
+    extraction_cache_path: str = os.getenv(
+        "EXTRACTION_CACHE_PATH",
+        str(Path(__file__).resolve().parent.parent.parent / ".cache" / "extraction")
+    )
+    extraction_cache_memory_entries: int = int(os.getenv("EXTRACTION_CACHE_MEMORY_ENTRIES", "256"))
+    # Persistent tier limits (0 disables a limit); entries expire after 30 days by default
+    extraction_cache_max_entries: int = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+    extraction_cache_ttl: float = float(os.getenv("EXTRACTION_CACHE_TTL", str(30 * 24 * 3600)))
+
+    # In-memory result caches (0 disables a limit)
+    analysis_cache_max_entries: int = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "512"))
+    analysis_cache_max_bytes: int = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    analysis_cache_ttl: float = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+    keyword_filter_cache_max_entries: int = int(os.getenv("KEYWORD_FILTER_CACHE_MAX_ENTRIES", "1024"))
+    keyword_filter_cache_ttl: float = float(os.getenv("KEYWORD_FILTER_CACHE_TTL", "86400"))
+    skill_variations_cache_max_entries: int = int(os.getenv("SKILL_VARIATIONS_CACHE_MAX_ENTRIES", "10000"))
+    skill_variations_cache_ttl: float = float(os.getenv("SKILL_VARIATIONS_CACHE_TTL", "604800"))
+    resume_document_cache_max_entries: int = int(os.getenv("RESUME_DOCUMENT_CACHE_MAX_ENTRIES", "256"))
+
+    # Bundled skill taxonomy
+    skill_taxonomy_path: str = os.getenv(
+        "SKILL_TAXONOMY_PATH",
+        str(Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json")
+    )
+
+    # Persistent AI skill variation answers, versioned by openai_model (empty disables)
+    skill_variation_store_path: str = os.getenv(
+        "SKILL_VARIATION_STORE_PATH",
+        str(Path(__file__).resolve().parent.parent.parent / ".cache" / "skill_variations.sqlite3")
+    )
+
+    # Debug artifacts (extracted and optimized resume text), written in the background.
+    # Off by default; sample rate is the fraction of requests kept, limits of 0 disable them
+    artifact_sink_enabled: bool = os.getenv("ARTIFACT_SINK_ENABLED", "false").lower() == "true"
+    artifact_sink_path: str = os.getenv(
+        "ARTIFACT_SINK_PATH",
+        str(Path(__file__).resolve().parent.parent.parent / ".cache" / "artifacts")
+    )
+    artifact_sample_rate: float = float(os.getenv("ARTIFACT_SAMPLE_RATE", "1.0"))
+    artifact_max_files: int = int(os.getenv("ARTIFACT_MAX_FILES", "200"))
+    artifact_max_age: float = float(os.getenv("ARTIFACT_MAX_AGE", "604800"))
+    artifact_queue_size: int = int(os.getenv("ARTIFACT_QUEUE_SIZE", "64"))
+
+    # Batch keyword analysis
+    batch_analysis_max_items: int = int(os.getenv("BATCH_ANALYSIS_MAX_ITEMS", "200"))
+    batch_analysis_concurrency: int = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "8"))
+
+    # Candidate ranking
+    ranking_max_candidates: int = int(os.getenv("RANKING_MAX_CANDIDATES", "20000"))
+    ranking_max_ngram: int = int(os.getenv("RANKING_MAX_NGRAM", "3"))
+    candidate_index_cache_max_entries: int = int(os.getenv("CANDIDATE_INDEX_CACHE_MAX_ENTRIES", "8"))
+
+    # Job description parsing (the LLM is only used below this rule-based confidence)
+    job_parse_min_confidence: float = float(os.getenv("JOB_PARSE_MIN_CONFIDENCE", "0.6"))
+    job_parse_cache_max_entries: int = int(os.getenv("JOB_PARSE_CACHE_MAX_ENTRIES", "1024"))
+    job_parse_cache_ttl: float = float(os.getenv("JOB_PARSE_CACHE_TTL", "86400"))
+    job_description_max_chars: int = int(os.getenv("JOB_DESCRIPTION_MAX_CHARS", "50000"))
+
+    # Shared result cache backend for analysis/keyword-filter results: memory, sqlite or redis
+    # (redis requires the optional redis package)
+    cache_backend: str = os.getenv("CACHE_BACKEND", "sqlite")
+    cache_sqlite_path: str = os.getenv(
+        "CACHE_SQLITE_PATH",
+        str(Path(__file__).resolve().parent.parent.parent / ".cache" / "results.sqlite3")
+    )
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    shared_cache_max_entries: int = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "100000"))
+
+    # Admin endpoints require this token in the X-Admin-Token header (disabled if unset)
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Prometheus text-format metrics at /api/metrics (per API process; no admin token needed)
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
     # OpenAI configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    openai_base_url: str = os.getenv("OPENAI_BASE_URL", "")  # e.g. a local fake server in tests
+
+    # Shared OpenAI gateway: connection pool, concurrency limit, timeouts and retries
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+    llm_timeout: float = float(os.getenv("LLM_TIMEOUT", "60"))
+    llm_optimize_timeout: float = float(os.getenv("LLM_OPTIMIZE_TIMEOUT", "180"))
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    llm_backoff_base: float = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+    llm_backoff_max: float = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+    skill_variation_batch_size: int = int(os.getenv("SKILL_VARIATION_BATCH_SIZE", "40"))
+    skill_variation_concurrency: int = int(os.getenv("SKILL_VARIATION_CONCURRENCY", "5"))
 
 
 # Create a singleton instance
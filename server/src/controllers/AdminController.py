@@ -0,0 +1,130 @@
+"""
+AdminController module for operational endpoints such as cache inspection
+and metrics.
+"""
+import asyncio
+import hmac
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..config import settings
+from ..services.artifact_sink import get_artifact_sink
+from ..services.cache import get_cache, list_caches
+from ..services.cache_backends import list_shared_backends
+from ..services.extraction_cache import EXTRACTION_MEMORY_CACHE_NAME, get_extraction_cache
+from ..services.metrics import CONTENT_TYPE, render_metrics
+from ..services.single_flight import list_flights
+
+
+class AdminController:
+    """Controller class for administrative operations."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def authorize(self, admin_token: Optional[str]) -> None:
+        """
+        Verify the caller may use admin endpoints.
+
+        The X-Admin-Token header must match ADMIN_TOKEN. Without a configured
+        token the endpoints are disabled.
+
+        Raises:
+            HTTPException: If the caller is not authorized
+        """
+        if not settings.admin_token:
+            raise HTTPException(
+                status_code=403,
+                detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them."
+            )
+        if admin_token is None or not hmac.compare_digest(
+            admin_token.encode("utf-8"), settings.admin_token.encode("utf-8")
+        ):
+            raise HTTPException(status_code=401, detail="Invalid admin token")
+
+    async def get_cache_stats(self, admin_token: Optional[str]) -> Dict[str, Any]:
+        """
+        Return usage and hit/miss/eviction statistics for every registered cache,
+        in-flight/coalescing counters for every single-flight group, and the
+        debug artifact sink's write/drop/error counters (null when disabled).
+
+        Args:
+            admin_token (Optional[str]): Value of the X-Admin-Token header
+
+        Returns:
+            Dict[str, Any]: Cache statistics keyed by cache name
+        """
+        self.authorize(admin_token)
+        sink = get_artifact_sink()
+        return {
+            "success": True,
+            "caches": {cache.name: cache.stats() for cache in list_caches()},
+            "singleFlight": {flight.name: flight.stats() for flight in list_flights()},
+            "artifactSink": sink.stats() if sink is not None else None
+        }
+
+    async def get_metrics(self) -> PlainTextResponse:
+        """
+        Return stage latency histograms, LLM request and token counters and
+        cache statistics in the Prometheus text format.
+
+        Unlike the other admin endpoints this needs no admin token, so
+        scrapers can reach it; set METRICS_ENABLED=false to turn it off.
+
+        Returns:
+            PlainTextResponse: Metrics of this API process
+
+        Raises:
+            HTTPException: If metrics are disabled
+        """
+        if not settings.metrics_enabled:
+            raise HTTPException(status_code=404, detail="Metrics are disabled")
+        return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+    async def flush_caches(self, admin_token: Optional[str], name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Flush one cache by name, or every registered cache.
+        Counts report entries dropped from this worker's memory. The shared
+        SQLite/Redis stores behind the analysis and keyword filter caches and
+        the persistent extraction cache are emptied as well; the skill
+        variation store is not.
+
+        Args:
+            admin_token (Optional[str]): Value of the X-Admin-Token header
+            name (Optional[str]): Cache to flush; all caches when omitted
+
+        Returns:
+            Dict[str, Any]: Number of entries dropped per cache
+
+        Raises:
+            HTTPException: If the named cache does not exist
+        """
+        self.authorize(admin_token)
+
+        if name is not None:
+            cache = get_cache(name)
+            if cache is None:
+                raise HTTPException(status_code=404, detail=f"Unknown cache: {name}")
+            caches = [cache]
+        else:
+            caches = list_caches()
+
+        flushed = {cache.name: cache.clear() for cache in caches}
+
+        # Caches backed by a shared store are flushed there too, for every worker
+        for backend in list_shared_backends():
+            if backend.name in flushed:
+                await backend.clear()
+
+        if EXTRACTION_MEMORY_CACHE_NAME in flushed:
+            await asyncio.to_thread(get_extraction_cache().clear)
+
+        self.logger.info("Flushed caches: %s", flushed)
+
+        return {
+            "success": True,
+            "flushed": flushed
+        }
@@ -1,13 +1,32 @@
 """
 AnalyzeController module for handling resume analysis endpoints.
 """
+import asyncio
+import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from ..config import settings
-from ..services.analysis_service import extract_text_from_pdf, analyze_resume_against_job, generate_optimized_resume
+from ..services.analysis_service import (
+    extract_text_from_document,
+    analyze_resume_against_job,
+    analyze_keyword_batch,
+    generate_optimized_resume,
+    stream_optimized_resume
+)
+from ..services.document_parsers import DocumentParseError
+from ..services.extraction_engine import ExtractionEngineSaturated, ExtractionTimeout
+from ..services.job_parser import parse_job_description
+from ..services.ranking_engine import build_candidate_index, get_candidate_index
+from ..services.upload_intake import UploadRejected, read_upload
+
+
+class JobParseRequest(BaseModel):
+    """Request model for job description parsing."""
+    job_description: str
 
 
 class KeywordAnalysisRequest(BaseModel):
@@ -16,6 +35,34 @@ class KeywordAnalysisRequest(BaseModel):
     job_data: Dict[str, Any]
 
 
+class BatchKeywordAnalysisRequest(BaseModel):
+    """
+    Request model for batch keyword analysis.
+
+    Either one resume_text against many jobs, or one job_data against many
+    resumes.
+    """
+    resume_text: Optional[str] = None
+    jobs: List[Dict[str, Any]] = []
+    job_data: Optional[Dict[str, Any]] = None
+    resumes: List[str] = []
+
+
+class CandidateRankingRequest(BaseModel):
+    """
+    Request model for candidate ranking.
+
+    Send the candidate resumes (and optional candidate_ids) to index them, or
+    the index_id returned by an earlier request to rank the same pool again.
+    """
+    job_data: Dict[str, Any]
+    resumes: List[str] = []
+    candidate_ids: Optional[List[str]] = None
+    index_id: Optional[str] = None
+    top_k: int = 10
+    weights: Dict[str, float] = {}
+
+
 class ResumeOptimizationRequest(BaseModel):
     """Request model for resume optimization/generation."""
     original_resume_text: str
@@ -32,10 +79,10 @@ class AnalyzeController:
     
     async def extract_text_from_resume(self, resume: UploadFile = File(...)) -> Dict[str, Any]:
         """
-        Extract text from uploaded PDF resume.
+        Extract text from an uploaded PDF, DOCX or TXT resume.
         
         Args:
-            resume (UploadFile): The uploaded PDF file
+            resume (UploadFile): The uploaded resume file
             
         Returns:
             Dict[str, Any]: Dictionary containing extraction results
@@ -44,41 +91,38 @@ class AnalyzeController:
             HTTPException: If file validation fails or extraction errors occur
         """
         try:
-            # Validate file type
-            if not resume.filename:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Filename is required"
-                )
-            
-            file_extension = "." + resume.filename.lower().split('.')[-1]
-            if file_extension not in settings.allowed_file_types:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Only {', '.join(settings.allowed_file_types)} files are supported"
-                )
+            # Read the upload in chunks, rejecting it as soon as it is too large
+            # or its content does not match its extension
+            try:
+                upload = await read_upload(resume, settings.max_file_size, settings.allowed_file_types)
+            except UploadRejected as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
-            # Read file content
-            resume_content = await resume.read()
+            self.logger.info("Extracting text from: %s", resume.filename)
 
-            # Validate file content and size
-            if not resume_content:
+            # Call the text extraction service
+            try:
+                extracted_data = await extract_text_from_document(
+                    upload.content,
+                    upload.file_type,
+                    content_hash=upload.content_hash
+                )
+            except DocumentParseError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except ExtractionEngineSaturated as e:
+                self.logger.warning("Rejecting %s: %s", resume.filename, e)
                 raise HTTPException(
-                    status_code=400, 
-                    detail="Empty file provided"
+                    status_code=503,
+                    detail="Server is busy processing other resumes. Please try again shortly.",
+                    headers={"Retry-After": "5"}
                 )
-            
-            if len(resume_content) > settings.max_file_size:
+            except ExtractionTimeout as e:
+                self.logger.error("Text extraction timed out for %s: %s", resume.filename, e)
                 raise HTTPException(
-                    status_code=400,
-                    detail=f"File size exceeds maximum allowed size of {settings.max_file_size // (1024*1024)}MB"
+                    status_code=504,
+                    detail="Text extraction took too long. Please try a smaller or text-based PDF."
                 )
 
-            self.logger.info(f"Extracting text from: {resume.filename}")
-
-            # Call the text extraction service
-            extracted_data = await extract_text_from_pdf(resume_content)
-
             # Prepare response
             response_data = {
                 "success": True,
@@ -87,12 +131,15 @@ class AnalyzeController:
                 "text": extracted_data["text"],
                 "fullText": extracted_data["text"],
                 "preview": extracted_data["text"][:2000],
-                "fullTextLength": len(extracted_data["text"])
+                "fullTextLength": len(extracted_data["text"]),
+                "cacheHit": extracted_data.get("cacheHit", False),
+                # Scanned pages beyond OCR_MAX_PAGES whose text is missing
+                "ocrSkippedPages": extracted_data.get("ocrSkippedPages", [])
             }
             
             self.logger.info(
-                f"Text extraction successful for {resume.filename}. "
-                f"Extracted {response_data['textLength']} characters"
+                "Text extraction successful for %s. Extracted %s characters",
+                resume.filename, response_data['textLength']
             )
             
             return response_data
@@ -101,7 +148,7 @@ class AnalyzeController:
             # Re-raise HTTPExceptions as they are already properly formatted
             raise
         except Exception as e:
-            self.logger.error(f"Text extraction error for {resume.filename}: {str(e)}")
+            self.logger.error("Text extraction error for %s: %s", resume.filename, e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Text extraction failed: {str(e)}"
@@ -120,6 +167,52 @@ class AnalyzeController:
             "message": "Resume analysis service is operational"
         }
 
+    async def parse_job(self, request: JobParseRequest) -> Dict[str, Any]:
+        """
+        Parse a pasted job description into structured job data.
+        
+        Args:
+            request (JobParseRequest): Contains job_description
+            
+        Returns:
+            Dict[str, Any]: Job data plus how it was obtained (rules or AI)
+            
+        Raises:
+            HTTPException: If validation fails or parsing errors occur
+        """
+        try:
+            if not request.job_description or len(request.job_description.strip()) < 20:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Job description is required and must contain meaningful content"
+                )
+
+            if len(request.job_description) > settings.job_description_max_chars:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Job description exceeds maximum length of {settings.job_description_max_chars} characters"
+                )
+
+            self.logger.info("Parsing job description...")
+
+            parse_result = await parse_job_description(request.job_description)
+
+            self.logger.info(
+                "Job parsing complete. Source: %s, confidence: %s, cache hit: %s",
+                parse_result['source'], parse_result['confidence'], parse_result['cacheHit']
+            )
+
+            return {"success": True, **parse_result}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error("Job parsing error: %s", e)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Job parsing failed: {str(e)}"
+            )
+
     async def analyze_keywords(self, request: KeywordAnalysisRequest) -> Dict[str, Any]:
         """
         Analyze resume text against job data to find missing keywords.
@@ -156,7 +249,7 @@ class AnalyzeController:
             )
             
             self.logger.info(
-                f"Keyword analysis complete. Match score: {analysis_result['matchScore']}%"
+                "Keyword analysis complete. Match score: %s%%", analysis_result['matchScore']
             )
             
             return analysis_result
@@ -164,12 +257,136 @@ class AnalyzeController:
         except HTTPException:
             raise
         except Exception as e:
-            self.logger.error(f"Keyword analysis error: {str(e)}")
+            self.logger.error("Keyword analysis error: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Keyword analysis failed: {str(e)}"
             )
 
+    async def analyze_keywords_batch(self, request: BatchKeywordAnalysisRequest) -> StreamingResponse:
+        """
+        Analyze one resume against many jobs, or many resumes against one job.
+
+        Results are streamed as newline-delimited JSON in completion order, one
+        line per pair with the same fields as the single analysis endpoint plus
+        "index": the position of the job (one resume mode) or of the resume
+        (one job mode) in the request. Pairs that fail produce a line with
+        "success": false and an "error" message.
+        
+        Args:
+            request (BatchKeywordAnalysisRequest): resume_text with jobs, or
+                job_data with resumes
+            
+        Returns:
+            StreamingResponse: application/x-ndjson response
+            
+        Raises:
+            HTTPException: If validation fails
+        """
+        pairs = self._build_batch_pairs(request)
+
+        self.logger.info("Starting batch keyword analysis of %s pairs...", len(pairs))
+
+        async def result_stream():
+            completed = 0
+            async for result in analyze_keyword_batch(pairs):
+                completed += 1
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+            self.logger.info("Batch keyword analysis complete. %s pairs analyzed", completed)
+
+        return StreamingResponse(
+            result_stream(),
+            media_type="application/x-ndjson",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"  # Disable proxy buffering so results flush immediately
+            }
+        )
+
+    async def rank_candidates(self, request: CandidateRankingRequest) -> Dict[str, Any]:
+        """
+        Rank candidate resumes against a job by keyword coverage.
+        
+        Args:
+            request (CandidateRankingRequest): Contains job_data and either
+                resumes or the index_id of an already indexed pool
+            
+        Returns:
+            Dict[str, Any]: Index ID and the top_k ranked candidates
+            
+        Raises:
+            HTTPException: If validation fails, the index is unknown or ranking errors occur
+        """
+        try:
+            if not request.job_data:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Job data is required"
+                )
+
+            if request.top_k < 1:
+                raise HTTPException(
+                    status_code=400,
+                    detail="top_k must be at least 1"
+                )
+
+            if request.index_id:
+                index = get_candidate_index(request.index_id)
+                if index is None:
+                    raise HTTPException(
+                        status_code=404,
+                        detail="Candidate index not found. Send the resumes again to rebuild it."
+                    )
+            else:
+                if not request.resumes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Either resumes or index_id is required"
+                    )
+
+                if len(request.resumes) > settings.ranking_max_candidates:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Number of candidates exceeds maximum of {settings.ranking_max_candidates}"
+                    )
+
+                if request.candidate_ids is not None and len(request.candidate_ids) != len(request.resumes):
+                    raise HTTPException(
+                        status_code=400,
+                        detail="candidate_ids must have one entry per resume"
+                    )
+
+                self.logger.info("Indexing %s candidate resumes...", len(request.resumes))
+
+                # Tokenizing a large pool is CPU-bound; keep it off the event loop
+                index = await asyncio.to_thread(
+                    build_candidate_index,
+                    request.resumes,
+                    request.candidate_ids
+                )
+
+            result = await asyncio.to_thread(
+                index.rank,
+                request.job_data,
+                top_k=request.top_k,
+                weights=request.weights
+            )
+
+            self.logger.info(
+                "Ranked %s candidates against %s keywords", result['totalCandidates'], result['totalKeywords']
+            )
+
+            return {"success": True, "indexId": index.index_id, **result}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error("Candidate ranking error: %s", e)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Candidate ranking failed: {str(e)}"
+            )
+
     async def optimize_resume(self, request: ResumeOptimizationRequest) -> Dict[str, Any]:
         """
         Generate an optimized resume based on selected keywords.
@@ -189,26 +406,10 @@ class AnalyzeController:
         """
         try:
             # Validate inputs
-            if not request.original_resume_text or len(request.original_resume_text.strip()) < 50:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Original resume text is required and must contain meaningful content"
-                )
-            
-            if not request.job_description or len(request.job_description.strip()) < 50:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Job description is required and must contain meaningful content"
-                )
-            
-            if not request.selected_keywords or len(request.selected_keywords) == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="At least one keyword must be selected for optimization"
-                )
+            self._validate_optimization_request(request)
 
             self.logger.info(
-                f"Starting resume optimization with {len(request.selected_keywords)} keywords..."
+                "Starting resume optimization with %s keywords...", len(request.selected_keywords)
             )
             
             # Call the optimization service
@@ -221,11 +422,11 @@ class AnalyzeController:
             
             if optimization_result.get("success"):
                 self.logger.info(
-                    f"Resume optimization complete. ATS Score: {optimization_result.get('atsScore', 'N/A')}%"
+                    "Resume optimization complete. ATS Score: %s%%", optimization_result.get('atsScore', 'N/A')
                 )
             else:
                 self.logger.warning(
-                    f"Resume optimization failed: {optimization_result.get('message', 'Unknown error')}"
+                    "Resume optimization failed: %s", optimization_result.get('message', 'Unknown error')
                 )
             
             return optimization_result
@@ -233,8 +434,141 @@ class AnalyzeController:
         except HTTPException:
             raise
         except Exception as e:
-            self.logger.error(f"Resume optimization error: {str(e)}")
+            self.logger.error("Resume optimization error: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Resume optimization failed: {str(e)}"
             )
+
+    async def optimize_resume_stream(self, request: ResumeOptimizationRequest) -> StreamingResponse:
+        """
+        Stream an optimized resume as Server-Sent Events.
+
+        Emits "token" events carrying pieces of the resume text while the model
+        generates it, followed by one "result" event with the same payload as
+        the non-streaming endpoint (keyword verification, ATS score, tips).
+        
+        Args:
+            request (ResumeOptimizationRequest): Contains original_resume_text,
+                job_description, selected_keywords, and optional job_title
+            
+        Returns:
+            StreamingResponse: text/event-stream response
+            
+        Raises:
+            HTTPException: If validation fails
+        """
+        self._validate_optimization_request(request)
+
+        self.logger.info(
+            "Starting streamed resume optimization with %s keywords...", len(request.selected_keywords)
+        )
+
+        async def event_stream():
+            async for event in stream_optimized_resume(
+                original_resume_text=request.original_resume_text,
+                job_description=request.job_description,
+                selected_keywords=request.selected_keywords,
+                job_title=request.job_title
+            ):
+                yield self._format_sse(event["event"], event["data"])
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"  # Disable proxy buffering so tokens flush immediately
+            }
+        )
+
+    @staticmethod
+    def _build_batch_pairs(request: BatchKeywordAnalysisRequest) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Validate a batch analysis request and expand it into (resume_text, job_data) pairs.
+
+        Raises:
+            HTTPException: If the request mixes or omits modes, is too large,
+                or contains an empty resume or job
+        """
+        one_resume = request.resume_text is not None
+        one_job = request.job_data is not None
+
+        if one_resume == one_job:
+            raise HTTPException(
+                status_code=400,
+                detail="Provide either resume_text with jobs, or job_data with resumes"
+            )
+
+        items = request.jobs if one_resume else request.resumes
+        if not items:
+            raise HTTPException(
+                status_code=400,
+                detail="At least one job is required" if one_resume else "At least one resume is required"
+            )
+
+        if len(items) > settings.batch_analysis_max_items:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch size exceeds maximum of {settings.batch_analysis_max_items} items"
+            )
+
+        if one_resume:
+            if len(request.resume_text.strip()) < 10:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Resume text is required and must contain meaningful content"
+                )
+            for index, job_data in enumerate(request.jobs):
+                if not job_data:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Job data is required (jobs[{index}])"
+                    )
+            return [(request.resume_text, job_data) for job_data in request.jobs]
+
+        if not request.job_data:
+            raise HTTPException(
+                status_code=400,
+                detail="Job data is required"
+            )
+        for index, resume_text in enumerate(request.resumes):
+            if len(resume_text.strip()) < 10:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Resume text is required and must contain meaningful content (resumes[{index}])"
+                )
+        return [(resume_text, request.job_data) for resume_text in request.resumes]
+
+    @staticmethod
+    def _validate_optimization_request(request: ResumeOptimizationRequest) -> None:
+        """
+        Validate a resume optimization request.
+
+        Raises:
+            HTTPException: If a required field is missing or too short
+        """
+        if not request.original_resume_text or len(request.original_resume_text.strip()) < 50:
+            raise HTTPException(
+                status_code=400,
+                detail="Original resume text is required and must contain meaningful content"
+            )
+        
+        if not request.job_description or len(request.job_description.strip()) < 50:
+            raise HTTPException(
+                status_code=400,
+                detail="Job description is required and must contain meaningful content"
+            )
+        
+        if not request.selected_keywords or len(request.selected_keywords) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="At least one keyword must be selected for optimization"
+            )
+
+    @staticmethod
+    def _format_sse(event: str, data: Any) -> str:
+        """
+        Format one Server-Sent Event.
+        """
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
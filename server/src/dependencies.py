@@ -4,6 +4,7 @@ Dependency injection configuration for the application.
 from typing import Annotated
 from fastapi import Depends
 
+from .controllers.AdminController import AdminController
 from .controllers.AnalyzeController import AnalyzeController
 from .services.analysis_service import extract_text_from_pdf
 
@@ -21,6 +22,17 @@ class Dependencies:
         """
         return AnalyzeController()
 
+    @staticmethod
+    def get_admin_controller() -> AdminController:
+        """
+        Get AdminController instance.
+        
+        Returns:
+            AdminController: Controller instance
+        """
+        return AdminController()
+
 
 # Type aliases for dependency injection
-AnalyzeControllerDep = Annotated[AnalyzeController, Depends(Dependencies.get_analyze_controller)]
\ No newline at end of file
+AnalyzeControllerDep = Annotated[AnalyzeController, Depends(Dependencies.get_analyze_controller)]
+AdminControllerDep = Annotated[AdminController, Depends(Dependencies.get_admin_controller)]
\ No newline at end of file
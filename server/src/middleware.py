@@ -0,0 +1,54 @@
+"""
+ASGI middleware shared by all routes.
+"""
+import re
+
+from .request_context import new_request_id, reset_request_id, set_request_id
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Client-supplied IDs are echoed into logs and headers, so only simple ones are kept
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestIdMiddleware:
+    """
+    Give every HTTP request a correlation ID.
+
+    The ID comes from the request's X-Request-ID header when it is a plain
+    token, and is generated otherwise. It is current (see request_context)
+    while the request is handled and returned in the response's X-Request-ID
+    header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._header_key = REQUEST_ID_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", ()):
+            if key == self._header_key:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or new_request_id()
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((self._header_key, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = set_request_id(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_id(token)
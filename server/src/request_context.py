@@ -0,0 +1,34 @@
+"""
+Per-request correlation IDs.
+
+The request ID middleware stores the ID of the request being handled in a
+context variable, so log records and debug artifacts produced anywhere while
+handling it - including in tasks it spawns and in extraction worker
+processes - can be tied back to the request.
+"""
+import uuid
+from contextvars import ContextVar, Token
+from typing import Optional
+
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def new_request_id() -> str:
+    """Return a new random request ID."""
+    return uuid.uuid4().hex
+
+
+def get_request_id() -> Optional[str]:
+    """Return the ID of the request being handled, or None outside a request."""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]) -> Token:
+    """Set the current request ID; pass the returned token to reset_request_id."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    """Restore the request ID that was current before set_request_id."""
+    _request_id.reset(token)
@@ -1,13 +1,23 @@
 """
 Route configuration module for organizing API endpoints.
 """
-from fastapi import APIRouter, File, UploadFile
-from ..dependencies import AnalyzeControllerDep
-from ..controllers.AnalyzeController import KeywordAnalysisRequest, ResumeOptimizationRequest
+from typing import Optional
+from fastapi import APIRouter, File, Header, UploadFile
+from ..dependencies import AnalyzeControllerDep, AdminControllerDep
+from ..controllers.AnalyzeController import (
+    BatchKeywordAnalysisRequest,
+    CandidateRankingRequest,
+    JobParseRequest,
+    KeywordAnalysisRequest,
+    ResumeOptimizationRequest
+)
 
 # Create router for analyze-related endpoints
 analyze_router = APIRouter(prefix="/api", tags=["analyze"])
 
+# Create router for operational/admin endpoints
+admin_router = APIRouter(prefix="/api/admin", tags=["admin"])
+
 
 @analyze_router.post("/extract-text")
 async def extract_text_endpoint(
@@ -15,10 +25,10 @@ async def extract_text_endpoint(
     controller: AnalyzeControllerDep = None
 ):
     """
-    Extract text from PDF resume for debugging/testing.
+    Extract text from a PDF, DOCX or TXT resume for debugging/testing.
     
     Args:
-        resume (UploadFile): The uploaded PDF file
+        resume (UploadFile): The uploaded resume file
         controller (AnalyzeController): Injected controller instance
         
     Returns:
@@ -41,6 +51,42 @@ async def health_check_endpoint(controller: AnalyzeControllerDep = None):
     return await controller.get_health_status()
 
 
+@analyze_router.get("/metrics")
+async def metrics_endpoint(controller: AdminControllerDep = None):
+    """
+    Export per-stage latency histograms, LLM token usage and cache hit
+    ratios in the Prometheus text format.
+    
+    Args:
+        controller (AdminController): Injected controller instance
+    
+    Returns:
+        text/plain response in the Prometheus exposition format
+    """
+    return await controller.get_metrics()
+
+
+@analyze_router.post("/parse-job")
+async def parse_job_endpoint(
+    request: JobParseRequest,
+    controller: AnalyzeControllerDep = None
+):
+    """
+    Parse a pasted job description into structured job data.
+    
+    Uses a rule-based extractor first and the AI only when its confidence
+    is low. Results are cached per normalized description.
+    
+    Args:
+        request (JobParseRequest): Contains job_description
+        controller (AnalyzeController): Injected controller instance
+        
+    Returns:
+        JSON response with jobData, source, confidence and cacheHit
+    """
+    return await controller.parse_job(request)
+
+
 @analyze_router.post("/analyze-keywords")
 async def analyze_keywords_endpoint(
     request: KeywordAnalysisRequest,
@@ -59,6 +105,49 @@ async def analyze_keywords_endpoint(
     return await controller.analyze_keywords(request)
 
 
+@analyze_router.post("/analyze-keywords/batch")
+async def analyze_keywords_batch_endpoint(
+    request: BatchKeywordAnalysisRequest,
+    controller: AnalyzeControllerDep = None
+):
+    """
+    Analyze one resume against many jobs, or many resumes against one job.
+    
+    Streams one JSON line per pair as soon as its analysis completes.
+    
+    Args:
+        request (BatchKeywordAnalysisRequest): resume_text with jobs, or
+            job_data with resumes
+        controller (AnalyzeController): Injected controller instance
+        
+    Returns:
+        application/x-ndjson response with per-pair analysis results
+    """
+    return await controller.analyze_keywords_batch(request)
+
+
+@analyze_router.post("/rank-candidates")
+async def rank_candidates_endpoint(
+    request: CandidateRankingRequest,
+    controller: AnalyzeControllerDep = None
+):
+    """
+    Rank candidate resumes against a job by keyword coverage.
+    
+    The candidate pool is indexed once; pass the returned indexId instead of
+    the resumes to rank the same pool against other jobs.
+    
+    Args:
+        request (CandidateRankingRequest): Contains job_data and either
+            resumes or index_id, plus optional top_k and weights
+        controller (AnalyzeController): Injected controller instance
+        
+    Returns:
+        JSON response with the ranked candidates
+    """
+    return await controller.rank_candidates(request)
+
+
 @analyze_router.post("/optimize-resume")
 async def optimize_resume_endpoint(
     request: ResumeOptimizationRequest,
@@ -81,6 +170,85 @@ async def optimize_resume_endpoint(
     return await controller.optimize_resume(request)
 
 
+@analyze_router.post("/optimize-resume/stream")
+async def optimize_resume_stream_endpoint(
+    request: ResumeOptimizationRequest,
+    controller: AnalyzeControllerDep = None
+):
+    """
+    Stream an optimized resume as Server-Sent Events.
+    
+    Sends "token" events with resume text as it is generated and a final
+    "result" event with keyword verification and the ATS score.
+    
+    Args:
+        request (ResumeOptimizationRequest): Contains original_resume_text,
+            job_description, selected_keywords, and optional job_title
+        controller (AnalyzeController): Injected controller instance
+        
+    Returns:
+        text/event-stream response
+    """
+    return await controller.optimize_resume_stream(request)
+
+
+@admin_router.get("/caches")
+async def cache_stats_endpoint(
+    controller: AdminControllerDep = None,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Inspect size, limits and hit/miss/eviction counters of all caches,
+    request coalescing counters and debug artifact write/drop counters.
+    
+    Args:
+        controller (AdminController): Injected controller instance
+        x_admin_token (str): Admin token from the X-Admin-Token header
+        
+    Returns:
+        JSON response with statistics per cache
+    """
+    return await controller.get_cache_stats(x_admin_token)
+
+
+@admin_router.delete("/caches")
+async def flush_caches_endpoint(
+    controller: AdminControllerDep = None,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Flush every registered cache.
+    
+    Args:
+        controller (AdminController): Injected controller instance
+        x_admin_token (str): Admin token from the X-Admin-Token header
+        
+    Returns:
+        JSON response with the number of entries dropped per cache
+    """
+    return await controller.flush_caches(x_admin_token)
+
+
+@admin_router.delete("/caches/{name}")
+async def flush_cache_endpoint(
+    name: str,
+    controller: AdminControllerDep = None,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Flush a single cache by name.
+    
+    Args:
+        name (str): Cache name as listed by GET /api/admin/caches
+        controller (AdminController): Injected controller instance
+        x_admin_token (str): Admin token from the X-Admin-Token header
+        
+    Returns:
+        JSON response with the number of entries dropped
+    """
+    return await controller.flush_caches(x_admin_token, name)
+
+
 def register_routes(app):
     """
     Register all route modules with the FastAPI app.
@@ -89,3 +257,4 @@ def register_routes(app):
         app: FastAPI application instance
     """
     app.include_router(analyze_router)
+    app.include_router(admin_router)
@@ -1,27 +1,56 @@
-import os
 import re
+import asyncio
 import json
-import tempfile
 import hashlib
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from io import BytesIO
 
 import PyPDF2
-from pdf2image import convert_from_bytes
-import pytesseract
-from openai import OpenAI
 
+from ..config.logging_config import log_payload
 from ..config.settings import settings
+from .artifact_sink import record_artifact
+from .cache import LRUCache
+from .cache_backends import create_cache_backend
+from .document_parsers import decode_text_file, extract_docx_text
+from .extraction_cache import compute_content_hash, get_extraction_cache
+from .extraction_engine import extraction_engine
+from .keyword_matcher import MatcherEntry, get_matcher
+from .llm_gateway import LLMGateway, get_llm_gateway
+from .metrics import stage_timer
+from .ocr_pipeline import ocr_pdf_pages
+from .resume_document import ResumeDocument, get_resume_document
+from . import text_normalizer
+from .single_flight import SingleFlight
+from .skill_taxonomy import get_skill_taxonomy
+from .variation_store import get_variation_store
+
+
+logger = logging.getLogger(__name__)
 
 
 # =========================================================
 # ---------------- ANALYSIS CACHE -------------------------
 # =========================================================
 
-# In-memory cache for analysis results
-_analysis_cache: Dict[str, Dict[str, Any]] = {}
-_keyword_filter_cache: Dict[str, Dict[str, Any]] = {}
+# Analysis and keyword filtering results, shared across workers by the configured backend
+_analysis_cache = create_cache_backend(
+    "analysis",
+    max_entries=settings.analysis_cache_max_entries,
+    max_bytes=settings.analysis_cache_max_bytes,
+    ttl=settings.analysis_cache_ttl
+)
+_keyword_filter_cache = create_cache_backend(
+    "keyword_filter",
+    max_entries=settings.keyword_filter_cache_max_entries,
+    ttl=settings.keyword_filter_cache_ttl
+)
+
+# Concurrent identical requests share one in-flight computation per cache key
+_analysis_flight = SingleFlight("analysis")
+_keyword_filter_flight = SingleFlight("keyword_filter")
+_skill_variations_flight = SingleFlight("skill_variations")
 
 
 def _generate_cache_key(resume_text: str, job_data: Dict) -> str:
@@ -169,87 +198,173 @@ EXAMPLE 3 - Project Manager:
 
 
 # =========================================================
-# ---------------- PDF EXTRACTION -------------------------
+# ---------------- DOCUMENT EXTRACTION --------------------
 # =========================================================
 
-async def extract_text_from_pdf(pdf_buffer: bytes) -> Dict[str, Any]:
+async def extract_text_from_document(
+        buffer: bytes,
+        file_type: str = ".pdf",
+        content_hash: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Extract text from PDF with fallback to OCR if needed.
-    Returns both extracted text and formatting information.
+    Extract text from an uploaded resume of ``file_type`` (".pdf", ".docx"
+    or ".txt"). Returns both extracted text and formatting information,
+    plus a "cacheHit" flag.
+
+    Results are cached by the SHA-256 of the file bytes (pass ``content_hash``
+    if it is already known). Parsing and OCR run in the extraction engine's
+    worker processes so the event loop stays free while a document is being
+    processed.
+
+    Raises:
+        ValueError: If ``file_type`` is not supported
+        DocumentParseError: If a DOCX file cannot be parsed
     """
-    extracted_text = ""
-    formatting_info = {
-        "sections": [],
-        "hasDetectedFormatting": False,
-        "bulletCount": 0
-    }
+    extractor = _DOCUMENT_EXTRACTORS.get(file_type)
+    if extractor is None:
+        raise ValueError(f"Unsupported file type: {file_type}")
 
-    try:
-        reader = PyPDF2.PdfReader(BytesIO(pdf_buffer))
+    cache = get_extraction_cache()
+    cache_key = content_hash or compute_content_hash(buffer)
 
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                extracted_text += page_text + "\n"
+    with stage_timer("extract", "cache_lookup"):
+        cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        logger.debug("Cache hit for extraction")
+        return {**cached, "cacheHit": True}
 
-        # Normalize text for consistency across extractions
-        extracted_text = _normalize_extracted_text(extracted_text)
+    # Parsing, OCR and normalization run in a worker process, so they are timed as one stage
+    with stage_timer("extract", "parse_" + file_type.lstrip(".")):
+        result = await extraction_engine.run(extractor, buffer)
+    with stage_timer("extract", "cache_store"):
+        await asyncio.to_thread(cache.set, cache_key, result)
+    record_artifact("extracted", result["text"])
 
-        # Normalize bullet points for consistency
-        extracted_text = normalize_bullet_points(extracted_text)
+    return {**result, "cacheHit": False}
 
-        # Detect resume structure
-        formatting_info["sections"] = detect_resume_sections(extracted_text)
-        formatting_info["hasDetectedFormatting"] = bool(formatting_info["sections"])
-        formatting_info["bulletCount"] = count_bullet_points(extracted_text)
 
-        # Fallback to OCR if extraction failed
-        if len(extracted_text.strip()) < 50:
-            print("Primary extraction yielded minimal text. Attempting OCR...")
-            ocr_text = await extract_text_with_ocr(pdf_buffer)
-            if len(ocr_text) > len(extracted_text):
-                extracted_text = _normalize_extracted_text(ocr_text)
-                extracted_text = normalize_bullet_points(extracted_text)
-                formatting_info["sections"] = detect_resume_sections(extracted_text)
-                formatting_info["bulletCount"] = count_bullet_points(extracted_text)
+async def extract_text_from_pdf(pdf_buffer: bytes, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract text from PDF, using OCR for pages that have no text layer.
+    See extract_text_from_document.
+    """
+    return await extract_text_from_document(pdf_buffer, ".pdf", content_hash)
 
-        # Save for debugging and reference
-        save_extracted_text_to_file(extracted_text)
-        save_extracted_text_to_project_base(extracted_text)
 
-        return {
-            "text": extracted_text,
-            "formatting": formatting_info
-        }
+def _extract_text_from_pdf_sync(pdf_buffer: bytes) -> Dict[str, Any]:
+    """
+    Blocking implementation of extract_text_from_pdf.
+    Runs inside an extraction worker process.
+    """
+    try:
+        reader = PyPDF2.PdfReader(BytesIO(pdf_buffer))
+
+        # Classify each page: keep its text layer if usable, otherwise queue it for OCR
+        page_texts: List[str] = []
+        scanned_pages: List[int] = []
+
+        for page_number, page in enumerate(reader.pages, start=1):
+            page_text = page.extract_text() or ""
+            page_texts.append(page_text)
+            if len(page_text.strip()) < settings.ocr_page_min_chars:
+                scanned_pages.append(page_number)
+
+        # OCR only the pages without a usable text layer and merge in page order.
+        # Every detected page up to the limit is OCR'd: stopping at a character
+        # target would drop pages the text layer does not cover
+        ocr_skipped_pages = scanned_pages[settings.ocr_max_pages:]
+        if scanned_pages:
+            logger.info("Pages without a text layer: %s. Running OCR on them", scanned_pages)
+            if ocr_skipped_pages:
+                logger.warning(
+                    "Not running OCR on %d scanned pages beyond OCR_MAX_PAGES=%d: %s",
+                    len(ocr_skipped_pages), settings.ocr_max_pages, ocr_skipped_pages
+                )
+            ocr_pages = ocr_pdf_pages(
+                pdf_buffer,
+                page_numbers=scanned_pages[:settings.ocr_max_pages],
+                target_chars=0
+            )
+            for page_number, ocr_text in ocr_pages.items():
+                if len(ocr_text.strip()) > len(page_texts[page_number - 1].strip()):
+                    page_texts[page_number - 1] = normalize_bullet_points(ocr_text)
+
+        extracted_text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+
+        result = _build_extraction_result(extracted_text)
+        if ocr_skipped_pages:
+            result["ocrSkippedPages"] = ocr_skipped_pages
+        return result
 
     except Exception as e:
-        print(f"PDF extraction error: {e}. Falling back to OCR...")
-        ocr_text = await extract_text_with_ocr(pdf_buffer)
-        ocr_text = _normalize_extracted_text(ocr_text)
-        ocr_text = normalize_bullet_points(ocr_text)
-        formatting_info["bulletCount"] = count_bullet_points(ocr_text)
-        save_extracted_text_to_project_base(ocr_text)
+        logger.warning("PDF extraction error: %s. Falling back to OCR", e)
+        ocr_text = _extract_text_with_ocr_sync(pdf_buffer)
+        ocr_text = text_normalizer.normalize_extracted_text(ocr_text)
         return {
             "text": ocr_text,
-            "formatting": formatting_info
+            "formatting": {
+                "sections": [],
+                "hasDetectedFormatting": False,
+                "bulletCount": count_bullet_points(ocr_text)
+            }
         }
 
 
-async def extract_text_with_ocr(pdf_buffer: bytes) -> str:
+def _extract_text_with_ocr_sync(pdf_buffer: bytes) -> str:
     """
     Use OCR to extract text from PDF images.
-    Processes up to 5 pages with high DPI for accuracy.
+    Streams up to settings.ocr_max_pages pages through the OCR pipeline,
+    stopping early once enough text has been recovered.
     """
-    images = convert_from_bytes(pdf_buffer, dpi=300)
-    text = ""
-
-    for i, image in enumerate(images[:5]):
-        print(f"OCR processing page {i+1}...")
-        text += pytesseract.image_to_string(image, config='--psm 6') + "\n"
+    pages = ocr_pdf_pages(pdf_buffer)
+    text = "".join(pages[page_number] + "\n" for page_number in sorted(pages))
 
     return normalize_bullet_points(text)
 
 
+def _extract_text_from_docx_sync(docx_buffer: bytes) -> Dict[str, Any]:
+    """
+    Extract text from a DOCX file. Runs inside an extraction worker process.
+    """
+    return _build_extraction_result(extract_docx_text(docx_buffer))
+
+
+def _extract_text_from_txt_sync(txt_buffer: bytes) -> Dict[str, Any]:
+    """
+    Extract text from a plain-text file. Runs inside an extraction worker process.
+    """
+    return _build_extraction_result(decode_text_file(txt_buffer))
+
+
+def _build_extraction_result(text: str) -> Dict[str, Any]:
+    """
+    Normalize extracted text and detect its structure, the same way for
+    every file type.
+    """
+    # Normalize text and bullet points for consistency across extractions
+    text = text_normalizer.normalize_extracted_text(text)
+
+    # Detect resume structure
+    sections = detect_resume_sections(text)
+
+    return {
+        "text": text,
+        "formatting": {
+            "sections": sections,
+            "hasDetectedFormatting": bool(sections),
+            "bulletCount": count_bullet_points(text)
+        }
+    }
+
+
+# Extraction function for each supported upload type
+_DOCUMENT_EXTRACTORS = {
+    ".pdf": _extract_text_from_pdf_sync,
+    ".docx": _extract_text_from_docx_sync,
+    ".txt": _extract_text_from_txt_sync,
+}
+
+
 # =========================================================
 # ---------------- TEXT NORMALIZATION ---------------------
 # =========================================================
@@ -258,35 +373,14 @@ def normalize_bullet_points(text: str) -> str:
     """
     Standardize all bullet point styles to '•' for consistency.
     """
-    bullet_patterns = [
-        r'^(\s*)[-–—*▪▫■□◆◇➤➔✓✔>]\s+',
-        r'^(\s*)\u2022\s+',
-        r'^(\s*)·\s+',
-        r'^(\s*)[o]\s+(?=[A-Z])',
-    ]
-
-    lines = text.split("\n")
-    output = []
-
-    for line in lines:
-        modified = False
-        for pattern in bullet_patterns:
-            match = re.match(pattern, line)
-            if match:
-                # Replace with standard bullet
-                line = f"{match.group(1)}• {line[match.end():].strip()}"
-                modified = True
-                break
-        output.append(line)
-
-    return "\n".join(output)
+    return text_normalizer.normalize_bullets(text)
 
 
 def count_bullet_points(text: str) -> int:
     """
     Count the number of bullet points in the text.
     """
-    return len(re.findall(r'^\s*•\s+', text, re.MULTILINE))
+    return get_resume_document(text).bullet_count
 
 
 def clean_encoding_artifacts(text: str) -> str:
@@ -294,101 +388,21 @@ def clean_encoding_artifacts(text: str) -> str:
     Remove problematic encoding artifacts like %Ï that cause formatting issues
     while preserving proper line breaks and structure.
     """
-    if isinstance(text, str):
-        print(f"Input first 300 chars:\n{text[:300]}")
-    else:
-        print(f"Input value (non-string): {str(text)[:300]}")
-    print("=" * 80)
-
     # Ensure text is a string
     if isinstance(text, dict):
-        print("WARNING: Input is dict, converting to string")
+        logger.warning("Generated resume is a dict, converting to string")
         text = str(text)
     elif not isinstance(text, str):
-        print(f"WARNING: Input is {type(text)}, converting to string")
+        logger.warning("Generated resume is a %s, converting to string", type(text).__name__)
         text = str(text) if text else ""
 
     if not text:
-        print("WARNING: Empty text after conversion")
-        return text
-
-    original_length = len(text)
-
-    # Remove ALL variations of the problematic characters
-    text = re.sub(r'%[ÏïĪīÎîØø]', '', text)
-    text = re.sub(r'[ÏïĪīÎîØø]', '', text)
-    text = re.sub(r'%\s*[ÏïĪīÎîØø]', '', text)
-    text = re.sub(r'[ÏïĪīÎîØø]\s*%', '', text)
-
-    # Fix common encoding issues
-    text = text.replace('â€¢', '•')  # Fix bullet points
-    text = text.replace('â€"', '–')  # Fix em dashes
-    text = text.replace('â€™', "'")  # Fix apostrophes
-    text = text.replace('â€œ', '"')  # Fix quotes
-    text = text.replace('â€', '"')   # Fix quotes
-
-    # Clean up multiple spaces but preserve line structure
-    text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs to single space
-    text = re.sub(r' *\n+ *', '\n', text)  # Clean line breaks but keep them
-
-    # Fix bullet point issues - ensure proper bullet formatting
-    text = re.sub(r'^\s*[•●]\s*%[ÏïĪīÎîØø]?\s*', '• ', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*%[ÏïĪīÎîØø]\s*', '• ', text, flags=re.MULTILINE)
-
-    # Fix split section headers
-    text = re.sub(r'PROFESSIONAL\s+EXPERIENCES', 'PROFESSIONAL EXPERIENCES', text)
-    text = re.sub(r'TECHNICAL\s+PROJECTS', 'TECHNICAL PROJECTS', text)
-
-    # Ensure proper section formatting - add line breaks before section headers
-    section_headers = ['EDUCATION', 'TECHNICAL SKILLS', 'PROFESSIONAL EXPERIENCES',
-                      'TECHNICAL PROJECTS', 'PROJECTS', 'LEADERSHIP', 'CERTIFICATIONS']
-
-    for header in section_headers:
-        text = re.sub(f'([^\n]){header}', f'\\1\n\n{header}', text)
-
-    # Ensure bullet points start on new lines and are properly formatted
-    text = re.sub(r'([^\n])•', r'\1\n•', text)
-    text = re.sub(r'([^\n])●', r'\1\n●', text)
-
-    final_text = text.strip()
-
-    return final_text
-
-
-def _normalize_extracted_text(text: str) -> str:
-    """
-    Normalize extracted text to ensure consistency across multiple extractions.
-    Removes inconsistent whitespace while preserving document structure.
-    """
-    if not text:
+        logger.warning("Generated resume is empty")
         return text
 
-    # Normalize line endings
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-
-    # Remove excessive whitespace while preserving single spaces
-    text = re.sub(r'[ \t]+', ' ', text)  # Multiple spaces/tabs to single space
-
-    # Normalize multiple blank lines to maximum of 2
-    text = re.sub(r'\n{3,}', '\n\n', text)
-
-    # Remove trailing/leading whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
-
-    # Remove any zero-width or invisible characters
-    text = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', text)
-
-    # Normalize unicode characters (e.g., different types of dashes, quotes)
-    text = text.replace('\u2013', '-')  # En dash to hyphen
-    text = text.replace('\u2014', '-')  # Em dash to hyphen
-    text = text.replace('\u2018', "'")  # Left single quote
-    text = text.replace('\u2019', "'")  # Right single quote
-    text = text.replace('\u201c', '"')  # Left double quote
-    text = text.replace('\u201d', '"')  # Right double quote
-    text = text.replace('\u2022', '•')  # Bullet point normalization
+    log_payload(logger, "Generated resume before cleanup", text)
 
-    return text.strip()
+    return text_normalizer.clean_encoding_artifacts(text)
 
 
 # =========================================================
@@ -399,228 +413,301 @@ def detect_resume_sections(text: str) -> List[Dict[str, Any]]:
     """
     Identify major resume sections and their positions.
     """
-    sections = []
-
-    # Common section headers with variations
-    patterns = [
-        (r'^(SUMMARY|PROFESSIONAL SUMMARY|PROFILE|OBJECTIVE|CAREER OBJECTIVE)$', 'summary'),
-        (r'^(EXPERIENCES|WORK EXPERIENCE|PROFESSIONAL EXPERIENCES|EMPLOYMENT HISTORY|WORK HISTORY)$', 'experience'),
-        (r'^(EDUCATION|ACADEMIC BACKGROUND)$', 'education'),
-        (r'^(SKILLS|TECHNICAL SKILLS|CORE COMPETENCIES|EXPERTISE)$', 'skills'),
-        (r'^(CERTIFICATIONS|CERTIFICATES|LICENSES)$', 'certifications'),
-        (r'^(PROJECTS|KEY PROJECTS)$', 'projects'),
-    ]
-
-    lines = text.split("\n")
-
-    for i, line in enumerate(lines):
-        stripped = line.strip().upper()
-        for pattern, section_type in patterns:
-            if re.match(pattern, stripped):
-                sections.append({
-                    "name": line.strip(),  # Keep original casing
-                    "type": section_type,
-                    "lineNumber": i
-                })
-                break
-
-    return sections
+    return [dict(section) for section in get_resume_document(text).sections]
 
 
 def extract_experience_bullets(text: str) -> List[str]:
     """
     Extract all bullet points from the experience section.
     """
-    sections = detect_resume_sections(text)
-    experience_section = next((s for s in sections if s['type'] == 'experience'), None)
+    document = get_resume_document(text)
+    experience = document.section('experience')
 
-    if not experience_section:
+    if not experience:
         return []
 
-    lines = text.split("\n")
-    start_line = experience_section['lineNumber']
-
-    # Find next section or end of document
-    next_section = next((s for s in sections if s['lineNumber'] > start_line), None)
-    end_line = next_section['lineNumber'] if next_section else len(lines)
-
-    # Extract bullets between start and end
-    bullets = []
-    for line in lines[start_line:end_line]:
-        if re.match(r'^\s*•\s+', line):
-            bullets.append(line.strip())
-
-    return bullets
+    return [document.lines[i].strip() for i in experience.bullet_lines]
 
 def count_bullets_per_section(text: str) -> Dict[str, int]:
     """
     Count bullets in each section for validation.
     """
-    sections = detect_resume_sections(text)
-    lines = text.split("\n")
-    bullet_counts = {}
+    return {span.type: span.bullet_count for span in get_resume_document(text).section_spans}
 
-    for i, section in enumerate(sections):
-        start_line = section['lineNumber']
-        # Find next section or end
-        next_section = sections[i + 1] if i + 1 < len(sections) else None
-        end_line = next_section['lineNumber'] if next_section else len(lines)
+# =========================================================
+# ---------------- RESUME ANALYSIS ------------------------
+# =========================================================
+
+async def analyze_resume_against_job(
+        resume_text: str,
+        job_data: Dict,
+        document: Optional[ResumeDocument] = None
+) -> Dict[str, Any]:
+    """
+    Compare resume against job description to identify missing and matching keywords.
+    Uses AI to filter out non-actionable keywords.
 
-        # Count bullets in this section
-        count = 0
-        for line in lines[start_line:end_line]:
-            if re.match(r'^\s*•\s+', line):
-                count += 1
+    ``document`` is the resume's ResumeDocument, when the caller already has it.
+    """
+    # Check cache first
+    cache_key = _generate_cache_key(resume_text, job_data)
 
-        bullet_counts[section['type']] = count
+    with stage_timer("analyze", "cache_lookup"):
+        cached_result = await _analysis_cache.get(cache_key)
+    if cached_result is not None:
+        logger.debug("Cache hit for analysis")
+        return cached_result
 
-    return bullet_counts
+    # An identical analysis already in progress is awaited instead of repeated
+    return await _analysis_flight.do(
+        cache_key,
+        lambda: _analyze_uncached(resume_text, job_data, cache_key, document)
+    )
 
-# =========================================================
-# ---------------- FILE SAVING ----------------------------
-# =========================================================
 
-def save_extracted_text_to_file(text: str) -> Optional[str]:
+async def _analyze_uncached(
+        resume_text: str,
+        job_data: Dict,
+        cache_key: str,
+        document: Optional[ResumeDocument] = None
+) -> Dict[str, Any]:
     """
-    Save extracted text to temporary file for debugging.
+    Run the keyword analysis for a cache miss and cache its result.
     """
-    try:
-        tmp = tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=".txt",
-            mode="w",
-            encoding="utf-8"
+    with stage_timer("analyze", "phrase_matching"):
+        job_phrases = collect_job_phrases(job_data)
+
+        if not job_phrases:
+            return _empty_analysis()
+
+        # Lowercased text and punctuation-free words come from the shared index
+        document = document or get_resume_document(resume_text)
+        matching, missing, unresolved = _categorize_job_phrases(job_phrases, document)
+
+    # Resolve AI variations for all remaining single-word phrases at once
+    if unresolved:
+        with stage_timer("analyze", "skill_variations"):
+            variations_by_skill = await resolve_skill_variations([p.lower() for p in unresolved])
+            _apply_skill_variations(unresolved, variations_by_skill, document, matching, missing)
+
+    # Sort for consistency
+    missing = sorted(missing)
+    matching = sorted(matching)
+
+    # Use AI to filter actionable keywords from missing list
+    with stage_timer("analyze", "keyword_filter"):
+        ai_filtered = await filter_keywords_with_ai(
+            missing,
+            job_data.get("title", ""),
+            resume_text
         )
-        tmp.write(text)
-        tmp.close()
-        print(f"Extracted text saved to: {tmp.name}")
-        return tmp.name
-    except Exception as e:
-        print(f"Failed to save extracted text: {e}")
-        return None
 
-def save_extracted_text_to_project_base(text: str) -> None:
-    """
-    Save extracted text to project directory for reference.
-    """
-    try:
-        base = Path(__file__).parent.parent.parent / "resume"
-        base.mkdir(exist_ok=True)
-        path = base / "baseResume.txt"
-        path.write_text(text, encoding="utf-8")
-        print(f"Base resume saved to: {path}")
-    except Exception as e:
-        print(f"Failed to save base resume: {e}")
+    # Save to cache
+    result = _build_analysis_result(job_phrases, matching, missing, ai_filtered)
 
+    with stage_timer("analyze", "cache_store"):
+        await _analysis_cache.set(cache_key, result)
 
-def save_optimized_resume_to_file(text: str) -> Optional[str]:
+    return result
+
+
+async def analyze_keyword_batch(
+        pairs: List[Tuple[str, Dict]],
+        concurrency: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Save optimized resume to project directory.
+    Analyze many (resume_text, job_data) pairs, yielding each result as soon as
+    it is ready, tagged with the pair's position as "index".
+
+    Work shared across the batch is done once: each distinct resume is indexed
+    once and each job's phrases are collected once, AI variations for every
+    unresolved phrase in the batch are resolved in one call, and pairs with
+    identical missing phrases share one keyword-filter request. Remaining work
+    runs concurrently, at most ``concurrency`` keyword filters at a time.
     """
-    try:
-        base = Path(__file__).parent.parent.parent / "resume"
-        base.mkdir(exist_ok=True)
-        path = base / "optimizedResume.txt"
-        path.write_text(text, encoding="utf-8")
-        print(f"Optimized resume saved to: {path}")
-        return str(path)
-    except Exception as e:
-        print(f"Failed to save optimized resume: {e}")
-        return None
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.batch_analysis_concurrency))
+
+    documents: Dict[str, ResumeDocument] = {}
+    phrases_by_job: Dict[int, List[str]] = {}
+    pending = []
+    unresolved_skills = set()
+
+    for index, (resume_text, job_data) in enumerate(pairs):
+        cache_key = _generate_cache_key(resume_text, job_data)
+        cached_result = await _analysis_cache.get(cache_key)
+        if cached_result is not None:
+            yield {"index": index, **cached_result}
+            continue
 
+        try:
+            # Jobs repeat as the same object across the batch, resumes as the same text
+            if id(job_data) not in phrases_by_job:
+                phrases_by_job[id(job_data)] = collect_job_phrases(job_data)
+            job_phrases = phrases_by_job[id(job_data)]
+
+            if not job_phrases:
+                yield {"index": index, **_empty_analysis()}
+                continue
+
+            if resume_text not in documents:
+                documents[resume_text] = get_resume_document(resume_text)
+            document = documents[resume_text]
+
+            matching, missing, unresolved = _categorize_job_phrases(job_phrases, document)
+        except Exception as e:
+            logger.warning("Batch analysis failed for pair %d: %s", index, e)
+            yield {"index": index, "success": False, "error": str(e)}
+            continue
 
-# =========================================================
-# ---------------- RESUME ANALYSIS ------------------------
-# =========================================================
+        unresolved_skills.update(p.lower() for p in unresolved)
+        pending.append((index, resume_text, job_data, cache_key, job_phrases, document, matching, missing, unresolved))
 
-async def analyze_resume_against_job(resume_text: str, job_data: Dict) -> Dict[str, Any]:
-    """
-    Compare resume against job description to identify missing and matching keywords.
-    Uses AI to filter out non-actionable keywords.
-    """
-    # Check cache first
-    cache_key = _generate_cache_key(resume_text, job_data)
+    if not pending:
+        return
+
+    variations_by_skill = {}
+    if unresolved_skills:
+        variations_by_skill = await resolve_skill_variations(sorted(unresolved_skills))
+
+    filter_tasks: Dict[str, asyncio.Task] = {}
 
-    if cache_key in _analysis_cache:
-        print("Cache hit for analysis")
-        return _analysis_cache[cache_key]
+    async def filter_limited(missing: List[str], job_title: str, resume_text: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await filter_keywords_with_ai(missing, job_title, resume_text)
 
-    # Extract all potential keywords from job description
+    async def finish(index, resume_text, job_data, cache_key, job_phrases, document, matching, missing, unresolved):
+        try:
+            _apply_skill_variations(unresolved, variations_by_skill, document, matching, missing)
+            missing = sorted(missing)
+            matching = sorted(matching)
+
+            job_title = job_data.get("title", "")
+            filter_key = _generate_keyword_cache_key(missing, job_title)
+            if filter_key not in filter_tasks:
+                filter_tasks[filter_key] = asyncio.ensure_future(
+                    filter_limited(missing, job_title, resume_text)
+                )
+            ai_filtered = await asyncio.shield(filter_tasks[filter_key])
+
+            result = _build_analysis_result(job_phrases, matching, missing, ai_filtered)
+            await _analysis_cache.set(cache_key, result)
+            return {"index": index, **result}
+        except Exception as e:
+            logger.warning("Batch analysis failed for pair %d: %s", index, e)
+            return {"index": index, "success": False, "error": str(e)}
+
+    tasks = [asyncio.ensure_future(finish(*item)) for item in pending]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # The client may disconnect mid-stream; stop any outstanding work
+        for task in [*tasks, *filter_tasks.values()]:
+            task.cancel()
+
+
+def collect_job_phrases(job_data: Dict) -> List[str]:
+    """
+    Extract all potential keywords from job data, deduplicated and sorted.
+    """
     job_phrases = []
     for field in ["skills", "requirements", "technologies", "tools", "qualifications"]:
         if isinstance(job_data.get(field), list):
             job_phrases.extend(job_data[field])
 
     # Remove duplicates and clean - SORT for consistency
-    job_phrases = sorted(list(set([p.strip() for p in job_phrases if p.strip()])))
+    return sorted(list(set([p.strip() for p in job_phrases if p.strip()])))
 
-    if not job_phrases:
-        return {
-            "success": True,
-            "matchScore": 0,
-            "missingPhrases": [],
-            "matchingPhrases": [],
-            "actionableKeywords": []
-        }
 
-    # Categorize keywords with improved matching logic
+def _empty_analysis() -> Dict[str, Any]:
+    """
+    Analysis result for job data without any keywords.
+    """
+    return {
+        "success": True,
+        "matchScore": 0,
+        "missingPhrases": [],
+        "matchingPhrases": [],
+        "actionableKeywords": []
+    }
+
+
+def _categorize_job_phrases(
+        job_phrases: List[str],
+        document: ResumeDocument
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Split job phrases into matching, missing and unresolved (single-word
+    phrases that still need an AI variation check) against a resume.
+    """
     missing = []
     matching = []
-    resume_lower = resume_text.lower()
+    unresolved = []
 
-    # Normalize resume text for better matching
-    resume_normalized = re.sub(r'[^\w\s]', ' ', resume_lower)  # Remove punctuation
-    resume_words = set(resume_normalized.split())
+    # One scan of the resume finds every exact phrase, plural/singular form
+    # and common variation at once
+    found = get_matcher(_phrase_match_entries(job_phrases)).find(document.lower)
 
     for phrase in job_phrases:
-        phrase_lower = phrase.lower()
-        phrase_normalized = re.sub(r'[^\w\s]', ' ', phrase_lower)
+        if phrase in found:
+            matching.append(phrase)
+            continue
 
-        # Multi-word phrases: check for exact phrase match or word boundary match
-        if ' ' in phrase_normalized:
-            phrase_words = phrase_normalized.split()
-            # Check exact phrase match with word boundaries
-            pattern = r'\b' + re.escape(phrase_lower.strip()) + r'\b'
+        multi_word, phrase_words = split_job_phrase(phrase)
 
-            if re.search(pattern, resume_lower):
-                matching.append(phrase)
-            # Check if all words in the phrase appear in resume
-            elif all(word in resume_words for word in phrase_words if len(word) > 2):
+        # Multi-word phrases: check if all words in the phrase appear in resume
+        if multi_word:
+            if all(word in document.words for word in phrase_words if len(word) > 2):
                 matching.append(phrase)
             else:
                 missing.append(phrase)
         else:
-            # Single word: check with word boundaries to avoid false positives
-            pattern = r'\b' + re.escape(phrase_lower.strip()) + r'\b'
+            # Defer AI variation checks so they can be resolved in one batch
+            unresolved.append(phrase)
 
-            if re.search(pattern, resume_lower):
-                matching.append(phrase)
-            # Also check for plural/singular variations
-            elif (phrase_lower.endswith('s') and re.search(r'\b' + re.escape(phrase_lower[:-1]) + r'\b', resume_lower)) or \
-                 (re.search(r'\b' + re.escape(phrase_lower + 's') + r'\b', resume_lower)):
-                matching.append(phrase)
-            # Check common variations (e.g., "JavaScript" vs "JS")
-            elif _check_skill_variations(phrase_lower, resume_lower):
-                matching.append(phrase)
-            else:
-                missing.append(phrase)
+    return matching, missing, unresolved
 
-    # Sort for consistency
-    missing = sorted(missing)
-    matching = sorted(matching)
 
-    # Use AI to filter actionable keywords from missing list
-    ai_filtered = await filter_keywords_with_ai(
-        missing,
-        job_data.get("title", ""),
-        resume_text
-    )
+def _apply_skill_variations(
+        unresolved: List[str],
+        variations_by_skill: Dict[str, List[str]],
+        document: ResumeDocument,
+        matching: List[str],
+        missing: List[str]
+) -> None:
+    """
+    Move each unresolved phrase to ``matching`` if one of its AI variations
+    appears in the resume, otherwise to ``missing``.
+    """
+    if not unresolved:
+        return
+
+    found = get_matcher(
+        (variant.lower(), phrase, True)
+        for phrase in unresolved
+        for variant in variations_by_skill.get(phrase.lower().strip(), [])
+    ).find(document.lower)
+
+    for phrase in unresolved:
+        if phrase in found:
+            matching.append(phrase)
+        else:
+            missing.append(phrase)
+
 
+def _build_analysis_result(
+        job_phrases: List[str],
+        matching: List[str],
+        missing: List[str],
+        ai_filtered: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Assemble the analysis response from categorized phrases.
+    """
     # Calculate match score
     score = (len(matching) / max(len(job_phrases), 1)) * 100
 
-    # Save to cache
-    _analysis_cache[cache_key] = {
+    return {
         "success": True,
         "matchScore": round(score, 1),
         "missingPhrases": missing,
@@ -629,98 +716,171 @@ async def analyze_resume_against_job(resume_text: str, job_data: Dict) -> Dict[s
         "totalKeywords": len(job_phrases)
     }
 
-    return _analysis_cache[cache_key]
+
+def _phrase_match_entries(job_phrases: List[str]) -> List[MatcherEntry]:
+    """
+    Build matcher entries for the job phrases, keyed by phrase.
+
+    Every phrase matches itself as a whole word; single-word phrases also
+    match their plural/singular form and their common variations.
+    """
+    entries = []
+    for phrase in job_phrases:
+        if split_job_phrase(phrase)[0]:
+            entries.append((phrase.lower().strip(), phrase, True))
+        else:
+            entries.extend((term, phrase, True) for term in single_word_alternatives(phrase))
+
+    return entries
+
+
+def split_job_phrase(phrase: str) -> Tuple[bool, List[str]]:
+    """
+    Normalize a job phrase the way keyword analysis does: lowercase it and
+    replace punctuation with spaces. Returns whether the phrase is treated as
+    multi-word, and its normalized words.
+    """
+    phrase_normalized = re.sub(r'[^\w\s]', ' ', phrase.lower())
+    return ' ' in phrase_normalized, phrase_normalized.split()
 
 
-def _check_skill_variations(skill: str, resume_text: str) -> bool:
+def single_word_alternatives(phrase: str) -> List[str]:
     """
-    Check for common skill variations and abbreviations across all professions.
-    Uses AI to dynamically identify variations for any skill in any industry.
-    Results are cached for performance.
+    Return the lowercase terms a single-word phrase matches: itself, its
+    plural/singular form and its common variations.
     """
-    # Common hardcoded variations for performance (most frequently used)
-    common_variations = {
-        # Tech
-        'javascript': ['js'], 'typescript': ['ts'], 'python': ['py'],
-        'kubernetes': ['k8s'], 'artificial intelligence': ['ai'], 'machine learning': ['ml'],
+    phrase_lower = phrase.lower()
+    terms = [phrase_lower.strip()]
 
-        # Business
-        'search engine optimization': ['seo'], 'customer relationship management': ['crm'],
-        'return on investment': ['roi'], 'key performance indicator': ['kpi', 'kpis'],
+    if phrase_lower.endswith('s'):
+        terms.append(phrase_lower[:-1])
+    terms.append(phrase_lower + 's')
+    terms.extend(_common_variations(phrase_lower))
 
-        # Finance
-        'generally accepted accounting principles': ['gaap'], 'profit and loss': ['p&l'],
+    return terms
 
-        # Healthcare
-        'electronic health records': ['ehr', 'emr'], 'registered nurse': ['rn'],
 
-        # HR
-        'human resources': ['hr'], 'diversity equity and inclusion': ['dei'],
-    }
+# Common hardcoded variations for performance (most frequently used)
+COMMON_SKILL_VARIATIONS = {
+    # Tech
+    'javascript': ['js'], 'typescript': ['ts'], 'python': ['py'],
+    'kubernetes': ['k8s'], 'artificial intelligence': ['ai'], 'machine learning': ['ml'],
+
+    # Business
+    'search engine optimization': ['seo'], 'customer relationship management': ['crm'],
+    'return on investment': ['roi'], 'key performance indicator': ['kpi', 'kpis'],
+
+    # Finance
+    'generally accepted accounting principles': ['gaap'], 'profit and loss': ['p&l'],
+
+    # Healthcare
+    'electronic health records': ['ehr', 'emr'], 'registered nurse': ['rn'],
+
+    # HR
+    'human resources': ['hr'], 'diversity equity and inclusion': ['dei'],
+}
+
 
+def _common_variations(skill: str) -> List[str]:
+    """
+    Return the hardcoded common variations of a skill, in both directions.
+    """
     skill_lower = skill.lower().strip()
 
-    # Quick check: common variations first (no API call needed)
-    if skill_lower in common_variations:
-        for variant in common_variations[skill_lower]:
-            pattern = r'\b' + re.escape(variant) + r'\b'
-            if re.search(pattern, resume_text):
-                return True
+    variations = list(COMMON_SKILL_VARIATIONS.get(skill_lower, []))
 
     # Reverse lookup for common variations
-    for full_form, abbrevs in common_variations.items():
+    for full_form, abbrevs in COMMON_SKILL_VARIATIONS.items():
         if skill_lower in abbrevs:
-            pattern = r'\b' + re.escape(full_form) + r'\b'
-            if re.search(pattern, resume_text):
-                return True
+            variations.append(full_form)
 
-    # If not in common variations, use AI to check for variations dynamically
-    return _check_skill_variations_with_ai(skill_lower, resume_text)
+    return variations
 
 
-# Cache for AI-detected skill variations
-_skill_variations_cache: Dict[str, List[str]] = {}
+# Cache for AI-detected skill variations of skills the taxonomy does not know
+_skill_variations_cache = LRUCache(
+    "skill_variations",
+    max_entries=settings.skill_variations_cache_max_entries,
+    ttl=settings.skill_variations_cache_ttl
+)
 
 
-def _check_skill_variations_with_ai(skill: str, resume_text: str) -> bool:
+async def warm_skill_variations() -> int:
     """
-    Use AI to dynamically detect skill variations and abbreviations.
-    Works for any skill in any profession. Results are cached.
+    Load stored AI variation answers for the configured model into the
+    variation cache, and purge answers stored by other models.
+    Run in the background at startup. Returns the number of skills loaded.
     """
-    skill_lower = skill.lower().strip()
+    store = get_variation_store()
+    if store is None:
+        return 0
 
-    # Check if we've already looked up variations for this skill
-    if skill_lower not in _skill_variations_cache:
-        # Get variations from AI
-        variations = _get_skill_variations_from_ai(skill_lower)
-        _skill_variations_cache[skill_lower] = variations
-    else:
-        variations = _skill_variations_cache[skill_lower]
+    try:
+        purged = await asyncio.to_thread(store.purge_stale)
+        stored = await asyncio.to_thread(store.load_recent, settings.skill_variations_cache_max_entries)
+    except Exception as e:
+        logger.warning("Skill variation warm-up failed: %s", e)
+        return 0
 
-    # Check if any variation exists in resume
-    resume_lower = resume_text.lower()
-    for variant in variations:
-        pattern = r'\b' + re.escape(variant.lower()) + r'\b'
-        if re.search(pattern, resume_lower):
-            return True
+    for skill, variations in stored.items():
+        if _skill_variations_cache.get(skill) is None:
+            _skill_variations_cache.set(skill, variations)
 
-    return False
+    logger.info("Loaded %d stored skill variations (%d stale entries purged)", len(stored), purged)
+    return len(stored)
 
 
-def _get_skill_variations_from_ai(skill: str) -> List[str]:
+async def _load_stored_variations(skills: List[str]) -> Dict[str, List[str]]:
     """
-    Ask AI to identify common variations and abbreviations for a skill.
-    Returns list of variations including the original skill.
+    Look skills up in the persistent variation store. Store errors are
+    treated as misses.
     """
-    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        # Fallback: return just the skill itself
-        return [skill]
+    store = get_variation_store()
+    if store is None or not skills:
+        return {}
+    try:
+        return await asyncio.to_thread(store.get_many, skills)
+    except Exception as e:
+        logger.warning("Skill variation store read failed: %s", e)
+        return {}
+
 
+async def _store_variations(variations_by_skill: Dict[str, List[str]]) -> None:
+    """
+    Persist AI variation answers. Store errors are logged and ignored.
+    """
+    store = get_variation_store()
+    if store is None or not variations_by_skill:
+        return
     try:
-        client = OpenAI(api_key=api_key)
+        await asyncio.to_thread(store.put_many, variations_by_skill)
+    except Exception as e:
+        logger.warning("Skill variation store write failed: %s", e)
+
+
+def _known_skill_variations(skill_lower: str) -> Optional[List[str]]:
+    """
+    Return a skill's variations from the local taxonomy or, failing that,
+    previously resolved AI variations. None if neither knows the skill.
+    """
+    variations = get_skill_taxonomy().lookup(skill_lower)
+    if variations is None:
+        variations = _skill_variations_cache.get(skill_lower)
+    return variations
 
-        prompt = f"""List ALL common variations, abbreviations, and alternative names for this skill/term: "{skill}"
+
+def get_cached_skill_variations(skill: str) -> List[str]:
+    """
+    Return known variations for a skill, without any API call.
+    """
+    return _known_skill_variations(skill.lower().strip()) or []
+
+
+def _skill_variation_prompt(skill: str) -> str:
+    """
+    Build the single-skill variation prompt.
+    """
+    return f"""List ALL common variations, abbreviations, and alternative names for this skill/term: "{skill}"
 
 Include:
 - Common abbreviations (e.g., "JavaScript" → "JS")
@@ -736,37 +896,236 @@ Example for "Search Engine Optimization": ["search engine optimization", "seo"]
 Skill: "{skill}"
 """
 
-        response = client.chat.completions.create(
-            model=settings.openai_model or "gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a skill variation expert. Return ONLY a JSON array of strings with no markdown formatting."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.0,
-            max_tokens=200
-        )
 
-        content = response.choices[0].message.content.strip()
-        content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
+def _clean_variations(skill: str, variations: Any) -> List[str]:
+    """
+    Validate an AI variation list and make sure it includes the original skill.
+    """
+    if not isinstance(variations, list):
+        return [skill]
+
+    variations = [v for v in variations if isinstance(v, str) and v.strip()]
+
+    # Add original skill if not present
+    if skill.lower() not in [v.lower() for v in variations]:
+        variations.append(skill)
+    return variations
+
 
-        variations = json.loads(content)
+async def resolve_skill_variations(skills: List[str]) -> Dict[str, List[str]]:
+    """
+    Resolve variations for many skills at once and fill the variation cache in bulk.
+
+    Skills in the local taxonomy, cached skills and skills in the persistent
+    variation store are answered locally. All other skills are sent to the
+    AI in one structured request per chunk of settings.skill_variation_batch_size
+    skills; if a batch request fails, its skills fall back to individual
+    requests fanned out with at most settings.skill_variation_concurrency in
+    flight. AI answers are written to the store. Skills that a concurrent
+    call is already resolving are awaited rather than requested again.
+
+    Returns:
+        Dict mapping each lowercased skill to its variations
+    """
+    resolved: Dict[str, List[str]] = {}
+    uncached: List[str] = []
 
-        # Ensure it's a list and includes the original skill
-        if isinstance(variations, list):
-            # Add original skill if not present
-            if skill.lower() not in [v.lower() for v in variations]:
-                variations.append(skill)
-            return variations
+    for skill in skills:
+        skill_lower = skill.lower().strip()
+        if not skill_lower or skill_lower in resolved or skill_lower in uncached:
+            continue
+        variations = _known_skill_variations(skill_lower)
+        if variations is None:
+            uncached.append(skill_lower)
         else:
-            return [skill]
+            resolved[skill_lower] = variations
+
+    if not uncached:
+        return resolved
+
+    led, joined = _skill_variations_flight.claim(uncached)
+    try:
+        if led:
+            resolved.update(await _fetch_skill_variations(list(led)))
+    finally:
+        _skill_variations_flight.publish(led, resolved)
+
+    for skill, future in joined.items():
+        variations = await asyncio.shield(future)
+        if variations is None:
+            # The call resolving it failed or was cancelled
+            variations = (await resolve_skill_variations([skill]))[skill]
+        resolved[skill] = variations
+
+    return resolved
+
+
+async def _fetch_skill_variations(uncached: List[str]) -> Dict[str, List[str]]:
+    """
+    Resolve skills missing from the taxonomy and cache, from the persistent
+    store or else the AI, and cache the results.
+    """
+    resolved: Dict[str, List[str]] = {}
+
+    # Answers stored by earlier processes, e.g. before a deploy
+    stored = await _load_stored_variations(uncached)
+    for skill, variations in stored.items():
+        _skill_variations_cache.set(skill, variations)
+        resolved[skill] = variations
+    uncached = [skill for skill in uncached if skill not in stored]
+
+    if not uncached:
+        return resolved
+
+    # Skills the AI gave no usable answer for (or all of them, without AI)
+    # fall back to matching only themselves
+    fetched: Dict[str, List[str]] = {}
+    gateway = get_llm_gateway()
+    if gateway.available:
+        logger.info("Resolving variations for %d skills in batch", len(uncached))
+        semaphore = asyncio.Semaphore(max(1, settings.skill_variation_concurrency))
+        batch_size = max(1, settings.skill_variation_batch_size)
+        chunks = [uncached[i:i + batch_size] for i in range(0, len(uncached), batch_size)]
+
+        for chunk_result in await asyncio.gather(
+            *(_resolve_variation_chunk(gateway, chunk, semaphore) for chunk in chunks)
+        ):
+            fetched.update(chunk_result)
+
+    for skill in uncached:
+        variations = fetched.get(skill) or [skill]
+        _skill_variations_cache.set(skill, variations)
+        resolved[skill] = variations
+
+    # Only actual AI answers are persisted, so fallbacks are retried after a restart
+    await _store_variations(fetched)
+
+    return resolved
+
+
+async def _resolve_variation_chunk(
+        gateway: LLMGateway,
+        skills: List[str],
+        semaphore: asyncio.Semaphore
+) -> Dict[str, List[str]]:
+    """
+    Resolve one chunk of skills with a single batched request,
+    falling back to per-skill requests if the batch fails.
+    Skills without a usable answer are left out of the result.
+    """
+    async with semaphore:
+        batch = await _get_skill_variations_batch_from_ai(gateway, skills)
+
+    if batch is not None:
+        return batch
+
+    logger.warning("Batched variation lookup failed; falling back to %d individual requests", len(skills))
+
+    async def lookup(skill: str) -> Optional[List[str]]:
+        async with semaphore:
+            return await _get_skill_variations_from_ai(gateway, skill)
+
+    results = await asyncio.gather(*(lookup(skill) for skill in skills))
+    return {skill: variations for skill, variations in zip(skills, results) if variations is not None}
+
+
+async def _get_skill_variations_batch_from_ai(
+        gateway: LLMGateway,
+        skills: List[str]
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Ask AI for the variations of several skills in one structured request.
+    Returns None if the request or its JSON response is unusable; skills the
+    response has no list for are left out.
+    """
+    prompt = f"""For EACH skill/term below, list ALL common variations, abbreviations, and alternative names.
+
+Include:
+- Common abbreviations (e.g., "JavaScript" → "JS")
+- Alternative names (e.g., "Machine Learning" → "ML", "AI")
+- Industry-specific terms
+- Plural/singular forms if relevant
+
+Return ONLY a JSON object mapping every skill exactly as written below to a JSON array of strings.
+
+Example: {{"javascript": ["javascript", "js", "ecmascript", "node.js", "nodejs"], "search engine optimization": ["search engine optimization", "seo"]}}
+
+Skills:
+{chr(10).join(f"- {skill}" for skill in skills)}
+"""
+
+    try:
+        with stage_timer("skill_variations", "llm_request"):
+            response = await gateway.chat(
+                operation="skill_variations",
+                model=settings.openai_model or "gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a skill variation expert. Return ONLY a JSON object with no markdown formatting."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.0,
+                max_tokens=min(4000, 80 * len(skills) + 100)
+            )
+
+        with stage_timer("skill_variations", "parse_response"):
+            content = response.choices[0].message.content.strip()
+            content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
+            result = json.loads(content)
+
+            if not isinstance(result, dict):
+                return None
+
+            lowered = {str(k).lower().strip(): v for k, v in result.items()}
+            return {
+                skill: _clean_variations(skill, lowered[skill])
+                for skill in skills
+                if isinstance(lowered.get(skill), list)
+            }
 
     except Exception as e:
-        print(f"AI skill variation lookup error for '{skill}': {e}")
-        # Fallback: return just the skill itself
-        return [skill]
+        logger.warning("Batched AI skill variation lookup error: %s", e)
+        return None
+
+
+async def _get_skill_variations_from_ai(gateway: LLMGateway, skill: str) -> Optional[List[str]]:
+    """
+    Ask AI to identify common variations and abbreviations for a skill.
+    Returns list of variations including the original skill, or None if the
+    AI gave no usable answer.
+    """
+    try:
+        with stage_timer("skill_variations", "llm_request"):
+            response = await gateway.chat(
+                operation="skill_variations",
+                model=settings.openai_model or "gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a skill variation expert. Return ONLY a JSON array of strings with no markdown formatting."
+                    },
+                    {"role": "user", "content": _skill_variation_prompt(skill)}
+                ],
+                temperature=0.0,
+                max_tokens=200
+            )
+
+        with stage_timer("skill_variations", "parse_response"):
+            content = response.choices[0].message.content.strip()
+            content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
+
+            variations = json.loads(content)
+            if not isinstance(variations, list):
+                return None
+            return _clean_variations(skill, variations)
+
+    except Exception as e:
+        logger.warning("AI skill variation lookup error for '%s': %s", skill, e)
+        # The caller falls back to the skill itself
+        return None
 
 
 # =========================================================
@@ -831,20 +1190,36 @@ async def filter_keywords_with_ai(
     # Check keyword filter cache
     keyword_cache_key = _generate_keyword_cache_key(missing_phrases, job_title)
 
-    if keyword_cache_key in _keyword_filter_cache:
-        print("Cache hit for keyword filtering")
-        return _keyword_filter_cache[keyword_cache_key]
+    cached_filter = await _keyword_filter_cache.get(keyword_cache_key)
+    if cached_filter is not None:
+        logger.debug("Cache hit for keyword filtering")
+        return cached_filter
 
     if not missing_phrases:
         return {"actionableKeywords": []}
 
-    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("No OpenAI API key found. Using basic keyword filter.")
+    gateway = get_llm_gateway()
+    if not gateway.available:
+        logger.info("No OpenAI API key found. Using basic keyword filter.")
         return _basic_keyword_filter(missing_phrases)
 
+    # An identical filter request already in progress is awaited instead of repeated
+    return await _keyword_filter_flight.do(
+        keyword_cache_key,
+        lambda: _filter_keywords_uncached(gateway, missing_phrases, job_title, keyword_cache_key)
+    )
+
+
+async def _filter_keywords_uncached(
+        gateway: LLMGateway,
+        missing_phrases: List[str],
+        job_title: str,
+        keyword_cache_key: str
+) -> Dict[str, Any]:
+    """
+    Ask the AI to filter keywords for a cache miss and cache its answer.
+    """
     try:
-        client = OpenAI(api_key=api_key)
 
         prompt = f"""
 Analyze these keywords or skills from a job posting for a {job_title or 'professional'} role.
@@ -887,54 +1262,60 @@ Priority guidelines:
 - low: Nice-to-have skills or tangential technologies
 """
 
-        response = client.chat.completions.create(
-            model=settings.openai_model or "gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert ATS keyword analyzer. Return only valid JSON, no markdown formatting."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.0,
-            top_p=0.1,
-            frequency_penalty=0.0,
-            presence_penalty=0.0,
-            seed=12345,
-            max_tokens=1500
-        )
+        with stage_timer("keyword_filter", "llm_request"):
+            response = await gateway.chat(
+                operation="keyword_filter",
+                model=settings.openai_model or "gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert ATS keyword analyzer. Return only valid JSON, no markdown formatting."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.0,
+                top_p=0.1,
+                frequency_penalty=0.0,
+                presence_penalty=0.0,
+                seed=12345,
+                max_tokens=1500
+            )
 
         content = response.choices[0].message.content.strip()
         content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
 
-        print(f"Raw AI response (first 500 chars): {content[:500]}")
+        log_payload(logger, "Raw keyword filter response", content)
 
         try:
-            result = json.loads(content)
+            with stage_timer("keyword_filter", "parse_response"):
+                result = json.loads(content)
         except json.JSONDecodeError as e:
-            print(f"Content that failed to parse: {content[:1000]}")
+            logger.warning("Keyword filter response is not valid JSON: %s", e)
+            log_payload(logger, "Keyword filter response that failed to parse", content, logging.WARNING)
             return _basic_keyword_filter(missing_phrases)
 
         # Validate and return actionable keywords
         actionable_keywords = result.get("actionableKeywords", [])
 
         if not isinstance(actionable_keywords, list):
-            print("ERROR: actionableKeywords is not a list")
+            logger.error("actionableKeywords is not a list")
             return _basic_keyword_filter(missing_phrases)
 
-        print(f"Successfully extracted {len(actionable_keywords)} actionable keywords")
+        logger.info("Extracted %d actionable keywords", len(actionable_keywords))
 
         # Save to keyword filter cache
-        _keyword_filter_cache[keyword_cache_key] = {
+        await _keyword_filter_cache.set(keyword_cache_key, {
             "actionableKeywords": actionable_keywords
-        }
+        })
 
         return {
             "actionableKeywords": actionable_keywords
         }
     except Exception as e:
-        print(f"AI keyword filtering error: {e}")
+        logger.warning("AI keyword filtering error: %s", e)
         return _basic_keyword_filter(missing_phrases)
+
+
 def _dict_to_resume_text(data: Any) -> str:
     """
     Convert a dictionary or list structure back to formatted resume text.
@@ -987,12 +1368,189 @@ async def generate_optimized_resume(
 
 ) -> Dict[str, Any]:
 
+    keywords, error = _prepare_optimization(original_resume_text, selected_keywords)
+    if error:
+        return error
+
+    gateway = get_llm_gateway()
+
+    try:
+        logger.info("Sending optimization request to OpenAI")
+
+        with stage_timer("optimize", "llm_request"):
+            response = await gateway.chat(
+                timeout=settings.llm_optimize_timeout,
+                operation="optimize",
+                messages=_build_optimization_messages(original_resume_text, keywords, job_description, job_title),
+                **OPTIMIZATION_COMPLETION_PARAMS
+            )
+
+        content = response.choices[0].message.content.strip()
+
+        return await _finalize_optimized_resume(
+            content, original_resume_text, keywords, job_description, job_title
+        )
+
+    except Exception as e:
+        logger.exception("Generation error: %s", e)
+        return {"success": False, "optimizedResume": "", "message": f"Generation failed: {str(e)}"}
+
+
+async def stream_optimized_resume(
+        original_resume_text: str,
+        selected_keywords: List[Dict[str, str]],
+        job_description: str = "",
+        job_title: str = "",
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_optimized_resume.
+
+    Yields events as dicts with "event" and "data" keys:
+    - "token": {"text": ...} - the next piece of the optimized resume text as
+      the model generates it
+    - "result": the same payload generate_optimized_resume returns, including
+      keyword verification and ATS score; always the last event
+    """
+    keywords, error = _prepare_optimization(original_resume_text, selected_keywords)
+    if error:
+        yield {"event": "result", "data": error}
+        return
+
+    gateway = get_llm_gateway()
+    decoder = _JsonStringFieldDecoder("optimizedResume")
+    chunks: List[str] = []
+
+    try:
+        logger.info("Streaming optimization request to OpenAI")
+
+        async for delta in gateway.stream_chat(
+            timeout=settings.llm_optimize_timeout,
+            operation="optimize_stream",
+            messages=_build_optimization_messages(original_resume_text, keywords, job_description, job_title),
+            **OPTIMIZATION_COMPLETION_PARAMS
+        ):
+            chunks.append(delta)
+            text = decoder.feed(delta)
+            if text:
+                yield {"event": "token", "data": {"text": text}}
+
+        content = "".join(chunks).strip()
+        chunks.clear()
+
+        result = await _finalize_optimized_resume(
+            content, original_resume_text, keywords, job_description, job_title
+        )
+
+    except Exception as e:
+        logger.exception("Generation error: %s", e)
+        result = {"success": False, "optimizedResume": "", "message": f"Generation failed: {str(e)}"}
+
+    yield {"event": "result", "data": result}
+
+
+class _JsonStringFieldDecoder:
+    """
+    Incrementally decode one string field of a JSON object that is being
+    streamed, so its text can be forwarded while the model is still writing
+    the rest of the document.
+    """
+
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    def __init__(self, field: str):
+        self._marker = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._marker_tail = len(field) + 16
+        self._buffer = ""
+        self._state = "search"  # search -> value -> done
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add the next chunk of the JSON document and return any newly decoded
+        text of the field (empty if none is available yet).
+        """
+        if self._state == "done":
+            return ""
+
+        self._buffer += chunk
+
+        if self._state == "search":
+            match = self._marker.search(self._buffer)
+            if not match:
+                # Keep enough of the tail to spot a marker split across chunks
+                self._buffer = self._buffer[-self._marker_tail:]
+                return ""
+            self._buffer = self._buffer[match.end():]
+            self._state = "value"
+
+        buffer = self._buffer
+        output = []
+        i = 0
+
+        try:
+            while i < len(buffer):
+                char = buffer[i]
+                if char == '"':
+                    self._state = "done"
+                    break
+                if char != '\\':
+                    output.append(char)
+                    i += 1
+                    continue
+
+                # Escape sequence: wait for more input if it is incomplete
+                if i + 1 >= len(buffer):
+                    break
+                escape = buffer[i + 1]
+                if escape != 'u':
+                    output.append(self._ESCAPES.get(escape, escape))
+                    i += 2
+                    continue
+                if i + 6 > len(buffer):
+                    break
+                code = int(buffer[i + 2:i + 6], 16)
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: combine with the following low surrogate
+                    if i + 12 > len(buffer):
+                        break
+                    low = int(buffer[i + 8:i + 12], 16)
+                    output.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                    continue
+                output.append(chr(code))
+                i += 6
+        except ValueError:
+            # Malformed escape: stop streaming; the final result is parsed separately
+            self._state = "done"
+
+        self._buffer = "" if self._state == "done" else buffer[i:]
+        return "".join(output)
+
+
+# Sampling parameters shared by the blocking and streaming optimization calls
+OPTIMIZATION_COMPLETION_PARAMS = {
+    "model": settings.openai_model or "gpt-4o",
+    "temperature": 0.0,
+    "top_p": 0.1,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0,
+    "seed": 54321,
+    "max_tokens": 16000
+}
+
+
+def _prepare_optimization(
+        original_resume_text: str,
+        selected_keywords: List[Dict[str, str]]
+) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+    """
+    Validate optimization inputs and extract keyword strings.
+    Returns the keywords and, if the request cannot proceed, an error result.
+    """
     if not selected_keywords:
-        return {"success": False, "optimizedResume": "", "message": "No keywords selected."}
+        return [], {"success": False, "optimizedResume": "", "message": "No keywords selected."}
 
-    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return {"success": False, "optimizedResume": "", "message": "OpenAI API key missing."}
+    if not get_llm_gateway().available:
+        return [], {"success": False, "optimizedResume": "", "message": "OpenAI API key missing."}
 
     # Extract keywords with robust handling for different input formats
     keywords = []
@@ -1008,21 +1566,23 @@ async def generate_optimized_resume(
             keywords.append(str(keyword_value).strip())
 
     if not keywords:
-        return {"success": False, "optimizedResume": "", "message": "No valid keywords."}
+        return [], {"success": False, "optimizedResume": "", "message": "No valid keywords."}
 
-    # Count sections in original
-    original_sections = detect_resume_sections(original_resume_text)
-    print(f"\nSections detected in original: {[s['name'] for s in original_sections]}")
-    original_bullet_count = count_bullet_points(original_resume_text)
-    print(f"Bullet points in original: {original_bullet_count}")
-    print("=" * 80)
+    logger.info("Generating new resume with %d keywords", len(keywords))
 
-    print(f"Generating new resume with {len(keywords)} keywords")
+    return keywords, None
 
-    try:
-        client = OpenAI(api_key=api_key)
 
-        prompt = f"""{SYSTEM_INSTRUCTIONS}
+def _build_optimization_messages(
+        original_resume_text: str,
+        keywords: List[str],
+        job_description: str,
+        job_title: str
+) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for the resume optimization request.
+    """
+    prompt = f"""{SYSTEM_INSTRUCTIONS}
 
 ORIGINAL USER RESUME TO OPTIMIZE:
 {original_resume_text}
@@ -1051,193 +1611,239 @@ OUTPUT (valid JSON only, no markdown):
   "tips": ["Improvement 1", "Improvement 2"]
 }}"""
 
-        print("Sending comprehensive optimization request to OpenAI...")
-
-        response = client.chat.completions.create(
-            model=settings.openai_model or "gpt-4o",
-            messages=[{
-                    "role": "system",
-                    "content": (
-                        "You are an expert ATS resume optimizer specializing in keyword integration. "
-                        "Your task is to create a COMPLETE enhanced resume that:\n\n"
-                        "1. PRESERVES ALL content from the original resume (every section, job, project, and achievement)\n"
-                        "2. INTEGRATES the selected keywords naturally into existing content\n"
-                        "3. ENHANCES bullet points to incorporate keywords without fabricating experiences\n"
-                        "4. MAINTAINS the user's authentic work history and timeline\n\n"
-                        "   USER SELECTED KEYWORDS/SLILLS INTEGRATION STRATEGY:\n"
-                        "- Weave keywords into existing job descriptions and bullet points\n"
-                        "- Add keywords to skills sections where they align with user's background\n"
-                        "- Incorporate keywords into work experiences bullet points naturally\n"
-                        "- Ensure keywords feel organic, not forced or repetitive\n\n"
-                        "OUTPUT REQUIREMENTS:\n"
-                        "- Return ONLY valid JSON with 'optimizedResume' field containing PLAIN TEXT (not a dictionary or list)\n"
-                        "- The optimized resume MUST be at least as comprehensive as the original\n"
-                        "- DO NOT omit, remove, or summarize any experiences, projects, or achievements\n"
-                        "- DO NOT create fake experiences bullet points to accommodate keywords\n"
-                        "- Use proper resume formatting with clear section headers and bullet points"
-                    )
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.0,
-            top_p=0.1,
-            frequency_penalty=0.0,
-            presence_penalty=0.0,
-            seed=54321,
-            max_tokens=16000
-        )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an expert ATS resume optimizer specializing in keyword integration. "
+                "Your task is to create a COMPLETE enhanced resume that:\n\n"
+                "1. PRESERVES ALL content from the original resume (every section, job, project, and achievement)\n"
+                "2. INTEGRATES the selected keywords naturally into existing content\n"
+                "3. ENHANCES bullet points to incorporate keywords without fabricating experiences\n"
+                "4. MAINTAINS the user's authentic work history and timeline\n\n"
+                "   USER SELECTED KEYWORDS/SLILLS INTEGRATION STRATEGY:\n"
+                "- Weave keywords into existing job descriptions and bullet points\n"
+                "- Add keywords to skills sections where they align with user's background\n"
+                "- Incorporate keywords into work experiences bullet points naturally\n"
+                "- Ensure keywords feel organic, not forced or repetitive\n\n"
+                "OUTPUT REQUIREMENTS:\n"
+                "- Return ONLY valid JSON with 'optimizedResume' field containing PLAIN TEXT (not a dictionary or list)\n"
+                "- The optimized resume MUST be at least as comprehensive as the original\n"
+                "- DO NOT omit, remove, or summarize any experiences, projects, or achievements\n"
+                "- DO NOT create fake experiences bullet points to accommodate keywords\n"
+                "- Use proper resume formatting with clear section headers and bullet points"
+            )
+        },
+        {"role": "user", "content": prompt}
+    ]
 
-        content = response.choices[0].message.content.strip()
-        content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
 
-        try:
+async def _finalize_optimized_resume(
+        content: str,
+        original_resume_text: str,
+        keywords: List[str],
+        job_description: str,
+        job_title: str
+) -> Dict[str, Any]:
+    """
+    Parse the model output and post-process it: clean the text, compare it with
+    the original, verify keyword integration and calculate the ATS score.
+    """
+    content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
+
+    # Count sections in original
+    original_document = get_resume_document(original_resume_text)
+    original_sections = original_document.sections
+    original_bullet_count = original_document.bullet_count
+
+    try:
+        with stage_timer("optimize", "parse_response"):
             result = json.loads(content)
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
-            print(f"Content that failed to parse: {content[:500]}")
-            return {"success": False, "optimizedResume": "", "message": "AI returned invalid JSON."}
-
-        optimized_text = result.get("optimizedResume", "")
-
-        if isinstance(optimized_text, dict):
-            print(f"WARNING: optimizedResume is a dict with keys: {list(optimized_text.keys())}")
-            print(f"Dict content preview: {str(optimized_text)[:500]}")
-        elif isinstance(optimized_text, list):
-            print(f"WARNING: optimizedResume is a list with {len(optimized_text)} items")
-            print(f"List content preview: {str(optimized_text)[:500]}")
-        else:
-            print(f"optimizedResume length before conversion: {len(str(optimized_text))} characters")
-        print("=" * 80)
+    except json.JSONDecodeError as e:
+        logger.warning("Optimization response is not valid JSON: %s", e)
+        log_payload(logger, "Optimization response that failed to parse", content, logging.WARNING)
+        return {"success": False, "optimizedResume": "", "message": "AI returned invalid JSON."}
 
-        # Check if optimizedResume is a dict/list (meaning AI returned wrong format)
-        if isinstance(optimized_text, (dict, list)):
-            # Convert dict structure back to formatted resume text
-            optimized_text = _dict_to_resume_text(optimized_text)
+    optimized_text = result.get("optimizedResume", "")
 
-        if not optimized_text:
-            print("ERROR: No optimized_text extracted from AI response")
-            return {"success": False, "optimizedResume": "", "message": "No resume generated."}
+    if isinstance(optimized_text, dict):
+        logger.warning("optimizedResume is a dict with keys: %s", list(optimized_text.keys()))
+    elif isinstance(optimized_text, list):
+        logger.warning("optimizedResume is a list with %d items", len(optimized_text))
 
-        if not isinstance(optimized_text, str):
-            optimized_text = str(optimized_text)
+    # Check if optimizedResume is a dict/list (meaning AI returned wrong format)
+    if isinstance(optimized_text, (dict, list)):
+        # Convert dict structure back to formatted resume text
+        optimized_text = _dict_to_resume_text(optimized_text)
 
-        print(f"Extracted resume text length: {len(optimized_text)} characters")
-        print(f"Extracted resume line count: {len(optimized_text.splitlines())}")
+    if not optimized_text:
+        logger.error("No optimized resume text in the AI response")
+        return {"success": False, "optimizedResume": "", "message": "No resume generated."}
 
+    if not isinstance(optimized_text, str):
+        optimized_text = str(optimized_text)
+
+    with stage_timer("optimize", "clean_text"):
         # Clean encoding artifacts from the generated resume
         optimized_text = clean_encoding_artifacts(optimized_text)
 
         # Check sections in optimized
-        optimized_sections = detect_resume_sections(optimized_text)
-        print(f"\nSections detected in optimized: {[s['name'] for s in optimized_sections]}")
-        optimized_bullet_count = count_bullet_points(optimized_text)
-        print(f"Bullet points in optimized: {optimized_bullet_count}")
-
-        # Compare
-        print(f"\nCOMPARISON:")
-        print(f"  Original bullets: {original_bullet_count} → Optimized bullets: {optimized_bullet_count}")
-        print(f"  Original sections: {len(original_sections)} → Optimized sections: {len(optimized_sections)}")
-        print(f"  Original length: {len(original_resume_text)} → Optimized length: {len(optimized_text)}")
-
-        # WARN if content was significantly reduced
-        if len(optimized_text) < len(original_resume_text) * 0.8:
-            print(f"⚠️  WARNING: Optimized resume is {len(original_resume_text) - len(optimized_text)} characters shorter!")
-            print(f"⚠️  This suggests the AI may have omitted content from the original resume.")
-
-        if optimized_bullet_count < original_bullet_count:
-            print(f"⚠️  WARNING: Optimized resume has {original_bullet_count - optimized_bullet_count} fewer bullet points!")
-            print(f"⚠️  Some experiences or achievements may have been omitted.")
-
-        print("=" * 80)
-
-        keyword_check = verify_keyword_integration(optimized_text, keywords)
-        save_optimized_resume_to_file(optimized_text)
-
-        print(f"Success! {len(keyword_check['integrated'])} keywords integrated")
-
-        # Create job_data from job_description and selected_keywords for ATS score calculation
-        job_data = {
-            "title": job_title or "",
-            "description": job_description,
-            "skills": keywords,
-            "requirements": [],
-            "technologies": [],
-            "tools": [],
-            "qualifications": []
-        }
+        optimized_document = get_resume_document(optimized_text)
+    optimized_sections = optimized_document.sections
+    optimized_bullet_count = optimized_document.bullet_count
+
+    # Compare
+    logger.info(
+        "Optimized resume: bullets %d -> %d, sections %d -> %d, length %d -> %d",
+        original_bullet_count, optimized_bullet_count,
+        len(original_sections), len(optimized_sections),
+        len(original_resume_text), len(optimized_text)
+    )
 
-        # Extract additional job data from job description if available
-        if job_description:
-            # Simple extraction - can be enhanced with AI parsing if needed
-            job_desc_lower = job_description.lower()
+    # WARN if content was significantly reduced
+    if len(optimized_text) < len(original_resume_text) * 0.8:
+        logger.warning(
+            "Optimized resume is %d characters shorter; the AI may have omitted content from the original",
+            len(original_resume_text) - len(optimized_text)
+        )
 
-            # Common technology/tool patterns
-            tech_patterns = [
-                'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-                'node', 'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'docker',
-                'kubernetes', 'aws', 'azure', 'gcp', 'git', 'jenkins', 'ci/cd'
-            ]
+    if optimized_bullet_count < original_bullet_count:
+        logger.warning(
+            "Optimized resume has %d fewer bullet points; some experiences or achievements may have been omitted",
+            original_bullet_count - optimized_bullet_count
+        )
 
-            for tech in tech_patterns:
-                if tech in job_desc_lower and tech not in job_data["technologies"]:
-                    job_data["technologies"].append(tech)
+    with stage_timer("optimize", "keyword_verification"):
+        keyword_check = verify_keyword_integration(optimized_text, keywords, document=optimized_document)
+    record_artifact("optimized", optimized_text)
+
+    logger.info("%d keywords integrated", len(keyword_check['integrated']))
+
+    # Create job_data from job_description and selected_keywords for ATS score calculation
+    job_data = {
+        "title": job_title or "",
+        "description": job_description,
+        "skills": keywords,
+        "requirements": [],
+        "technologies": [],
+        "tools": [],
+        "qualifications": []
+    }
 
-        # Calculate accurate ATS score based on optimization results
+    # Extract additional job data from job description if available
+    if job_description:
+        # Simple extraction - can be enhanced with AI parsing if needed
+        job_desc_lower = job_description.lower()
+
+        # Common technology/tool patterns
+        tech_patterns = [
+            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+            'node', 'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'docker',
+            'kubernetes', 'aws', 'azure', 'gcp', 'git', 'jenkins', 'ci/cd'
+        ]
+
+        for tech in tech_patterns:
+            if tech in job_desc_lower and tech not in job_data["technologies"]:
+                job_data["technologies"].append(tech)
+
+    # Resolve AI variations for unmatched phrases in one batch so scoring
+    # below never falls back to blocking per-phrase lookups
+    with stage_timer("optimize", "skill_variations"):
+        await _prefetch_skill_variations(optimized_text, job_data, document=optimized_document)
+
+    # Calculate accurate ATS score based on optimization results
+    with stage_timer("optimize", "ats_score"):
         calculated_ats_score = calculate_ats_score(
             optimized_text=optimized_text,
             original_text=original_resume_text,
             job_data=job_data,
-            keyword_verification=keyword_check
+            keyword_verification=keyword_check,
+            document=optimized_document,
+            original_document=original_document
         )
 
-        return {
-            "success": True,
-            "message": "New resume generated successfully",
-            "optimizedResume": optimized_text,
-            "resumeSections": result.get("resumeSections", []),
-            "keywordIntegration": result.get("keywordIntegration", []),
-            "keywordVerification": keyword_check,
-            "atsScore": calculated_ats_score,
-            "tips": result.get("tips", []),
-            "metadata": {
-                "keywordsRequested": len(keywords),
-                "keywordsIntegrated": len(keyword_check['integrated'])
-            }
+    return {
+        "success": True,
+        "message": "New resume generated successfully",
+        "optimizedResume": optimized_text,
+        "resumeSections": result.get("resumeSections", []),
+        "keywordIntegration": result.get("keywordIntegration", []),
+        "keywordVerification": keyword_check,
+        "atsScore": calculated_ats_score,
+        "tips": result.get("tips", []),
+        "metadata": {
+            "keywordsRequested": len(keywords),
+            "keywordsIntegrated": len(keyword_check['integrated'])
         }
+    }
 
-    except Exception as e:
-        import traceback
-        print(f"Generation error: {e}")
-        print(f"Error traceback: {traceback.format_exc()}")
-        return {"success": False, "optimizedResume": "", "message": f"Generation failed: {str(e)}"}
 
+async def _prefetch_skill_variations(
+        text: str,
+        job_data: Dict,
+        document: Optional[ResumeDocument] = None
+) -> None:
+    """
+    Batch-resolve skill variations for job phrases not found verbatim in the text.
+    """
+    document = document or get_resume_document(text)
+    phrases = []
+    for field in ["skills", "requirements", "technologies", "tools", "qualifications"]:
+        if isinstance(job_data.get(field), list):
+            phrases.extend(p.lower().strip() for p in job_data[field] if p.strip())
+
+    entries = []
+    for phrase_lower in phrases:
+        entries.append((phrase_lower, phrase_lower, True))
+        entries.extend((variant, phrase_lower, True) for variant in _common_variations(phrase_lower))
+    found = get_matcher(entries).find(document.lower)
+
+    pending = [phrase_lower for phrase_lower in phrases if phrase_lower not in found]
 
-def verify_keyword_integration(optimized_text: str, keywords: List[str]) -> Dict[str, Any]:
+    if pending:
+        await resolve_skill_variations(pending)
+
+
+def verify_keyword_integration(
+        optimized_text: str,
+        keywords: List[str],
+        document: Optional[ResumeDocument] = None
+) -> Dict[str, Any]:
     """
     Verify that selected keywords were actually integrated into the resume.
     """
-    optimized_lower = optimized_text.lower()
+    optimized_lower = (document or get_resume_document(optimized_text)).lower
 
     integrated = []
     missing = []
 
+    # Ensure keywords are strings
+    keyword_strings = []
     for keyword in keywords:
-        # Ensure keyword is a string
         if isinstance(keyword, dict):
             keyword = keyword.get("keyword", "")
         elif not isinstance(keyword, str):
             keyword = str(keyword)
 
-        if not keyword:
-            continue
+        if keyword:
+            keyword_strings.append(keyword)
+
+    # Substring matches for every keyword and keyword word, in one scan
+    entries = []
+    for keyword in keyword_strings:
+        keyword_lower = keyword.lower()
+        entries.append((keyword_lower, ("keyword", keyword_lower), False))
+        entries.extend((word, ("word", word), False) for word in keyword_lower.split())
+    found = get_matcher(entries).find(optimized_lower)
 
+    for keyword in keyword_strings:
         keyword_lower = keyword.lower()
-        if keyword_lower in optimized_lower:
+        if ("keyword", keyword_lower) in found:
             integrated.append(keyword)
         else:
             # Check for partial matches (e.g., "machine learning" might appear as "ML")
             keyword_words = keyword_lower.split()
-            if len(keyword_words) > 1 and all(word in optimized_lower for word in keyword_words):
+            if len(keyword_words) > 1 and all(("word", word) in found for word in keyword_words):
                 integrated.append(keyword)
             else:
                 missing.append(keyword)
@@ -1253,7 +1859,9 @@ def calculate_ats_score(
     optimized_text: str,
     original_text: str,
     job_data: Dict,
-    keyword_verification: Dict[str, Any]
+    keyword_verification: Dict[str, Any],
+    document: Optional[ResumeDocument] = None,
+    original_document: Optional[ResumeDocument] = None
 ) -> int:
     """
     Calculate accurate ATS score based on multiple factors:
@@ -1261,9 +1869,15 @@ def calculate_ats_score(
     - Job requirements match (30% weight)
     - Resume completeness (20% weight)
     - Formatting quality (10% weight)
+
+    ``document`` and ``original_document`` are the ResumeDocuments of the
+    optimized and original texts, when the caller already has them.
     """
     score = 0
 
+    document = document or get_resume_document(optimized_text)
+    original_document = original_document or get_resume_document(original_text)
+
     # Factor 1: Keyword Integration (40 points max)
     integration_rate = keyword_verification.get("integrationRate", 0)
     keyword_score = (integration_rate / 100) * 40
@@ -1279,17 +1893,19 @@ def calculate_ats_score(
 
     requirements_score = 0
     if job_phrases:
-        matched_count = 0
-        optimized_lower = optimized_text.lower()
+        optimized_lower = document.lower
 
+        # Each phrase matches itself, its common variations and any taxonomy
+        # or previously resolved AI variations, all found in one scan
+        entries = []
         for phrase in job_phrases:
-            phrase_lower = phrase.lower()
-            pattern = r'\b' + re.escape(phrase_lower.strip()) + r'\b'
+            phrase_lower = phrase.lower().strip()
+            variations = _known_skill_variations(phrase_lower) or [phrase_lower]
+            entries.append((phrase_lower, phrase, True))
+            entries.extend((variant, phrase, True) for variant in _common_variations(phrase_lower))
+            entries.extend((variant.lower(), phrase, True) for variant in variations)
 
-            if re.search(pattern, optimized_lower):
-                matched_count += 1
-            elif _check_skill_variations(phrase_lower, optimized_lower):
-                matched_count += 1
+        matched_count = len(get_matcher(entries).find(optimized_lower))
 
         requirements_match_rate = (matched_count / len(job_phrases)) * 100
         requirements_score = (requirements_match_rate / 100) * 30
@@ -1299,10 +1915,10 @@ def calculate_ats_score(
         score += requirements_score
 
     # Factor 3: Resume Completeness (20 points max)
-    original_sections = detect_resume_sections(original_text)
-    optimized_sections = detect_resume_sections(optimized_text)
-    original_bullets = count_bullet_points(original_text)
-    optimized_bullets = count_bullet_points(optimized_text)
+    original_sections = original_document.sections
+    optimized_sections = document.sections
+    original_bullets = original_document.bullet_count
+    optimized_bullets = document.bullet_count
 
     completeness_score = 0
 
@@ -0,0 +1,217 @@
+"""
+Opt-in debug artifacts (extracted and optimized resume text).
+
+Every extraction used to write the text to a new temp file that was never
+removed and overwrite a shared ``resume/baseResume.txt``, and every
+optimization overwrote ``resume/optimizedResume.txt``: blocking writes inside
+async handlers, unbounded temp growth and concurrent requests racing on the
+same files.
+
+Artifacts are now only kept when ARTIFACT_SINK_ENABLED is set. ``record``
+never blocks: it samples the request, hands the text to a bounded queue and
+returns, and a background thread writes one file per artifact, named after
+its request ID, then prunes files beyond the count and age limits. When the
+queue is full the artifact is dropped rather than slowing the request.
+"""
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..config.settings import settings
+from ..request_context import get_request_id
+
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_NAME_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+class ArtifactSink:
+    """
+    Background writer of text artifacts with sampling and retention limits.
+
+    Args:
+        directory: Directory the artifacts are written to, created if missing
+        sample_rate: Fraction of requests whose artifacts are kept (0 to 1)
+        max_files: Most artifacts kept on disk (0 for no limit)
+        max_age: Seconds an artifact is kept (0 for no limit)
+        max_queue: Artifacts waiting to be written before new ones are dropped
+    """
+
+    def __init__(self, directory: Path, sample_rate: float = 1.0, max_files: int = 200,
+                 max_age: float = 0, max_queue: int = 64):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.max_age = max_age
+
+        self._queue: "queue.Queue[Optional[Tuple[float, str, str, str]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # (created, path) of the artifacts on disk, oldest first; owned by the writer thread
+        self._files: Deque[Tuple[float, Path]] = deque()
+
+        self.written = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.pruned = 0
+        self.errors = 0
+
+    def sampled(self, request_id: str) -> bool:
+        """Return whether artifacts of ``request_id`` are kept (the same for all of them)."""
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        digest = hashlib.blake2b(request_id.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64 < self.sample_rate
+
+    def record(self, kind: str, text: str, request_id: Optional[str] = None) -> Optional[str]:
+        """
+        Queue ``text`` to be written as a ``kind`` artifact of ``request_id``
+        (by default the current request's, or a new ID outside a request).
+        Returns the request ID, or None if the artifact was sampled out or
+        dropped because the queue is full.
+        """
+        request_id = request_id or get_request_id() or uuid.uuid4().hex
+        if not self.sampled(request_id):
+            self.skipped += 1
+            return None
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((time.time(), request_id, kind, text))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return request_id
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="artifact-sink", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._files.clear()
+            self._files.extend(sorted(
+                (path.stat().st_mtime, path) for path in self.directory.glob("*.txt")
+            ))
+        except OSError as e:
+            logger.warning("Could not scan artifact directory %s: %s", self.directory, e)
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._write(*item)
+                self._prune()
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Failed to write %s artifact: %s", item[2], e)
+
+    def _write(self, created: float, request_id: str, kind: str, text: str) -> None:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(created))
+        name = _UNSAFE_NAME_CHARS.sub("_", f"{stamp}-{request_id}-{kind}")
+        path = self.directory / f"{name}.txt"
+
+        # Write then rename, so readers never see a partial artifact
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        self._files.append((created, path))
+        self.written += 1
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.max_age if self.max_age else None
+        while self._files and (
+            (self.max_files and len(self._files) > self.max_files)
+            or (cutoff is not None and self._files[0][0] < cutoff)
+        ):
+            _, path = self._files.popleft()
+            try:
+                path.unlink()
+                self.pruned += 1
+            except FileNotFoundError:
+                pass
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the queued artifacts (waiting up to ``timeout`` seconds) and stop the writer."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and write/drop/prune counters."""
+        return {
+            "directory": str(self.directory),
+            "sampleRate": self.sample_rate,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "pruned": self.pruned,
+            "errors": self.errors
+        }
+
+
+_sink: Optional[ArtifactSink] = None
+_sink_created = False
+_sink_lock = threading.Lock()
+
+
+def get_artifact_sink() -> Optional[ArtifactSink]:
+    """
+    Return the process-wide sink, creating it on first use. None unless
+    ARTIFACT_SINK_ENABLED is set.
+    """
+    global _sink, _sink_created
+    if not _sink_created:
+        with _sink_lock:
+            if not _sink_created:
+                if settings.artifact_sink_enabled:
+                    _sink = ArtifactSink(
+                        Path(settings.artifact_sink_path),
+                        sample_rate=settings.artifact_sample_rate,
+                        max_files=settings.artifact_max_files,
+                        max_age=settings.artifact_max_age,
+                        max_queue=settings.artifact_queue_size
+                    )
+                _sink_created = True
+    return _sink
+
+
+def record_artifact(kind: str, text: str, request_id: Optional[str] = None) -> Optional[str]:
+    """Queue a debug artifact if the sink is enabled. Never blocks or raises."""
+    sink = get_artifact_sink()
+    if sink is None or not text:
+        return None
+    return sink.record(kind, text, request_id)
+
+
+def close_artifact_sink() -> None:
+    """Flush and stop the sink at shutdown, if it was started."""
+    if _sink is not None:
+        _sink.close()
@@ -0,0 +1,179 @@
+"""
+Bounded, TTL-aware LRU caches shared by the analysis services.
+
+Every cache is limited by entry count and, optionally, by an approximate byte
+budget and a time-to-live, so memory use stays flat however long a worker
+runs. Caches register themselves by name so they can be inspected and flushed
+through the admin endpoints.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory footprint of a cached value in bytes.
+    Recurses into the JSON-like structures the services cache.
+    """
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with entry, byte and TTL limits.
+
+    Args:
+        name: Name used to register the cache for the admin endpoints
+        max_entries: Maximum number of entries (0 disables the limit)
+        max_bytes: Approximate byte budget for keys and values (0 disables the limit)
+        ttl: Seconds an entry stays valid after it is written (0 disables expiry)
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, max_bytes: int = 0, ttl: float = 0):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl = max(0.0, ttl)
+
+        # key -> (value, size in bytes, expiry timestamp or 0)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        register_cache(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for ``key``, or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, _, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert or replace ``key``, evicting least recently used entries as needed."""
+        size = estimate_size(key) + estimate_size(value)
+        if self.max_bytes and size > self.max_bytes:
+            # A single value larger than the whole budget is never cached
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while self._entries and (
+                (self.max_entries and len(self._entries) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key``. Returns True if it was present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> int:
+        """Remove every entry. Returns the number of entries dropped."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return False
+            expires_at = entry[2]
+            return not expires_at or expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size limits, current usage and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+# =========================================================
+# ---------------- CACHE REGISTRY -------------------------
+# =========================================================
+
+_registry: Dict[str, LRUCache] = {}
+_registry_lock = threading.Lock()
+
+
+def register_cache(cache: LRUCache) -> None:
+    """Register ``cache`` under its name, replacing any previous cache with that name."""
+    with _registry_lock:
+        _registry[cache.name] = cache
+
+
+def get_cache(name: str) -> Optional[LRUCache]:
+    """Return the registered cache called ``name``, if any."""
+    with _registry_lock:
+        return _registry.get(name)
+
+
+def list_caches() -> List[LRUCache]:
+    """Return all registered caches sorted by name."""
+    with _registry_lock:
+        return [_registry[name] for name in sorted(_registry)]
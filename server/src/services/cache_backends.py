@@ -0,0 +1,309 @@
+"""
+Pluggable cache backends for results that should be shared across workers.
+
+The in-process LRUCache gives every uvicorn worker its own cold cache, so N
+workers pay N times for the same OpenAI calls. The backends here share one
+store across the fleet:
+
+- InProcessCacheBackend: per-process LRUCache, no shared state
+- SQLiteCacheBackend: one SQLite file shared by every worker on the host
+- RedisCacheBackend: any Redis-protocol server shared by every host
+
+Shared backends are wrapped in a TieredCacheBackend so hot keys are still
+served from process memory. Values must be JSON-serializable.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+from .cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Async key/value cache interface used by the analysis services."""
+
+    name: str = "cache"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the value for ``key``, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry of this cache."""
+
+
+class InProcessCacheBackend(CacheBackend):
+    """Backend storing values in a bounded, per-process LRUCache."""
+
+    def __init__(self, name: str, max_entries: int = 1024, max_bytes: int = 0, ttl: float = 0):
+        self.name = name
+        self.cache = LRUCache(name, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self.cache.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    async def clear(self) -> None:
+        self.cache.clear()
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Backend storing JSON values in a SQLite file shared by all local workers.
+
+    Each backend owns a namespace inside the file. Queries run in a thread so
+    the event loop never waits on disk. Expired rows are ignored on read and
+    purged, together with rows beyond ``max_entries``, every few hundred writes.
+    """
+
+    PRUNE_EVERY = 200
+
+    def __init__(self, name: str, path: Path, max_entries: int = 0, ttl: float = 0):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.ttl = max(0.0, ttl)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key)"
+                ")"
+            )
+            self._conn.commit()
+
+    def _get_sync(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.name, key)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at and expires_at <= time.time():
+            return None
+        return json.loads(payload)
+
+    def _set_sync(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else 0.0
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, payload, created_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.name, key, payload, now, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at > 0 AND expires_at <= ?",
+            (self.name, now)
+        )
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key NOT IN ("
+                " SELECT key FROM cache_entries WHERE namespace = ?"
+                " ORDER BY created_at DESC LIMIT ?)",
+                (self.name, self.name, self.max_entries)
+            )
+
+    def _delete_sync(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.name, key)
+            )
+            self._conn.commit()
+
+    def _clear_sync(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.name,))
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self._set_sync, key, value)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete_sync, key)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear_sync)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend storing JSON values in a Redis-protocol server.
+
+    ``client`` may be any object with redis.asyncio's ``get``/``set``/
+    ``delete``/``scan_iter`` methods, which lets tests run against a local
+    stand-in. Without one, a client is created from ``url`` using the
+    optional ``redis`` package.
+    """
+
+    def __init__(self, name: str, url: str = "", ttl: float = 0, client: Any = None):
+        self.name = name
+        self.ttl = max(0, int(ttl))
+        self._prefix = f"ats:{name}:"
+
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError("The redis package is required for CACHE_BACKEND=redis") from e
+            client = redis_asyncio.from_url(url)
+        self._client = client
+
+    async def get(self, key: str) -> Optional[Any]:
+        payload = await self._client.get(self._prefix + key)
+        if payload is None:
+            return None
+        return json.loads(payload)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._client.set(
+            self._prefix + key,
+            json.dumps(value, ensure_ascii=False),
+            ex=self.ttl or None
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=self._prefix + "*"):
+            await self._client.delete(key)
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Process-local LRU in front of a shared backend.
+
+    Reads fall through to the shared store on a local miss; shared-store
+    errors are logged and treated as misses so a cache outage never fails a
+    request.
+    """
+
+    def __init__(self, local: InProcessCacheBackend, shared: CacheBackend):
+        self.name = local.name
+        self.local = local
+        self.shared = shared
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is not None:
+            return value
+
+        try:
+            value = await self.shared.get(key)
+        except Exception as e:
+            logger.warning("Shared cache '%s' read failed: %s", self.name, e)
+            return None
+
+        if value is not None:
+            await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.local.set(key, value)
+        try:
+            await self.shared.set(key, value)
+        except Exception as e:
+            logger.warning("Shared cache '%s' write failed: %s", self.name, e)
+
+    async def delete(self, key: str) -> None:
+        await self.local.delete(key)
+        try:
+            await self.shared.delete(key)
+        except Exception as e:
+            logger.warning("Shared cache '%s' delete failed: %s", self.name, e)
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        try:
+            await self.shared.clear()
+        except Exception as e:
+            logger.warning("Shared cache '%s' clear failed: %s", self.name, e)
+
+
+_backends: Dict[str, CacheBackend] = {}
+
+
+def list_shared_backends() -> List[CacheBackend]:
+    """Return the backends created with a shared store, sorted by name."""
+    return [_backends[name] for name in sorted(_backends)]
+
+
+def create_cache_backend(name: str, max_entries: int = 1024, max_bytes: int = 0, ttl: float = 0) -> CacheBackend:
+    """
+    Build the cache backend selected by ``settings.cache_backend``.
+
+    "memory" returns a plain InProcessCacheBackend; "sqlite" and "redis"
+    return the shared store behind a process-local LRU. If the shared store
+    cannot be opened the in-process backend is used instead.
+    """
+    local = InProcessCacheBackend(name, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+    backend = settings.cache_backend.lower()
+
+    try:
+        if backend == "sqlite":
+            shared = SQLiteCacheBackend(
+                name,
+                Path(settings.cache_sqlite_path),
+                max_entries=settings.shared_cache_max_entries,
+                ttl=ttl
+            )
+        elif backend == "redis":
+            shared = RedisCacheBackend(name, url=settings.redis_url, ttl=ttl)
+        else:
+            if backend != "memory":
+                logger.warning("Unknown cache backend '%s', using in-process cache", backend)
+            return local
+    except Exception as e:
+        logger.warning("Could not open %s cache backend for '%s': %s. Using in-process cache", backend, name, e)
+        return local
+
+    tiered = TieredCacheBackend(local, shared)
+    _backends[name] = tiered
+    return tiered
@@ -0,0 +1,116 @@
+"""
+Text extraction for non-PDF resume uploads.
+
+DOCX and plain-text uploads used to go through PyPDF2, fail, and fall back
+to OCR, spending seconds of CPU before failing anyway. They are parsed
+directly now: a DOCX's main document part is streamed out of the zip and
+parsed incrementally, and text files are decoded from their bytes. The
+results go through the same normalization and section detection as PDFs.
+"""
+import codecs
+import zipfile
+from io import BytesIO
+from typing import List
+from xml.etree.ElementTree import ParseError, iterparse
+
+
+class DocumentParseError(Exception):
+    """Raised when an upload cannot be parsed as the format it claims to be."""
+    pass
+
+
+DOCX_DOCUMENT_PART = "word/document.xml"
+# Decompressed size limit of the document part, against zip bombs
+DOCX_MAX_DOCUMENT_BYTES = 64 * 1024 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = _W + "p"
+_TEXT = _W + "t"
+_TAB = _W + "tab"
+_LINE_BREAKS = (_W + "br", _W + "cr")
+_LIST_PROPERTIES = _W + "numPr"
+
+_TEXT_ENCODINGS_BY_BOM = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def extract_docx_text(buffer: bytes) -> str:
+    """
+    Return the text of a DOCX file, one line per paragraph.
+
+    Paragraphs of numbered or bulleted lists are prefixed with "• " so the
+    bullet counting that PDFs get also works for Word lists. Paragraphs
+    nested in text boxes or table cells become lines of their own.
+
+    Raises:
+        DocumentParseError: If the buffer is not a readable DOCX file
+    """
+    try:
+        archive = zipfile.ZipFile(BytesIO(buffer))
+    except zipfile.BadZipFile as e:
+        raise DocumentParseError(f"Not a valid DOCX file: {e}")
+
+    with archive:
+        try:
+            info = archive.getinfo(DOCX_DOCUMENT_PART)
+        except KeyError:
+            raise DocumentParseError("Not a Word document: the archive has no word/document.xml")
+        if info.file_size > DOCX_MAX_DOCUMENT_BYTES:
+            raise DocumentParseError("DOCX document is too large to process")
+
+        paragraphs: List[str] = []
+        # Text pieces and list-item flag of each open paragraph, innermost last
+        open_pieces: List[List[str]] = []
+        open_list_items: List[bool] = []
+
+        try:
+            with archive.open(info) as part:
+                for event, element in iterparse(part, events=("start", "end")):
+                    tag = element.tag
+                    if event == "start":
+                        if tag == _PARAGRAPH:
+                            open_pieces.append([])
+                            open_list_items.append(False)
+                        continue
+
+                    if not open_pieces:
+                        continue
+                    pieces = open_pieces[-1]
+
+                    if tag == _TEXT:
+                        pieces.append(element.text or "")
+                    elif tag == _TAB:
+                        pieces.append("\t")
+                    elif tag in _LINE_BREAKS:
+                        pieces.append("\n")
+                    elif tag == _LIST_PROPERTIES:
+                        open_list_items[-1] = True
+                    elif tag == _PARAGRAPH:
+                        open_pieces.pop()
+                        is_list_item = open_list_items.pop()
+                        text = "".join(pieces)
+                        paragraphs.append(f"• {text}" if is_list_item and text.strip() else text)
+                        # Parsed paragraphs are no longer needed in the tree
+                        element.clear()
+        except (ParseError, zipfile.BadZipFile, EOFError) as e:
+            raise DocumentParseError(f"Could not read the DOCX document: {e}")
+
+    return "\n".join(paragraphs)
+
+
+def decode_text_file(buffer: bytes) -> str:
+    """
+    Decode a plain-text upload: by its byte order mark if it has one, else as
+    UTF-8, falling back to Windows-1252 (which also covers Latin-1).
+    """
+    for bom, encoding in _TEXT_ENCODINGS_BY_BOM:
+        if buffer.startswith(bom):
+            return buffer.decode(encoding, errors="replace")
+
+    try:
+        return buffer.decode("utf-8")
+    except UnicodeDecodeError:
+        return buffer.decode("cp1252", errors="replace")
@@ -0,0 +1,296 @@
+"""
+Content-addressed cache for text extraction results.
+
+Results are keyed by the SHA-256 of the uploaded bytes, so re-uploading the
+same resume skips PyPDF2, normalization and OCR entirely. A small in-memory
+LRU tier sits in front of a persistent store (SQLite or one JSON file per
+document) that survives restarts and is shared by every uvicorn worker on the
+host. The persistent tier is bounded by entry count and age, so it does not
+keep the text of every resume ever uploaded.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from .cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the extraction pipeline changes its output so stale entries are ignored
+EXTRACTION_CACHE_VERSION = 1
+
+# Name of the in-memory tier in the cache registry
+EXTRACTION_MEMORY_CACHE_NAME = "extraction"
+
+
+def compute_content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest used as the cache key for an upload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionStore(ABC):
+    """
+    Interface for the persistent tier of the extraction cache.
+
+    Args:
+        max_entries: Entries kept; the oldest are pruned beyond it (0 disables the limit)
+        ttl: Seconds an entry stays valid after it is written (0 disables expiry)
+    """
+
+    # Limits are enforced every this many writes
+    PRUNE_EVERY = 100
+
+    def __init__(self, max_entries: int = 0, ttl: float = 0):
+        self.max_entries = max(0, max_entries)
+        self.ttl = max(0.0, ttl)
+        self._writes = 0
+
+    def _prune_due(self) -> bool:
+        self._writes += 1
+        return self._writes % self.PRUNE_EVERY == 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result for ``key``, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store ``value`` under ``key``."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+
+class SQLiteExtractionStore(ExtractionStore):
+    """
+    Persistent tier backed by a single SQLite file.
+    WAL mode lets several worker processes read and write it concurrently.
+    Expired rows are ignored on read and purged, together with rows of older
+    cache versions and rows beyond ``max_entries``, every few writes.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 0, ttl: float = 0):
+        super().__init__(max_entries, ttl)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY,"
+                " version INTEGER NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " created_at REAL NOT NULL DEFAULT (strftime('%s', 'now'))"
+                ")"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM extractions WHERE key = ? AND version = ?",
+                (key, EXTRACTION_CACHE_VERSION)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, created_at = row
+        if self.ttl and float(created_at) + self.ttl <= time.time():
+            return None
+        return json.loads(payload)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, version, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, EXTRACTION_CACHE_VERSION, payload, now)
+            )
+            if self._prune_due():
+                self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute("DELETE FROM extractions WHERE version != ?", (EXTRACTION_CACHE_VERSION,))
+        if self.ttl:
+            self._conn.execute("DELETE FROM extractions WHERE created_at <= ?", (now - self.ttl,))
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM extractions WHERE key NOT IN ("
+                " SELECT key FROM extractions ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+
+
+class DiskExtractionStore(ExtractionStore):
+    """
+    Persistent tier storing one JSON file per document, sharded by hash prefix.
+    Files are written to a temporary name and renamed so readers never see
+    partial writes. A file's modification time is its write time: expired
+    files are ignored on read, and every few writes expired files and the
+    oldest files beyond ``max_entries`` are deleted.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 0, ttl: float = 0):
+        super().__init__(max_entries, ttl)
+        self._directory = directory / f"v{EXTRACTION_CACHE_VERSION}"
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            if self.ttl and path.stat().st_mtime + self.ttl <= time.time():
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        if self._prune_due():
+            self._prune(time.time())
+
+    def _prune(self, now: float) -> None:
+        files = []
+        for path in self._directory.glob("*/*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if self.ttl and mtime + self.ttl <= now:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((mtime, path))
+
+        if self.max_entries and len(files) > self.max_entries:
+            files.sort()
+            for _, path in files[:len(files) - self.max_entries]:
+                path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self._directory.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+
+
+class ExtractionCache:
+    """
+    Two-tier extraction cache: in-memory LRU over an optional persistent store.
+
+    Store errors are logged and treated as misses; a broken cache must never
+    fail an extraction.
+    """
+
+    def __init__(self, store: Optional[ExtractionStore] = None, memory_entries: int = 256):
+        self._store = store
+        self._memory = LRUCache(EXTRACTION_MEMORY_CACHE_NAME, max_entries=memory_entries)
+        self._memory_enabled = memory_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key`` or None."""
+        value = self._memory.get(key)
+        if value is not None:
+            return value
+
+        if self._store is None:
+            return None
+
+        try:
+            value = self._store.get(key)
+        except Exception as e:
+            logger.warning("Extraction cache read failed: %s", e)
+            return None
+
+        if value is not None and self._memory_enabled:
+            self._memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store ``value`` in both tiers."""
+        if self._memory_enabled:
+            self._memory.set(key, value)
+
+        if self._store is None:
+            return
+
+        try:
+            self._store.set(key, value)
+        except Exception as e:
+            logger.warning("Extraction cache write failed: %s", e)
+
+    def clear(self) -> int:
+        """
+        Drop every entry from both tiers. Returns the number of entries
+        dropped from memory; a failure to clear the store is logged.
+        """
+        count = self._memory.clear()
+        if self._store is not None:
+            try:
+                self._store.clear()
+            except Exception as e:
+                logger.warning("Extraction cache clear failed: %s", e)
+        return count
+
+
+def create_extraction_cache() -> ExtractionCache:
+    """
+    Build the extraction cache from settings.
+
+    ``settings.extraction_cache_backend`` selects the persistent tier:
+    "sqlite" (default), "disk", or "memory" for no persistence.
+    """
+    backend = settings.extraction_cache_backend.lower()
+    path = Path(settings.extraction_cache_path)
+    store: Optional[ExtractionStore] = None
+
+    try:
+        limits = {
+            "max_entries": settings.extraction_cache_max_entries,
+            "ttl": settings.extraction_cache_ttl
+        }
+        if backend == "sqlite":
+            store = SQLiteExtractionStore(path / "extraction.sqlite3", **limits)
+        elif backend == "disk":
+            store = DiskExtractionStore(path, **limits)
+        elif backend != "memory":
+            logger.warning("Unknown extraction cache backend '%s', using memory only", backend)
+    except Exception as e:
+        logger.warning("Could not open extraction cache at %s: %s. Using memory only", path, e)
+        store = None
+
+    return ExtractionCache(store, memory_entries=settings.extraction_cache_memory_entries)
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """
+    Return the application-wide extraction cache, opening it on first use so
+    extraction worker processes never touch the store.
+    """
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = create_extraction_cache()
+    return _extraction_cache
@@ -0,0 +1,153 @@
+"""
+Process-pool backed engine for CPU-bound text extraction.
+
+PyPDF2 parsing, PDF rasterization and Tesseract OCR are synchronous and can
+take seconds per document. Running them on the event loop stalls every other
+request on the worker, so the engine hands each job to a ProcessPoolExecutor
+and enforces a bounded queue and a per-job timeout on top of it.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from ..config.logging_config import configure_worker_logging
+from ..config.settings import settings
+from ..request_context import get_request_id, set_request_id
+from .ocr_pipeline import configure_ocr_worker
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionEngineSaturated(Exception):
+    """Raised when the engine already holds the maximum number of jobs."""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a job does not finish within the configured timeout."""
+
+
+def _init_worker() -> None:
+    """Set up logging and OCR threading in a new worker process."""
+    configure_worker_logging()
+    configure_ocr_worker()
+
+
+def _run_for_request(request_id: Optional[str], fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` in a worker with the caller's request ID current, for logging."""
+    set_request_id(request_id)
+    return fn(*args)
+
+
+class ExtractionEngine:
+    """
+    Bounded process pool for extraction jobs.
+
+    At most ``max_workers`` jobs run at once and up to ``max_queue`` more may
+    wait for a free worker. Any submission beyond that is rejected immediately
+    with ExtractionEngineSaturated so callers can answer with a fast 503
+    instead of piling up requests behind a busy pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.max_workers = max(1, max_workers or settings.extraction_workers)
+        self.max_queue = max(0, max_queue if max_queue is not None else settings.extraction_max_queue)
+        self.timeout = timeout or settings.extraction_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Released from the executor's thread when a job finishes
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Total number of jobs the engine accepts (running + queued)."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs currently running or waiting for a worker."""
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process and return its result.
+
+        ``fn`` and its arguments must be picklable (module-level function,
+        plain data arguments). A job keeps its slot until its worker is done
+        with it, even after the caller has timed out, so jobs still running
+        keep counting against the capacity.
+
+        Raises:
+            ExtractionEngineSaturated: If the engine is at capacity
+            ExtractionTimeout: If the job exceeds the configured timeout
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= self.capacity:
+                raise ExtractionEngineSaturated(
+                    f"Extraction engine is at capacity ({self.capacity} jobs)"
+                )
+            self._in_flight += 1
+
+        try:
+            job = self._get_executor().submit(_run_for_request, get_request_id(), fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        job.add_done_callback(self._release)
+
+        try:
+            # On timeout a job still waiting for a worker is cancelled; a
+            # running one cannot be interrupted and frees its slot when done
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise ExtractionTimeout(
+                f"Extraction did not finish within {self.timeout:g} seconds"
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge scan); start a fresh pool
+            # for subsequent jobs and surface the failure for this one.
+            logger.error("Extraction worker pool broke; recreating it")
+            self._reset_executor()
+            raise
+
+    def _release(self, job: Optional[Future] = None) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _reset_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, waiting for running jobs to finish.
+        The pool is recreated on next use.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        """Like shutdown(), without blocking the event loop while workers finish."""
+        await asyncio.to_thread(self.shutdown)
+
+
+# Application-wide engine instance; workers are started lazily on first use
+extraction_engine = ExtractionEngine()
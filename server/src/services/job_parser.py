@@ -0,0 +1,433 @@
+"""
+Job description parsing with a deterministic fast path.
+
+Pasted job descriptions used to be sent straight from the browser to OpenAI
+on every paste. Parsing now happens server-side: a rule-based extractor reads
+section headers ("Requirements", "Qualifications", ...), bullet lists and a
+skills dictionary, and scores how complete its result is. Only when that
+confidence is below ``settings.job_parse_min_confidence`` is the LLM asked.
+Results are cached by the hash of the normalized description.
+
+The returned job data has the shape the client's JobData expects: title,
+company, location, salary, requirements, responsibilities, skills,
+technologies, tools and qualifications.
+"""
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from .cache_backends import create_cache_backend
+from .keyword_matcher import get_matcher
+from .llm_gateway import get_llm_gateway
+
+
+logger = logging.getLogger(__name__)
+
+
+JOB_LIST_FIELDS = ["requirements", "responsibilities", "skills", "technologies", "tools", "qualifications"]
+JOB_TEXT_FIELDS = ["title", "company", "location", "salary"]
+
+# Parsed job data, shared across workers by the configured backend
+_job_parse_cache = create_cache_backend(
+    "job_parse",
+    max_entries=settings.job_parse_cache_max_entries,
+    ttl=settings.job_parse_cache_ttl
+)
+
+
+# =========================================================
+# ---------------- DICTIONARIES ---------------------------
+# =========================================================
+
+# Section headers (lowercase, without trailing colon) -> job data field
+SECTION_HEADERS = {
+    # Requirements
+    'requirements': 'requirements', 'job requirements': 'requirements',
+    'minimum requirements': 'requirements', 'what you need': 'requirements',
+    "what you'll need": 'requirements', 'what you will need': 'requirements',
+    "what we're looking for": 'requirements', 'what we are looking for': 'requirements',
+    'who you are': 'requirements', 'must have': 'requirements', 'must haves': 'requirements',
+    'you have': 'requirements', 'about you': 'requirements',
+
+    # Qualifications
+    'qualifications': 'qualifications', 'basic qualifications': 'qualifications',
+    'minimum qualifications': 'qualifications', 'required qualifications': 'qualifications',
+    'preferred qualifications': 'qualifications', 'education': 'qualifications',
+    'education and experience': 'qualifications', 'nice to have': 'qualifications',
+    'nice to haves': 'qualifications', 'bonus points': 'qualifications', 'preferred': 'qualifications',
+
+    # Responsibilities
+    'responsibilities': 'responsibilities', 'key responsibilities': 'responsibilities',
+    'job responsibilities': 'responsibilities', 'duties': 'responsibilities',
+    'job duties': 'responsibilities', 'essential duties': 'responsibilities',
+    "what you'll do": 'responsibilities', 'what you will do': 'responsibilities',
+    'the role': 'responsibilities', 'your role': 'responsibilities',
+    'day to day': 'responsibilities', 'in this role you will': 'responsibilities',
+
+    # Skills
+    'skills': 'skills', 'required skills': 'skills', 'technical skills': 'skills',
+    'key skills': 'skills', 'skills and experience': 'skills', 'competencies': 'skills',
+    'tech stack': 'technologies', 'our stack': 'technologies', 'technologies': 'technologies',
+    'tools': 'tools',
+}
+
+# Headers that end the current list section without starting a new one
+OTHER_HEADERS = {
+    'about us', 'about the company', 'who we are', 'benefits', 'perks', 'perks and benefits',
+    'what we offer', 'compensation', 'how to apply', 'equal opportunity employer',
+    'about the role', 'about the job', 'overview', 'job description', 'summary',
+}
+
+# Known terms (lowercase) -> display name, by field
+TECHNOLOGIES = {
+    'python': 'Python', 'java': 'Java', 'javascript': 'JavaScript', 'typescript': 'TypeScript',
+    'c++': 'C++', 'c#': 'C#', 'golang': 'Go', 'rust': 'Rust', 'ruby': 'Ruby',
+    'php': 'PHP', 'scala': 'Scala', 'kotlin': 'Kotlin', 'swift': 'Swift',
+    'sql': 'SQL', 'nosql': 'NoSQL', 'html': 'HTML', 'css': 'CSS', 'bash': 'Bash',
+    'react': 'React', 'react.js': 'React', 'angular': 'Angular', 'vue': 'Vue', 'vue.js': 'Vue',
+    'node.js': 'Node.js', 'nodejs': 'Node.js', 'django': 'Django', 'flask': 'Flask',
+    'fastapi': 'FastAPI', 'spring boot': 'Spring Boot', 'asp.net': 'ASP.NET', 'dotnet': '.NET', 'ruby on rails': 'Ruby on Rails',
+    'graphql': 'GraphQL', 'rest api': 'REST APIs', 'rest apis': 'REST APIs', 'grpc': 'gRPC',
+    'postgresql': 'PostgreSQL', 'postgres': 'PostgreSQL', 'mysql': 'MySQL', 'mongodb': 'MongoDB',
+    'redis': 'Redis', 'elasticsearch': 'Elasticsearch', 'kafka': 'Kafka', 'spark': 'Spark',
+    'hadoop': 'Hadoop', 'snowflake': 'Snowflake', 'bigquery': 'BigQuery',
+    'aws': 'AWS', 'azure': 'Azure', 'gcp': 'GCP', 'google cloud': 'GCP',
+    'kubernetes': 'Kubernetes', 'k8s': 'Kubernetes', 'docker': 'Docker', 'terraform': 'Terraform',
+    'tensorflow': 'TensorFlow', 'pytorch': 'PyTorch', 'pandas': 'pandas', 'numpy': 'NumPy',
+    'scikit-learn': 'scikit-learn', 'linux': 'Linux',
+}
+
+TOOLS = {
+    'git': 'Git', 'github': 'GitHub', 'gitlab': 'GitLab', 'jira': 'Jira', 'confluence': 'Confluence',
+    'jenkins': 'Jenkins', 'circleci': 'CircleCI', 'github actions': 'GitHub Actions',
+    'tableau': 'Tableau', 'power bi': 'Power BI', 'looker': 'Looker', 'microsoft excel': 'Excel', 'ms excel': 'Excel',
+    'figma': 'Figma', 'sketch': 'Sketch', 'salesforce': 'Salesforce', 'hubspot': 'HubSpot',
+    'sap': 'SAP', 'quickbooks': 'QuickBooks', 'workday': 'Workday', 'slack': 'Slack',
+    'datadog': 'Datadog', 'grafana': 'Grafana', 'prometheus': 'Prometheus', 'airflow': 'Airflow',
+    'dbt': 'dbt', 'postman': 'Postman', 'google analytics': 'Google Analytics',
+}
+
+SKILLS = {
+    'machine learning': 'Machine Learning', 'deep learning': 'Deep Learning',
+    'data analysis': 'Data Analysis', 'data science': 'Data Science', 'data engineering': 'Data Engineering',
+    'data visualization': 'Data Visualization', 'statistics': 'Statistics', 'etl': 'ETL',
+    'a/b testing': 'A/B Testing', 'nlp': 'NLP', 'computer vision': 'Computer Vision',
+    'ci/cd': 'CI/CD', 'devops': 'DevOps', 'microservices': 'Microservices',
+    'distributed systems': 'Distributed Systems', 'system design': 'System Design',
+    'cloud computing': 'Cloud Computing', 'api design': 'API Design', 'unit testing': 'Unit Testing',
+    'test automation': 'Test Automation', 'agile': 'Agile', 'scrum': 'Scrum', 'kanban': 'Kanban',
+    'project management': 'Project Management', 'product management': 'Product Management',
+    'stakeholder management': 'Stakeholder Management', 'six sigma': 'Six Sigma',
+    'seo': 'SEO', 'content marketing': 'Content Marketing', 'digital marketing': 'Digital Marketing',
+    'financial modeling': 'Financial Modeling', 'forecasting': 'Forecasting', 'budgeting': 'Budgeting',
+    'gaap': 'GAAP', 'accounts payable': 'Accounts Payable', 'customer service': 'Customer Service',
+    'sales': 'Sales', 'negotiation': 'Negotiation', 'recruiting': 'Recruiting',
+    'patient care': 'Patient Care', 'communication': 'Communication', 'leadership': 'Leadership',
+    'mentoring': 'Mentoring', 'problem solving': 'Problem Solving',
+}
+
+_LABEL_PATTERN = re.compile(
+    r'^\s*(job title|title|position|role|company|employer|location|salary|compensation|pay|pay range)\s*:\s*(.+)$',
+    re.IGNORECASE
+)
+_BULLET_PATTERN = re.compile(r'^\s*(?:[-•*●▪◦·–]|\d+[.)])\s+')
+_SALARY_PATTERN = re.compile(
+    r'\$\s?\d[\d,]*(?:\.\d+)?\s?[kK]?'
+    r'(?:\s?(?:-|–|to)\s?\$?\s?\d[\d,]*(?:\.\d+)?\s?[kK]?)?'
+    r'(?:\s*(?:per|/|an?)\s*(?:year|yr|annum|hour|hr))?'
+)
+_LOCATION_PATTERN = re.compile(
+    r'\b(remote|hybrid|on-?site)\b|\b([A-Z][a-zA-Z.]+(?: [A-Z][a-zA-Z.]+)*, (?:[A-Z]{2}|[A-Z][a-z]+))\b'
+)
+_TITLE_AT_PATTERN = re.compile(r'^(.{3,80}?)\s+(?:at|@|-|–|\|)\s+([A-Z][\w&.,\' ]{1,60})$')
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Normalize a job description so trivially different pastes share a cache entry.
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = [re.sub(r'[ \t ]+', ' ', line).strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def _job_cache_key(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _empty_job_data() -> Dict[str, Any]:
+    return {
+        "title": "",
+        "company": "",
+        "location": "",
+        "salary": "",
+        **{field: [] for field in JOB_LIST_FIELDS}
+    }
+
+
+def _header_field(line: str) -> Tuple[bool, Optional[str]]:
+    """
+    Return (is_header, field) for a line; field is None for headers of
+    sections that are not extracted (benefits, about us, ...).
+    """
+    candidate = line.strip().strip('#*').strip().rstrip(':').strip().lower()
+    if not candidate or len(candidate.split()) > 6:
+        return False, None
+    if candidate in SECTION_HEADERS:
+        return True, SECTION_HEADERS[candidate]
+    if candidate in OTHER_HEADERS:
+        return True, None
+    return False, None
+
+
+def _dedupe(items: List[str]) -> List[str]:
+    seen = set()
+    result = []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+# =========================================================
+# ---------------- RULE-BASED EXTRACTION -----------------
+# =========================================================
+
+def extract_job_data_rules(description: str) -> Tuple[Dict[str, Any], float]:
+    """
+    Extract job data with section headers, bullet lists and the skills
+    dictionaries. Returns the job data and a confidence between 0 and 1.
+    """
+    job_data = _empty_job_data()
+    lines = description.split('\n')
+
+    current_field: Optional[str] = None
+    first_content_line: Optional[str] = None
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        label = _LABEL_PATTERN.match(stripped)
+        if label:
+            name, value = label.group(1).lower(), label.group(2).strip()
+            if name in ('job title', 'title', 'position', 'role'):
+                job_data["title"] = job_data["title"] or value
+            elif name in ('company', 'employer'):
+                job_data["company"] = job_data["company"] or value
+            elif name == 'location':
+                job_data["location"] = job_data["location"] or value
+            else:
+                job_data["salary"] = job_data["salary"] or value
+            continue
+
+        is_header, field = _header_field(stripped)
+        if not is_header and ':' in stripped:
+            # Inline header, e.g. "Requirements: Python, SQL, 3+ years"
+            head, _, rest = stripped.partition(':')
+            inline_header, inline_field = _header_field(head)
+            if inline_header and inline_field and rest.strip():
+                job_data[inline_field].extend(
+                    item.strip() for item in re.split(r'[,;]', rest) if item.strip()
+                )
+                continue
+        if is_header:
+            current_field = field
+            continue
+
+        if first_content_line is None:
+            first_content_line = stripped
+
+        if current_field:
+            item = _BULLET_PATTERN.sub('', stripped).strip()
+            # Long paragraphs inside a section are prose, not list items
+            if item and (len(item) <= 200 or _BULLET_PATTERN.match(stripped)):
+                job_data[current_field].append(item)
+
+    # Title (and often company) from the first line when there is no label
+    if not job_data["title"] and first_content_line and len(first_content_line.split()) <= 10:
+        at_match = _TITLE_AT_PATTERN.match(first_content_line)
+        if at_match:
+            job_data["title"] = at_match.group(1).strip()
+            job_data["company"] = job_data["company"] or at_match.group(2).strip()
+        elif not first_content_line.endswith('.'):
+            job_data["title"] = first_content_line
+
+    if not job_data["salary"]:
+        salary = _SALARY_PATTERN.search(description)
+        if salary:
+            job_data["salary"] = salary.group(0).strip()
+
+    if not job_data["location"]:
+        location = _LOCATION_PATTERN.search(description)
+        if location:
+            job_data["location"] = (location.group(1) or location.group(2)).strip()
+            if location.group(1):
+                job_data["location"] = job_data["location"].capitalize()
+
+    # Dictionary terms anywhere in the description, found in one scan. Terms
+    # that start or end with punctuation ("c++") cannot satisfy a regex-style
+    # word boundary there, so they match as substrings
+    dictionaries = {"technologies": TECHNOLOGIES, "tools": TOOLS, "skills": SKILLS}
+    matcher = get_matcher(
+        (term, (field, term), term[0].isalnum() and term[-1].isalnum())
+        for field, terms in dictionaries.items()
+        for term in terms
+    )
+    found = matcher.find(description.lower())
+    for field, terms in dictionaries.items():
+        job_data[field].extend(display for term, display in terms.items() if (field, term) in found)
+
+    for field in JOB_LIST_FIELDS:
+        job_data[field] = _dedupe(job_data[field])
+
+    return job_data, _rule_confidence(job_data)
+
+
+def _rule_confidence(job_data: Dict[str, Any]) -> float:
+    """
+    Score how complete a rule-based extraction is.
+
+    Keyword analysis needs requirements/qualifications and concrete skills
+    most, so those carry most of the weight.
+    """
+    confidence = 0.0
+    if job_data["title"]:
+        confidence += 0.15
+    if len(job_data["requirements"]) + len(job_data["qualifications"]) >= 2:
+        confidence += 0.3
+    if len(job_data["skills"]) + len(job_data["technologies"]) + len(job_data["tools"]) >= 3:
+        confidence += 0.3
+    if job_data["responsibilities"]:
+        confidence += 0.1
+    if job_data["company"]:
+        confidence += 0.075
+    if job_data["location"]:
+        confidence += 0.075
+    return round(confidence, 3)
+
+
+# =========================================================
+# ---------------- AI EXTRACTION --------------------------
+# =========================================================
+
+async def _extract_job_data_with_ai(description: str) -> Optional[Dict[str, Any]]:
+    """
+    Ask the LLM for structured job data. Returns None if it is unavailable or fails.
+    """
+    gateway = get_llm_gateway()
+    if not gateway.available:
+        logger.info("No OpenAI API key found. Using rule-based job parsing.")
+        return None
+
+    try:
+        response = await gateway.chat(
+            operation="job_parse",
+            model=settings.openai_model or "gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a job description analyzer. Extract structured data from job descriptions and return it as JSON."
+                },
+                {
+                    "role": "user",
+                    "content": f"""Extract the following information from this job description and return ONLY valid JSON (no markdown, no code blocks, just pure JSON):
+{{
+  "title": "job title",
+  "company": "company name",
+  "location": "location",
+  "salary": "$XXk - $XXk or description",
+  "requirements": ["requirement 1", "requirement 2"],
+  "responsibilities": ["responsibility 1"],
+  "skills": ["skill 1", "skill 2"],
+  "technologies": ["tech 1", "tech 2"],
+  "tools": ["tool 1", "tool 2"],
+  "qualifications": ["qualification 1"]
+}}
+
+Job Description:
+{description}"""
+                }
+            ],
+            temperature=0.3,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        )
+
+        content = response.choices[0].message.content.strip()
+        content = re.sub(r"^```(?:json)?|```$", "", content, flags=re.MULTILINE).strip()
+        return _coerce_job_data(json.loads(content))
+
+    except Exception as e:
+        logger.warning("AI job parsing failed: %s", e)
+        return None
+
+
+def _coerce_job_data(data: Any) -> Dict[str, Any]:
+    """
+    Force model output into the JobData shape (strings and lists of strings).
+    """
+    job_data = _empty_job_data()
+    if not isinstance(data, dict):
+        return job_data
+
+    for field in JOB_TEXT_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            job_data[field] = value.strip()
+
+    for field in JOB_LIST_FIELDS:
+        value = data.get(field)
+        if isinstance(value, list):
+            job_data[field] = _dedupe([str(item).strip() for item in value if str(item).strip()])
+
+    return job_data
+
+
+# =========================================================
+# ---------------- PUBLIC ENTRY POINT ---------------------
+# =========================================================
+
+async def parse_job_description(description: str) -> Dict[str, Any]:
+    """
+    Parse a pasted job description into job data.
+
+    Returns:
+        Dict with "jobData", "source" ("rules" or "ai"), the rule-based
+        "confidence" and whether the result came from the cache ("cacheHit")
+    """
+    normalized = normalize_job_description(description)
+    cache_key = _job_cache_key(normalized)
+
+    cached_result = await _job_parse_cache.get(cache_key)
+    if cached_result is not None:
+        logger.debug("Cache hit for job parsing")
+        return {**cached_result, "cacheHit": True}
+
+    job_data, confidence = extract_job_data_rules(normalized)
+    source = "rules"
+
+    if confidence < settings.job_parse_min_confidence:
+        logger.info("Rule-based job parsing confidence %s is low; using AI", confidence)
+        ai_job_data = await _extract_job_data_with_ai(normalized)
+        if ai_job_data is not None and any(ai_job_data.values()):
+            # Keep rule-based values for anything the model left empty
+            for field, value in ai_job_data.items():
+                if value:
+                    job_data[field] = value
+            source = "ai"
+
+    result = {"jobData": job_data, "source": source, "confidence": confidence}
+
+    # A low-confidence rule result is not cached, so a later request can still reach the AI
+    if source == "ai" or confidence >= settings.job_parse_min_confidence:
+        await _job_parse_cache.set(cache_key, result)
+
+    return {**result, "cacheHit": False}
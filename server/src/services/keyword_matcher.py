@@ -0,0 +1,150 @@
+"""
+Single-pass multi-keyword matching (Aho-Corasick).
+
+Keyword analysis used to build a fresh ``r'\\b...\\b'`` regex for every job
+phrase (and again for its plural, singular and known variations) and search
+the whole resume with each one, which costs O(phrases x resume length). A
+KeywordMatcher compiles every pattern into one automaton and reports all
+matches, including overlapping ones, in a single scan of the text.
+
+Each pattern either requires word boundaries at both ends - with exactly the
+semantics of regex ``\\b`` - or matches as a plain substring.
+"""
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+from .cache import LRUCache
+
+
+# (pattern, key, word_boundary)
+MatcherEntry = Tuple[str, Hashable, bool]
+
+
+def _is_word_char(char: str) -> bool:
+    """Mirror the regex ``\\w`` class for str patterns."""
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over lowercase patterns.
+
+    Patterns and scanned text are compared as given; callers lowercase both
+    (the analysis services compare lowercased resume text with lowercased
+    phrases). Several patterns may share one key; ``find`` returns the set of
+    keys with at least one valid match.
+    """
+
+    def __init__(self, entries: Iterable[MatcherEntry] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (pattern length, key, word_boundary) for every pattern ending here
+        self._outputs: List[List[Tuple[int, Hashable, bool]]] = [[]]
+        # Resolved transitions (trie edges plus failure links), filled in lazily
+        # so scanning takes exactly one dict lookup per character
+        self._delta: List[Dict[str, int]] = [{}]
+        self._built = False
+
+        for pattern, key, word_boundary in entries:
+            self.add(pattern, key, word_boundary)
+        self.build()
+
+    def add(self, pattern: str, key: Hashable, word_boundary: bool = True) -> None:
+        """Add a pattern reported under ``key``. Empty patterns are ignored."""
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._delta.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append((len(pattern), key, word_boundary))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links; called automatically by the constructor and find()."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit the outputs reachable through the failure link
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+        self._delta = [dict(edges) for edges in self._goto]
+        self._built = True
+
+    def _transition(self, state: int, char: str) -> int:
+        """Follow failure links from ``state`` on ``char`` and memoize the result."""
+        origin = state
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        target = self._goto[state].get(char, 0)
+        self._delta[origin][char] = target
+        return target
+
+    def find(self, text: str) -> Set[Hashable]:
+        """Scan ``text`` once and return the keys of all patterns that match."""
+        if not self._built:
+            self.build()
+
+        delta = self._delta
+        outputs = self._outputs
+        transition = self._transition
+        text_length = len(text)
+
+        found: Set[Hashable] = set()
+        state = 0
+
+        for end, char in enumerate(text, start=1):
+            next_state = delta[state].get(char)
+            state = transition(state, char) if next_state is None else next_state
+
+            if not outputs[state]:
+                continue
+
+            for length, key, word_boundary in outputs[state]:
+                if key in found:
+                    continue
+                if word_boundary:
+                    start = end - length
+                    before = start > 0 and _is_word_char(text[start - 1])
+                    if before == _is_word_char(text[start]):
+                        continue
+                    after = end < text_length and _is_word_char(text[end])
+                    if after == _is_word_char(text[end - 1]):
+                        continue
+                found.add(key)
+
+        return found
+
+
+# Compiled matchers keyed by their entries, so repeated analyses of the same
+# job (or the same keyword set) skip automaton construction
+_matcher_cache = LRUCache("keyword_matchers", max_entries=256)
+
+
+def get_matcher(entries: Iterable[MatcherEntry]) -> KeywordMatcher:
+    """Return a compiled matcher for ``entries``, reusing a cached one if possible."""
+    entries = tuple(entries)
+    matcher = _matcher_cache.get(entries)
+    if matcher is None:
+        matcher = KeywordMatcher(entries)
+        _matcher_cache.set(entries, matcher)
+    return matcher
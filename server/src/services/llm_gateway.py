@@ -0,0 +1,265 @@
+"""
+Shared async gateway to the OpenAI API.
+
+One AsyncOpenAI client with a pooled httpx transport is created for the whole
+application (in the FastAPI lifespan), so requests reuse keep-alive
+connections and TLS sessions instead of building a new client per call. A
+semaphore caps the number of in-flight requests, and transient failures
+(429, 5xx, connection errors, timeouts) are retried with jittered exponential
+backoff.
+
+Tests can point the gateway at a local fake server via OPENAI_BASE_URL, or
+install their own instance with set_llm_gateway().
+
+Every request is timed and its token usage counted under the caller's
+``operation`` name (see metrics).
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    RateLimitError,
+)
+
+from ..config.settings import settings
+from .metrics import LLM_REQUEST_SECONDS, record_llm_usage
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailable(Exception):
+    """Raised when no OpenAI API key is configured."""
+
+
+class LLMGateway:
+    """
+    Concurrency-limited, retrying wrapper around a shared AsyncOpenAI client.
+
+    Args:
+        api_key: OpenAI API key; without one the gateway reports unavailable
+        base_url: Alternative API endpoint (e.g. a local fake server)
+        max_concurrency: Maximum requests in flight at once
+        max_connections: Size of the httpx connection pool
+        timeout: Default per-call timeout in seconds
+        max_retries: Retries after the first attempt for transient errors
+        backoff_base: Base delay in seconds for exponential backoff
+        backoff_max: Upper bound for a single backoff delay
+        client: Pre-built AsyncOpenAI-compatible client (for tests)
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        base_url: Optional[str] = None,
+        max_concurrency: int = 16,
+        max_connections: int = 32,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        client: Any = None
+    ):
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+        if client is None and api_key:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=httpx.Timeout(timeout, connect=10.0)
+            )
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url or None,
+                http_client=self._http_client,
+                max_retries=0  # Retries are handled here, with jitter
+            )
+        self._client = client
+
+    @classmethod
+    def from_settings(cls) -> "LLMGateway":
+        """Create a gateway configured from application settings."""
+        return cls(
+            api_key=settings.openai_api_key or os.getenv("OPENAI_API_KEY", ""),
+            base_url=settings.openai_base_url,
+            max_concurrency=settings.llm_max_concurrency,
+            max_connections=settings.llm_max_connections,
+            timeout=settings.llm_timeout,
+            max_retries=settings.llm_max_retries,
+            backoff_base=settings.llm_backoff_base,
+            backoff_max=settings.llm_backoff_max
+        )
+
+    @property
+    def available(self) -> bool:
+        """Whether the gateway can make requests (an API key is configured)."""
+        return self._client is not None
+
+    async def chat(self, timeout: Optional[float] = None, operation: str = "chat", **kwargs: Any) -> Any:
+        """
+        Create a chat completion, retrying transient failures.
+
+        Accepts the same keyword arguments as
+        ``AsyncOpenAI.chat.completions.create``. ``operation`` names the
+        caller in the request latency and token usage metrics.
+
+        Raises:
+            LLMUnavailable: If no API key is configured
+            openai.APIError: If the request fails permanently or retries run out
+        """
+        if self._client is None:
+            raise LLMUnavailable("OpenAI API key not configured")
+
+        model = kwargs.get("model", "")
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self._client.chat.completions.create(
+                        timeout=timeout or self.timeout,
+                        **kwargs
+                    )
+                break
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    LLM_REQUEST_SECONDS.observe(
+                        time.perf_counter() - start, operation=operation, model=model, outcome="error"
+                    )
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                logger.warning(
+                    "OpenAI request failed (%s); retry %s/%s in %.2fs",
+                    type(e).__name__, attempt, self.max_retries, delay
+                )
+                await asyncio.sleep(delay)
+
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, operation=operation, model=model, outcome="success")
+        record_llm_usage(operation, model, getattr(response, "usage", None))
+        return response
+
+    async def stream_chat(
+            self,
+            timeout: Optional[float] = None,
+            operation: str = "chat",
+            **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+
+        Opening the stream is retried like chat(); once tokens have been
+        yielded a failure is raised to the caller instead of being retried.
+        The concurrency slot is held until the stream is exhausted or closed.
+        Token usage is requested in the stream's final chunk and counted
+        under ``operation`` like chat().
+
+        Raises:
+            LLMUnavailable: If no API key is configured
+            openai.APIError: If the request fails permanently or retries run out
+        """
+        if self._client is None:
+            raise LLMUnavailable("OpenAI API key not configured")
+
+        model = kwargs.get("model", "")
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await self._semaphore.acquire()
+            try:
+                stream = await self._client.chat.completions.create(
+                    stream=True,
+                    timeout=timeout or self.timeout,
+                    **kwargs
+                )
+                break
+            except Exception as e:
+                self._semaphore.release()
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    LLM_REQUEST_SECONDS.observe(
+                        time.perf_counter() - start, operation=operation, model=model, outcome="error"
+                    )
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                logger.warning(
+                    "OpenAI stream failed to open (%s); retry %s/%s in %.2fs",
+                    type(e).__name__, attempt, self.max_retries, delay
+                )
+                await asyncio.sleep(delay)
+
+        outcome = "error"
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+                # Only the final chunk carries usage, with no choices
+                record_llm_usage(operation, model, getattr(chunk, "usage", None))
+            outcome = "success"
+        finally:
+            self._semaphore.release()
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, operation=operation, model=model, outcome=outcome)
+            await stream.close()
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+            return True
+        return isinstance(error, APIStatusError) and error.status_code >= 500
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        # Honour the server's Retry-After hint when it gives one
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+
+        # Full jitter: uniform between 0 and the capped exponential delay
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+
+
+_gateway: Optional[LLMGateway] = None
+
+
+def set_llm_gateway(gateway: Optional[LLMGateway]) -> None:
+    """Install the application-wide gateway (called from the app lifespan or tests)."""
+    global _gateway
+    _gateway = gateway
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Return the application-wide gateway, creating one from settings if the
+    lifespan has not installed one (e.g. when services are used from scripts).
+    """
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway.from_settings()
+    return _gateway
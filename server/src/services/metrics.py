@@ -0,0 +1,329 @@
+"""
+In-process metrics exported in the Prometheus text format.
+
+The services time each stage of extraction, keyword analysis and resume
+optimization with stage_timer(), so a slow request can be attributed to
+regex matching, an AI call or response parsing instead of only showing up
+as a slow endpoint. Durations are aggregated into fixed-bucket histograms
+and LLM token usage into counters; cache, request-coalescing and debug
+artifact statistics are read from their owners when the metrics are rendered.
+
+Metrics are kept per API process. Work done inside extraction worker
+processes is timed from the API process around the call into the engine.
+"""
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .artifact_sink import get_artifact_sink
+from .cache import list_caches
+from .single_flight import list_flights
+
+
+# Seconds; covers sub-millisecond regex stages up to multi-minute LLM calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """
+    Base class for metrics with a fixed set of label names.
+
+    Args:
+        name: Metric name as exported
+        help: One-line description
+        labels: Names of the labels every sample carries
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        register_metric(self)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (name suffix, formatted labels, value) for every sample."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop every recorded sample."""
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label combination."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self._values: Dict[LabelValues, float] = {}
+        super().__init__(name, help, labels)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add ``amount`` (default 1) to the counter for ``labels``."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current count for ``labels``."""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", _format_labels(self.label_names, key), value) for key, value in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets, with their sum
+    and count, per label combination.
+
+    Args:
+        buckets: Upper bounds of the buckets, ascending; +Inf is added
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+        super().__init__(name, help, labels)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation of ``value`` for ``labels``."""
+        key = self._label_values(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations for ``labels``."""
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return series[2] if series else 0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._series.items())
+
+        samples = []
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        names = (*self.label_names, "le")
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", _format_labels(names, (*key, bound)), cumulative))
+            labels = _format_labels(self.label_names, key)
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return samples
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+# =========================================================
+# ---------------- METRIC REGISTRY ------------------------
+# =========================================================
+
+_registry: Dict[str, Metric] = {}
+_registry_lock = threading.Lock()
+
+# Functions returning (name, type, help, [(labels, value), ...]) read at render time
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+_collectors: List[Collector] = []
+
+
+def register_metric(metric: Metric) -> None:
+    """Register ``metric`` under its name, replacing any previous metric with that name."""
+    with _registry_lock:
+        _registry[metric.name] = metric
+
+
+def get_metric(name: str) -> Optional[Metric]:
+    """Return the registered metric called ``name``, if any."""
+    with _registry_lock:
+        return _registry.get(name)
+
+
+def register_collector(collector: Collector) -> None:
+    """Register a function whose metrics are read each time metrics are rendered."""
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """Render every registered metric and collector in the Prometheus text format."""
+    with _registry_lock:
+        metrics = [_registry[name] for name in sorted(_registry)]
+        collectors = list(_collectors)
+
+    lines: List[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for suffix, labels, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+
+    for collector in collectors:
+        for name, metric_type, help, samples in collector():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# ---------------- APPLICATION METRICS --------------------
+# =========================================================
+
+STAGE_SECONDS = Histogram(
+    "ats_stage_duration_seconds",
+    "Duration of each stage of extraction, analysis and optimization.",
+    labels=("operation", "stage")
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "ats_llm_request_duration_seconds",
+    "Duration of OpenAI chat requests, including retries.",
+    labels=("operation", "model", "outcome")
+)
+
+LLM_TOKENS = Counter(
+    "ats_llm_tokens_total",
+    "OpenAI tokens used, as reported in response usage.",
+    labels=("operation", "model", "kind")
+)
+
+
+def stage_timer(operation: str, stage: str):
+    """
+    Time a stage of ``operation`` into ats_stage_duration_seconds::
+
+        with stage_timer("analyze", "phrase_matching"):
+            ...
+    """
+    return STAGE_SECONDS.time(operation=operation, stage=stage)
+
+
+def record_llm_usage(operation: str, model: str, usage) -> None:
+    """Count the prompt and completion tokens of an OpenAI response's ``usage``."""
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.inc(tokens, operation=operation, model=model, kind=kind)
+
+
+def _collect_cache_metrics():
+    caches = [cache.stats() for cache in list_caches()]
+    flights = [flight.stats() for flight in list_flights()]
+
+    def per_cache(field: str):
+        return [({"cache": stats["name"]}, stats[field]) for stats in caches]
+
+    def per_flight(field: str):
+        return [({"group": stats["name"]}, stats[field]) for stats in flights]
+
+    return [
+        ("ats_cache_hits_total", "counter", "Lookups answered by an in-process cache.", per_cache("hits")),
+        ("ats_cache_misses_total", "counter", "Lookups an in-process cache could not answer.", per_cache("misses")),
+        ("ats_cache_evictions_total", "counter", "Entries evicted to stay within cache limits.", per_cache("evictions")),
+        ("ats_cache_hit_ratio", "gauge", "Share of lookups answered by the cache since startup.", per_cache("hitRatio")),
+        ("ats_cache_entries", "gauge", "Entries currently held by the cache.", per_cache("entries")),
+        ("ats_cache_bytes", "gauge", "Approximate memory held by the cache.", per_cache("bytes")),
+        ("ats_single_flight_executions_total", "counter", "Calls that ran their work.", per_flight("executions")),
+        ("ats_single_flight_coalesced_total", "counter", "Calls that awaited an identical call in flight.", per_flight("coalesced")),
+        ("ats_single_flight_in_flight", "gauge", "Distinct calls currently in flight.", per_flight("inFlight")),
+    ]
+
+
+def _collect_artifact_metrics():
+    sink = get_artifact_sink()
+    if sink is None:
+        return []
+    stats = sink.stats()
+
+    def total(field: str):
+        return [({}, stats[field])]
+
+    return [
+        ("ats_artifacts_written_total", "counter", "Debug artifacts written to disk.", total("written")),
+        ("ats_artifacts_dropped_total", "counter", "Debug artifacts dropped because the write queue was full.", total("dropped")),
+        ("ats_artifacts_skipped_total", "counter", "Debug artifacts left out by sampling.", total("skipped")),
+        ("ats_artifacts_pruned_total", "counter", "Debug artifacts deleted by the retention limits.", total("pruned")),
+        ("ats_artifact_write_errors_total", "counter", "Debug artifacts that failed to write.", total("errors")),
+        ("ats_artifact_queue_depth", "gauge", "Debug artifacts waiting to be written.", total("queued")),
+    ]
+
+
+register_collector(_collect_cache_metrics)
+register_collector(_collect_artifact_metrics)
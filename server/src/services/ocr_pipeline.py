@@ -0,0 +1,189 @@
+"""
+Page-streaming OCR pipeline for scanned PDFs.
+
+Pages are rasterized one at a time (pdf2image ``first_page``/``last_page``)
+instead of converting the whole document up front, so only the bitmaps of the
+pages currently being recognized are held in memory. Pages are OCR'd in
+parallel by a small thread pool - Tesseract runs as a subprocess, so threads
+give real parallelism here - and processing stops as soon as enough text has
+been recovered.
+
+Each page is first rendered at a low DPI; it is re-rendered at the maximum DPI
+only when Tesseract's mean word confidence falls below the configured
+threshold.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import PyPDF2
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+import pytesseract
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+TESSERACT_CONFIG = '--psm 6'
+
+
+def configure_ocr_worker() -> None:
+    """
+    Limit Tesseract to one OpenMP thread in this process and the Tesseract
+    subprocesses it starts. Called by the extraction worker initializer:
+    several parallel single-threaded processes are faster than several
+    processes fighting over all cores.
+    """
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def count_pdf_pages(pdf_buffer: bytes) -> int:
+    """
+    Return the number of pages in a PDF without rasterizing it.
+    """
+    try:
+        return int(pdfinfo_from_bytes(pdf_buffer)["Pages"])
+    except Exception:
+        return len(PyPDF2.PdfReader(BytesIO(pdf_buffer)).pages)
+
+
+def _ocr_image(image) -> Tuple[str, float]:
+    """
+    OCR a single page image.
+    Returns the recognized text and the mean word confidence (0-100).
+    """
+    data = pytesseract.image_to_data(
+        image,
+        config=TESSERACT_CONFIG,
+        output_type=pytesseract.Output.DICT
+    )
+
+    lines: List[str] = []
+    current_line: List[str] = []
+    current_key = None
+    confidences: List[float] = []
+
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        if not word:
+            continue
+
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        if key != current_key and current_line:
+            lines.append(" ".join(current_line))
+            current_line = []
+        current_key = key
+        current_line.append(word)
+
+        conf = float(data["conf"][i])
+        if conf >= 0:
+            confidences.append(conf)
+
+    if current_line:
+        lines.append(" ".join(current_line))
+
+    mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return "\n".join(lines), mean_confidence
+
+
+def _rasterize_page(pdf_buffer: bytes, page_number: int, dpi: int):
+    """
+    Render a single 1-based page of the PDF to an image.
+    """
+    images = convert_from_bytes(
+        pdf_buffer,
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number
+    )
+    return images[0] if images else None
+
+
+def ocr_page(pdf_buffer: bytes, page_number: int) -> Tuple[str, float, int]:
+    """
+    OCR one page with adaptive DPI.
+
+    Returns:
+        Tuple of (text, mean confidence, DPI used)
+    """
+    initial_dpi = settings.ocr_initial_dpi
+    max_dpi = max(settings.ocr_max_dpi, initial_dpi)
+
+    image = _rasterize_page(pdf_buffer, page_number, initial_dpi)
+    if image is None:
+        return "", 0.0, initial_dpi
+    try:
+        text, confidence = _ocr_image(image)
+    finally:
+        image.close()
+
+    if confidence >= settings.ocr_min_confidence or initial_dpi >= max_dpi:
+        return text, confidence, initial_dpi
+
+    # Low confidence at low resolution: retry once at full resolution
+    image = _rasterize_page(pdf_buffer, page_number, max_dpi)
+    if image is None:
+        return text, confidence, initial_dpi
+    try:
+        hi_text, hi_confidence = _ocr_image(image)
+    finally:
+        image.close()
+
+    if hi_confidence >= confidence:
+        return hi_text, hi_confidence, max_dpi
+    return text, confidence, initial_dpi
+
+
+def ocr_pdf_pages(
+    pdf_buffer: bytes,
+    page_numbers: Optional[List[int]] = None,
+    target_chars: Optional[int] = None
+) -> Dict[int, str]:
+    """
+    OCR the given 1-based pages of a PDF (default: the first
+    ``settings.ocr_max_pages`` pages) and return their text keyed by page
+    number.
+
+    Pages are processed in waves of ``settings.ocr_workers`` pages. After each
+    wave the pipeline stops if ``target_chars`` characters have already been
+    recovered, so later pages are never rasterized; a ``target_chars`` of 0
+    OCRs every page. Pages left out either way are logged.
+    """
+    if page_numbers is None:
+        total_pages = count_pdf_pages(pdf_buffer)
+        page_count = min(total_pages, settings.ocr_max_pages)
+        if page_count < total_pages:
+            logger.warning("OCR limited to the first %d of %d pages (OCR_MAX_PAGES)", page_count, total_pages)
+        page_numbers = list(range(1, page_count + 1))
+
+    if target_chars is None:
+        target_chars = settings.ocr_target_chars
+
+    workers = max(1, settings.ocr_workers)
+    results: Dict[int, str] = {}
+    recovered_chars = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(page_numbers), workers):
+            wave = page_numbers[start:start + workers]
+            for page_number, (text, confidence, dpi) in zip(
+                wave, pool.map(lambda n: ocr_page(pdf_buffer, n), wave)
+            ):
+                logger.debug("OCR page %d: %d chars, confidence %.0f at %d DPI", page_number, len(text), confidence, dpi)
+                results[page_number] = text
+                recovered_chars += len(text.strip())
+
+            if target_chars and recovered_chars >= target_chars:
+                skipped = page_numbers[start + workers:]
+                if skipped:
+                    logger.info(
+                        "OCR stopped after %d chars (OCR_TARGET_CHARS); pages not OCR'd: %s",
+                        recovered_chars, skipped
+                    )
+                break
+
+    return results
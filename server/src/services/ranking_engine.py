@@ -0,0 +1,327 @@
+"""
+Vectorized candidate ranking against a job.
+
+Ranking many candidates used to mean one keyword analysis per resume. Here
+every resume is turned once into a binary term vector over a shared
+vocabulary and the whole candidate set is stored as a SciPy CSR matrix
+(candidates x terms). A job is compiled into sparse term-to-phrase matrices
+using the same phrase normalization as analyze_resume_against_job, so
+ranking is one sparse product to find matched phrases, one matrix-vector
+product for the weighted scores and an argpartition for the top k. The
+candidate x phrase matrices stay sparse throughout, and ties are broken by
+match score and then input order, so the same pool always ranks the same.
+
+Terms in the vocabulary are:
+- normalized words (lowercased, punctuation replaced by spaces)
+- normalized word n-grams up to ``max_ngram`` words, for multi-word phrases
+- whitespace-delimited tokens that keep inner punctuation ("c++", "node.js",
+  "ci/cd"), for single-word phrases that contain punctuation
+"""
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ..config.settings import settings
+from .analysis_service import (
+    collect_job_phrases,
+    get_cached_skill_variations,
+    single_word_alternatives,
+    split_job_phrase,
+)
+from .cache import LRUCache
+from .resume_document import ResumeDocument, compute_text_hash
+
+
+# Relative importance of each job data field in the weighted score
+FIELD_WEIGHTS = {
+    "skills": 1.0,
+    "technologies": 1.0,
+    "tools": 1.0,
+    "requirements": 0.75,
+    "qualifications": 0.5,
+}
+
+_WORD_PATTERN = re.compile(r'^\w+$')
+_LEADING_PUNCTUATION = "([{\"'"
+_TRAILING_PUNCTUATION = ",.;:!?)]}\"'"
+
+
+def _term_key(term: str) -> Optional[str]:
+    """
+    Map a phrase or variation to the vocabulary term it is looked up as.
+    """
+    term = term.lower().strip()
+    if not term:
+        return None
+    if _WORD_PATTERN.match(term):
+        return term
+    if any(char.isspace() for char in term):
+        words = split_job_phrase(term)[1]
+        return " ".join(words) if words else None
+    # Single token with punctuation, e.g. "c++" or "node.js"
+    return term
+
+
+def _resume_terms(document: ResumeDocument, max_ngram: int) -> Set[str]:
+    """
+    Collect the vocabulary terms present in a resume.
+    """
+    terms = set(document.words)
+    for n in range(2, max_ngram + 1):
+        terms.update(document.ngrams(n))
+
+    for token in document.lower.split():
+        token = token.lstrip(_LEADING_PUNCTUATION).rstrip(_TRAILING_PUNCTUATION)
+        if token and not _WORD_PATTERN.match(token):
+            terms.add(token)
+
+    return terms
+
+
+class CandidateIndex:
+    """
+    Candidate resumes stored as a binary CSR term matrix.
+
+    Args:
+        resume_texts: Candidate resume texts
+        candidate_ids: Optional caller-supplied ID per resume (defaults to the position)
+        max_ngram: Longest word n-gram stored for multi-word phrase lookups
+    """
+
+    def __init__(
+            self,
+            resume_texts: Sequence[str],
+            candidate_ids: Optional[Sequence[str]] = None,
+            max_ngram: int = 3
+    ):
+        if candidate_ids is not None and len(candidate_ids) != len(resume_texts):
+            raise ValueError("candidate_ids must have one entry per resume")
+
+        self.candidate_ids = [str(c) for c in candidate_ids] if candidate_ids is not None else [
+            str(i) for i in range(len(resume_texts))
+        ]
+        self.max_ngram = max(1, max_ngram)
+        self.index_id = compute_index_id(resume_texts, self.candidate_ids)
+
+        self.vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+
+        for text in resume_texts:
+            # Built directly rather than through the document cache, which a
+            # large candidate pool would only churn
+            document = ResumeDocument(text)
+            for term in _resume_terms(document, self.max_ngram):
+                indices.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+            indptr.append(len(indices))
+
+        self.matrix = sparse.csr_matrix(
+            (
+                np.ones(len(indices), dtype=np.float32),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64)
+            ),
+            shape=(len(resume_texts), len(self.vocabulary))
+        )
+        self.matrix.sort_indices()
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def _compile_job(self, job_phrases: List[str]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray]:
+        """
+        Build the term-to-phrase matrices for a job.
+
+        ``any_terms`` (terms x phrases) marks the terms whose presence alone
+        matches a phrase. ``all_terms`` marks the words that must all be present
+        for a multi-word phrase to match; ``required`` holds how many.
+        """
+        any_rows, any_cols = [], []
+        all_rows, all_cols = [], []
+        required = np.full(len(job_phrases), np.inf, dtype=np.float32)
+
+        for col, phrase in enumerate(job_phrases):
+            multi_word, phrase_words = split_job_phrase(phrase)
+
+            if multi_word:
+                terms = [phrase]
+                required_words = {word for word in phrase_words if len(word) > 2}
+                if all(word in self.vocabulary for word in required_words):
+                    required[col] = len(required_words)
+                    for word in required_words:
+                        all_rows.append(self.vocabulary[word])
+                        all_cols.append(col)
+            else:
+                terms = single_word_alternatives(phrase) + get_cached_skill_variations(phrase)
+
+            for key in {_term_key(term) for term in terms}:
+                row = self.vocabulary.get(key) if key else None
+                if row is not None:
+                    any_rows.append(row)
+                    any_cols.append(col)
+
+        shape = (len(self.vocabulary), len(job_phrases))
+        any_terms = sparse.csr_matrix(
+            (np.ones(len(any_rows), dtype=np.float32), (any_rows, any_cols)), shape=shape
+        )
+        all_terms = sparse.csr_matrix(
+            (np.ones(len(all_rows), dtype=np.float32), (all_rows, all_cols)), shape=shape
+        )
+        return any_terms, all_terms, required
+
+    def rank(
+            self,
+            job_data: Dict,
+            top_k: int = 10,
+            weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score every candidate against a job and return the best ``top_k``.
+
+        Args:
+            job_data: Job data with the usual skills/requirements/... lists
+            top_k: Number of ranked candidates to return
+            weights: Optional weight per phrase, overriding the field weights
+
+        Returns:
+            Dict with the job phrases and the ranked candidates, each with its
+            match score (percentage of phrases matched, as in keyword
+            analysis), weighted score and matching/missing phrases
+        """
+        job_phrases = collect_job_phrases(job_data)
+        total_candidates = len(self)
+
+        if not job_phrases or not total_candidates:
+            return {"totalKeywords": len(job_phrases), "totalCandidates": total_candidates, "rankings": []}
+
+        phrase_weights = self._phrase_weights(job_data, job_phrases, weights or {})
+        any_terms, all_terms, required = self._compile_job(job_phrases)
+
+        # One sparse product answers both "any alternative present" and
+        # "how many required words present" for every candidate and phrase
+        counts = (self.matrix @ sparse.hstack([any_terms, all_terms], format="csr")).tocoo()
+        phrase_count = len(job_phrases)
+
+        # Stored entries in the first half are phrase alternatives present;
+        # in the second half, a phrase matches once all its required words are
+        is_all = counts.col >= phrase_count
+        phrases = np.where(is_all, counts.col - phrase_count, counts.col)
+        hit = ~is_all | (counts.data >= required[phrases])
+        rows, cols = counts.row[hit], phrases[hit]
+
+        # As in keyword analysis, a multi-word phrase without words longer than
+        # two characters ("CI/CD") matches every candidate
+        always = np.flatnonzero(required == 0)
+        if always.size:
+            rows = np.concatenate([rows, np.repeat(np.arange(total_candidates), always.size)])
+            cols = np.concatenate([cols, np.tile(always, total_candidates)])
+
+        matched = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(total_candidates, phrase_count)
+        )
+        # A phrase matched both ways is summed to 2 when the duplicates merge
+        matched.data[:] = 1
+
+        weighted = matched @ phrase_weights
+        total_weight = float(phrase_weights.sum()) or 1.0
+        weighted_scores = weighted / total_weight * 100
+        match_scores = np.asarray(matched.sum(axis=1)).ravel() / phrase_count * 100
+
+        top_k = max(1, min(top_k, total_candidates))
+        if top_k < total_candidates:
+            # Keep every candidate tied with the k-th weighted score, so which
+            # of them make the cut is decided by the sort below, not argpartition
+            kth = np.partition(weighted_scores, total_candidates - top_k)[total_candidates - top_k]
+            top = np.flatnonzero(weighted_scores >= kth)
+        else:
+            top = np.arange(total_candidates)
+        # Best weighted score first, then best match score, then input order
+        top = top[np.lexsort((top, -match_scores[top], -weighted_scores[top]))][:top_k]
+
+        rankings = []
+        for rank, row in enumerate(top, start=1):
+            row_hits = set(matched.indices[matched.indptr[row]:matched.indptr[row + 1]].tolist())
+            row_matched = [col in row_hits for col in range(phrase_count)]
+            rankings.append({
+                "rank": rank,
+                "index": int(row),
+                "candidateId": self.candidate_ids[row],
+                "matchScore": round(float(match_scores[row]), 1),
+                "weightedScore": round(float(weighted_scores[row]), 1),
+                "matchingPhrases": [p for p, hit in zip(job_phrases, row_matched) if hit],
+                "missingPhrases": [p for p, hit in zip(job_phrases, row_matched) if not hit]
+            })
+
+        return {
+            "totalKeywords": phrase_count,
+            "totalCandidates": total_candidates,
+            "rankings": rankings
+        }
+
+    @staticmethod
+    def _phrase_weights(job_data: Dict, job_phrases: List[str], weights: Dict[str, float]) -> np.ndarray:
+        """
+        Weight each phrase by the most important field it appears in, unless
+        the caller supplied an explicit weight.
+        """
+        field_weight: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            if isinstance(job_data.get(field), list):
+                for phrase in job_data[field]:
+                    phrase = phrase.strip()
+                    field_weight[phrase] = max(field_weight.get(phrase, 0.0), weight)
+
+        return np.asarray(
+            [float(weights.get(phrase, field_weight.get(phrase, 1.0))) for phrase in job_phrases],
+            dtype=np.float32
+        )
+
+
+def compute_index_id(resume_texts: Sequence[str], candidate_ids: Sequence[str]) -> str:
+    """Return the ID of the index built from these resumes and candidate IDs."""
+    digest = hashlib.sha256()
+    for candidate_id, text in zip(candidate_ids, resume_texts):
+        digest.update(candidate_id.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+        digest.update(compute_text_hash(text).encode("ascii"))
+    return digest.hexdigest()
+
+
+# Built indexes by ID, so a recruiter can rank the same pool against many jobs
+_index_cache = LRUCache(
+    "candidate_indexes",
+    max_entries=settings.candidate_index_cache_max_entries
+)
+
+
+def build_candidate_index(
+        resume_texts: Sequence[str],
+        candidate_ids: Optional[Sequence[str]] = None
+) -> CandidateIndex:
+    """
+    Return the CandidateIndex for these resumes, reusing a cached one if the
+    same pool was indexed before.
+
+    Raises:
+        ValueError: If candidate_ids does not have one entry per resume
+    """
+    if candidate_ids is not None and len(candidate_ids) != len(resume_texts):
+        raise ValueError("candidate_ids must have one entry per resume")
+
+    ids = [str(c) for c in candidate_ids] if candidate_ids is not None else [
+        str(i) for i in range(len(resume_texts))
+    ]
+    index = _index_cache.get(compute_index_id(resume_texts, ids))
+    if index is None:
+        index = CandidateIndex(resume_texts, ids, max_ngram=settings.ranking_max_ngram)
+        _index_cache.set(index.index_id, index)
+    return index
+
+
+def get_candidate_index(index_id: str) -> Optional[CandidateIndex]:
+    """Return a previously built index by ID, if it is still cached."""
+    return _index_cache.get(index_id)
@@ -0,0 +1,187 @@
+"""
+Tokenized resume index shared by analysis, verification and scoring.
+
+A single request used to lowercase the same resume several times, strip its
+punctuation and split it into words, and re-split it into lines for every
+section or bullet lookup. ResumeDocument does that work once per text: it
+holds the lowercased text, normalized tokens with their positions, n-gram
+sets, section spans and bullet offsets. Documents are cached by content hash,
+so the resume analysed in one request is already indexed when the next
+request verifies or scores it.
+"""
+import hashlib
+import re
+from bisect import bisect_left
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ..config.settings import settings
+from .cache import LRUCache
+
+
+# Common section headers with variations, by section type
+SECTION_HEADERS: Dict[str, Tuple[str, ...]] = {
+    'summary': ('SUMMARY', 'PROFESSIONAL SUMMARY', 'PROFILE', 'OBJECTIVE', 'CAREER OBJECTIVE'),
+    'experience': ('EXPERIENCES', 'WORK EXPERIENCE', 'PROFESSIONAL EXPERIENCES', 'EMPLOYMENT HISTORY', 'WORK HISTORY'),
+    'education': ('EDUCATION', 'ACADEMIC BACKGROUND'),
+    'skills': ('SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES', 'EXPERTISE'),
+    'certifications': ('CERTIFICATIONS', 'CERTIFICATES', 'LICENSES'),
+    'projects': ('PROJECTS', 'KEY PROJECTS'),
+}
+
+# One pass over the uppercased text finds every header line (a named group per
+# section type, surrounding whitespace allowed) and every bullet line
+_SECTION_SCAN_PATTERN = re.compile(
+    r'^[^\S\n]*(?:(?:'
+    + '|'.join(
+        f"(?P<{section_type}>{'|'.join(re.escape(header) for header in headers)})"
+        for section_type, headers in SECTION_HEADERS.items()
+    )
+    + r')[^\S\n]*$|•[^\S\n]+)',
+    re.MULTILINE
+)
+
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+_BULLET_PATTERN = re.compile(r'^\s*•\s+', re.MULTILINE)
+
+
+def compute_text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest used as the cache key for a text."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class SectionSpan:
+    """
+    One resume section: its header and the lines up to the next header.
+
+    Attributes:
+        type: Section type (a key of SECTION_HEADERS)
+        name: Header as written in the resume
+        start_line: Index of the header line
+        end_line: Index of the next header line, or the line count
+        bullet_lines: Indexes of the section's lines that start with a bullet point
+    """
+
+    __slots__ = ("type", "name", "start_line", "end_line", "bullet_lines")
+
+    def __init__(self, section_type: str, name: str, start_line: int, end_line: int, bullet_lines: List[int]):
+        self.type = section_type
+        self.name = name
+        self.start_line = start_line
+        self.end_line = end_line
+        self.bullet_lines = bullet_lines
+
+    @property
+    def bullet_count(self) -> int:
+        return len(self.bullet_lines)
+
+
+class ResumeDocument:
+    """
+    Index over one resume text, built in a single pass per representation.
+
+    Attributes:
+        text: Original text
+        content_hash: SHA-256 of the text
+        lower: Lowercased text, used for keyword matching
+        tokens: Lowercased words with punctuation replaced by spaces, in order
+        words: Set of distinct tokens
+        token_positions: Token -> indexes in ``tokens`` where it occurs
+        lines: Text split on newlines
+        sections: Section headers in the detect_resume_sections() format
+        section_spans: SectionSpan of each section, in order
+        bullet_offsets: Character offsets of bullet points
+        bullet_lines: Indexes of lines that start with a bullet point
+    """
+
+    def __init__(self, text: str, content_hash: Optional[str] = None):
+        self.text = text
+        self.content_hash = content_hash or compute_text_hash(text)
+        self.lower = text.lower()
+
+        self.tokens: List[str] = _PUNCTUATION_PATTERN.sub(' ', self.lower).split()
+        self.words: FrozenSet[str] = frozenset(self.tokens)
+        self.token_positions: Dict[str, List[int]] = {}
+        for index, token in enumerate(self.tokens):
+            self.token_positions.setdefault(token, []).append(index)
+
+        self.lines: List[str] = text.split("\n")
+        self.bullet_lines: List[int] = []
+        self.section_spans: List[SectionSpan] = []
+
+        # Headers match case-insensitively; scanning the uppercased text (rather
+        # than using re.IGNORECASE) also folds ligatures such as "ﬁ" to "FI".
+        # Uppercasing never adds or removes newlines, so line indexes still hold.
+        upper = text.upper()
+        line_number = 0
+        position = 0
+        for match in _SECTION_SCAN_PATTERN.finditer(upper):
+            line_number += upper.count("\n", position, match.start())
+            position = match.start()
+
+            section_type = match.lastgroup
+            if section_type is None:
+                self.bullet_lines.append(line_number)
+                if self.section_spans:
+                    self.section_spans[-1].bullet_lines.append(line_number)
+                continue
+
+            if self.section_spans:
+                self.section_spans[-1].end_line = line_number
+            self.section_spans.append(SectionSpan(
+                section_type,
+                self.lines[line_number].strip(),  # Keep original casing
+                line_number,
+                len(self.lines),
+                []
+            ))
+
+        self.sections: List[Dict[str, Any]] = [
+            {"name": span.name, "type": span.type, "lineNumber": span.start_line}
+            for span in self.section_spans
+        ]
+
+        self.bullet_offsets: List[int] = [
+            m.start() + m.group().index('•') for m in _BULLET_PATTERN.finditer(text)
+        ]
+
+        self._ngrams: Dict[int, FrozenSet[str]] = {1: self.words}
+
+    @property
+    def bullet_count(self) -> int:
+        """Number of bullet points, as counted by count_bullet_points()."""
+        return len(self.bullet_offsets)
+
+    def ngrams(self, n: int) -> FrozenSet[str]:
+        """Return the set of space-joined token n-grams (computed once per n)."""
+        grams = self._ngrams.get(n)
+        if grams is None:
+            grams = frozenset(
+                " ".join(self.tokens[i:i + n]) for i in range(len(self.tokens) - n + 1)
+            )
+            self._ngrams[n] = grams
+        return grams
+
+    def bullets_in_span(self, start_line: int, end_line: int) -> List[int]:
+        """Return the bullet line indexes between ``start_line`` and ``end_line``."""
+        return self.bullet_lines[bisect_left(self.bullet_lines, start_line):bisect_left(self.bullet_lines, end_line)]
+
+    def section(self, section_type: str) -> Optional[SectionSpan]:
+        """Return the first section of ``section_type``, if the resume has one."""
+        return next((span for span in self.section_spans if span.type == section_type), None)
+
+
+# Documents by content hash, so each text is tokenized once across requests
+_document_cache = LRUCache(
+    "resume_documents",
+    max_entries=settings.resume_document_cache_max_entries
+)
+
+
+def get_resume_document(text: str) -> ResumeDocument:
+    """Return the (cached) ResumeDocument for ``text``."""
+    content_hash = compute_text_hash(text)
+    document = _document_cache.get(content_hash)
+    if document is None:
+        document = ResumeDocument(text, content_hash)
+        _document_cache.set(content_hash, document)
+    return document
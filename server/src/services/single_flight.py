@@ -0,0 +1,163 @@
+"""
+Request coalescing ("single flight") for identical in-flight work.
+
+A cache only helps once the first request for a key has finished. A
+double-clicked "Analyze", or several clients submitting the same resume and
+job at once, used to miss the cache together and each pay for the same LLM
+calls. A SingleFlight runs the work for a key once and lets every concurrent
+caller with that key await the same result.
+
+Coalescing is per worker process and per event loop; the shared result
+caches cover repeats once the first call has finished.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight execution and the number of callers awaiting it."""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    Args:
+        name: Name used to register the group for the admin endpoints
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+        register_flight(self)
+
+    def _active(self, key: Hashable) -> Optional[_Call]:
+        call = self._calls.get(key)
+        if call is None:
+            return None
+        if call.future.done() or call.future.get_loop() is not asyncio.get_running_loop():
+            # Finished, or left behind by an event loop that has since closed
+            del self._calls[key]
+            return None
+        return call
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the result of ``fn()``, sharing one execution with every
+        concurrent caller using the same key. Exceptions reach every caller.
+
+        The execution is cancelled only when every caller awaiting it has been
+        cancelled, so one disconnecting client does not fail the others.
+        """
+        call = self._active(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.future.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.future)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.future.done():
+                call.future.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def claim(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, asyncio.Future], Dict[Hashable, asyncio.Future]]:
+        """
+        Split keys into those this caller leads and those already in flight.
+
+        Used when one execution covers many keys at once, such as a batched
+        lookup. The caller must pass every led future to ``publish`` once it
+        has results, including when it fails; joined futures are awaited.
+
+        Returns:
+            (led, joined): futures by key for the keys this caller must
+            resolve, and for the keys another caller is already resolving
+        """
+        loop = asyncio.get_running_loop()
+        led: Dict[Hashable, asyncio.Future] = {}
+        joined: Dict[Hashable, asyncio.Future] = {}
+
+        for key in keys:
+            call = self._active(key)
+            if call is None:
+                call = _Call(loop.create_future())
+                self._calls[key] = call
+                led[key] = call.future
+                self.executions += 1
+            else:
+                joined[key] = call.future
+                self.coalesced += 1
+
+        return led, joined
+
+    def publish(self, led: Dict[Hashable, asyncio.Future], results: Dict[Hashable, Any]) -> None:
+        """
+        Hand the results of led keys to the callers that joined them and stop
+        tracking the keys. Keys without a result resolve to None, which
+        joined callers should treat as "resolve it yourself".
+        """
+        for key, future in led.items():
+            if not future.done():
+                future.set_result(results.get(key))
+            call = self._calls.get(key)
+            if call is not None and call.future is future:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight count and execution/coalescing counters."""
+        total = self.executions + self.coalesced
+        return {
+            "name": self.name,
+            "inFlight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescedRatio": round(self.coalesced / total, 4) if total else 0.0
+        }
+
+
+# =========================================================
+# ---------------- FLIGHT REGISTRY ------------------------
+# =========================================================
+
+_registry: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def register_flight(flight: SingleFlight) -> None:
+    """Register ``flight`` under its name, replacing any previous group with that name."""
+    with _registry_lock:
+        _registry[flight.name] = flight
+
+
+def list_flights() -> List[SingleFlight]:
+    """Return all registered single-flight groups sorted by name."""
+    with _registry_lock:
+        return [_registry[name] for name in sorted(_registry)]
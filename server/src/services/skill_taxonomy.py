@@ -0,0 +1,128 @@
+"""
+Local skill taxonomy: alias -> canonical skill lookups without the LLM.
+
+Variation checks used to fall through to one OpenAI call per skill for
+anything outside a dozen hardcoded abbreviations. The bundled taxonomy
+(``src/data/skill_taxonomy.json``) lists groups of equivalent names across
+professions - the first entry of each group is the canonical name - and is
+loaded into a sorted alias array searched with bisect, so a lookup is a
+binary search over a few thousand strings.
+
+Skills the taxonomy does not know are still sent to the LLM; its answers are
+kept in the skill variation store (see variation_store.py).
+"""
+import json
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(skill: str) -> str:
+    """Return the lookup key for a skill: lowercase with single spaces."""
+    return " ".join(skill.lower().split())
+
+
+class SkillTaxonomy:
+    """
+    Alias index over groups of equivalent skill names.
+
+    Args:
+        groups: Groups of equivalent names, canonical name first
+        version: Version string of the bundled taxonomy
+    """
+
+    def __init__(self, groups: Iterable[Sequence[str]] = (), version: str = ""):
+        self.version = version
+        self._groups: List[Tuple[str, ...]] = []
+
+        pairs = []
+        for group in groups:
+            members = self._clean_group(group)
+            if members:
+                pairs.extend((alias, len(self._groups)) for alias in members)
+                self._groups.append(members)
+        pairs.sort()
+
+        # Parallel sorted arrays: alias strings and the group each belongs to
+        self._aliases: List[str] = [alias for alias, _ in pairs]
+        self._group_ids = array("i", (group_id for _, group_id in pairs))
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def __contains__(self, skill: str) -> bool:
+        key = normalize_skill(skill)
+        i = bisect_left(self._aliases, key)
+        return i < len(self._aliases) and self._aliases[i] == key
+
+    @staticmethod
+    def _clean_group(group: Sequence[str]) -> Tuple[str, ...]:
+        members = []
+        for name in group:
+            if isinstance(name, str):
+                name = normalize_skill(name)
+                if name and name not in members:
+                    members.append(name)
+        return tuple(members)
+
+    def lookup(self, skill: str) -> Optional[List[str]]:
+        """
+        Return every known variation of a skill, the skill itself first,
+        or None if the taxonomy does not know it.
+        """
+        key = normalize_skill(skill)
+        if not key:
+            return None
+
+        i = bisect_left(self._aliases, key)
+        variations = [key]
+        found = False
+        # An alias may belong to several groups, e.g. an abbreviation
+        # shared by two professions
+        while i < len(self._aliases) and self._aliases[i] == key:
+            found = True
+            for name in self._groups[self._group_ids[i]]:
+                if name not in variations:
+                    variations.append(name)
+            i += 1
+
+        return variations if found else None
+
+
+def load_skill_taxonomy(path: Path) -> SkillTaxonomy:
+    """
+    Load a taxonomy file. A missing or unreadable file yields an empty
+    taxonomy so lookups fall back to the LLM instead of failing.
+    """
+    try:
+        with path.open("r", encoding="utf-8") as taxonomy_file:
+            data = json.load(taxonomy_file)
+        groups = [group for groups in data.get("categories", {}).values() for group in groups]
+        taxonomy = SkillTaxonomy(groups, version=str(data.get("version", "")))
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning("Could not load skill taxonomy %s: %s", path, e)
+        taxonomy = SkillTaxonomy()
+
+    return taxonomy
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide taxonomy, loading it on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = load_skill_taxonomy(Path(settings.skill_taxonomy_path))
+    return _taxonomy
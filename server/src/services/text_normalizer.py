@@ -0,0 +1,133 @@
+"""
+Compiled normalization for extracted and generated resume text.
+
+Normalizing an extraction used to take more than twenty passes over the
+text: chained ``str.replace`` calls, ``re.sub`` with patterns compiled on
+the fly, and a Python loop trying four ``re.match`` patterns on every line.
+Here every pattern is compiled once at import, character mappings come from
+one table and only run when the character occurs, bullet normalization is a
+single multiline substitution, and header and bullet splitting are single
+zero-width substitutions, so each step is one C-level pass.
+
+The character table is applied with ``str.replace`` rather than
+``str.translate``: resume text is rarely pure ASCII, and CPython's translate
+then does a dict lookup per character, which measured about ten times slower.
+
+Outputs are identical to the previous implementations, except that
+clean_encoding_artifacts now splits runs of glued bullets ("••") and glued
+repeated headers before every occurrence rather than every other one.
+
+Run ``python -m src.test.TextNormalizerBenchmark`` from the server directory
+for throughput figures.
+"""
+import re
+
+
+# Character mappings applied to extracted text: dashes and curly quotes to
+# ASCII, zero-width and BOM characters removed
+_EXTRACTED_CHARACTER_MAP = {
+    "\u200b": "",
+    "\u200c": "",
+    "\u200d": "",
+    "\ufeff": "",
+    "–": "-",  # En dash
+    "—": "-",  # Em dash
+    "‘": "'",
+    "’": "'",
+    "“": '"',
+    "”": '"',
+}
+
+# Runs of two or more spaces/tabs, or any tab; single spaces are left alone
+_SPACE_RUN = re.compile(r'\t[ \t]*| [ \t]+')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+# Any supported bullet style at the start of a line, with the rest of the line
+_BULLET_LINE = re.compile(
+    r'^([^\S\n]*)(?:[-–—*▪▫■□◆◇➤➔✓✔>•·][^\S\n]+|o[^\S\n]+(?=[A-Z]))(.*)$',
+    re.MULTILINE
+)
+
+# Encoding artifacts in generated text (e.g. "%Ï"), with a "%" right before them
+_ENCODING_ARTIFACT = re.compile(r'%?[ÏïĪīÎîØø]')
+# UTF-8 punctuation decoded as Windows-1252
+_MOJIBAKE = re.compile(r'â€(?:¢|"|™|œ)?')
+_MOJIBAKE_FIXES = {
+    'â€¢': '•',
+    'â€"': '–',
+    'â€™': "'",
+    'â€œ': '"',
+    'â€': '"',
+}
+_LINE_BREAK_RUN = re.compile(r' ?\n+ ?')
+_BROKEN_BULLET = re.compile(r'^\s*[•●]\s*%[ÏïĪīÎîØø]?\s*', re.MULTILINE)
+# Separate literal-prefixed patterns scan much faster than one alternation
+_SPLIT_HEADERS = [
+    (re.compile(r'PROFESSIONAL\s+EXPERIENCES'), 'PROFESSIONAL EXPERIENCES'),
+    (re.compile(r'TECHNICAL\s+PROJECTS'), 'TECHNICAL PROJECTS'),
+]
+# Positions right before a section header or bullet that are not at the start of
+# a line; the leading class rejects most positions before the lookarounds run
+_GLUED_HEADER = re.compile(
+    r'(?=[CELPT])(?<=[^\n])'
+    r'(?=EDUCATION|TECHNICAL (?:SKILLS|PROJECTS)|PROFESSIONAL EXPERIENCES|PROJECTS|LEADERSHIP|CERTIFICATIONS)'
+)
+_GLUED_BULLET = re.compile(r'(?=[•●])(?<=[^\n])')
+
+
+def _standard_bullet(match: re.Match) -> str:
+    return f"{match.group(1)}• {match.group(2).strip()}"
+
+
+def normalize_bullets(text: str) -> str:
+    """
+    Standardize all bullet point styles at the start of a line to '•'.
+    """
+    return _BULLET_LINE.sub(_standard_bullet, text)
+
+
+def normalize_extracted_text(text: str) -> str:
+    """
+    Normalize extracted text so repeated extractions of a document agree:
+    unify line endings, collapse spaces and tabs, allow at most two blank
+    lines in a row, strip every line, map dashes and quotes to ASCII, drop
+    invisible characters and standardize bullet points.
+    """
+    if not text:
+        return text
+
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _SPACE_RUN.sub(' ', text)
+    text = _BLANK_LINES.sub('\n\n', text)
+    text = '\n'.join([line.strip() for line in text.split('\n')])
+
+    for char, replacement in _EXTRACTED_CHARACTER_MAP.items():
+        if char in text:
+            text = text.replace(char, replacement)
+    text = text.strip()
+
+    return _BULLET_LINE.sub(_standard_bullet, text)
+
+
+def clean_encoding_artifacts(text: str) -> str:
+    """
+    Remove encoding artifacts like %Ï from generated text and fix its layout:
+    mojibake punctuation, runs of whitespace, bullets and section headers
+    glued to the previous line, and headers split across whitespace.
+    """
+    text = _ENCODING_ARTIFACT.sub('', text)
+    text = _MOJIBAKE.sub(lambda match: _MOJIBAKE_FIXES[match.group()], text)
+
+    # Collapse spaces/tabs, then line breaks with the spaces around them
+    text = _SPACE_RUN.sub(' ', text)
+    text = _LINE_BREAK_RUN.sub('\n', text)
+
+    text = _BROKEN_BULLET.sub('• ', text)
+    for pattern, header in _SPLIT_HEADERS:
+        text = pattern.sub(header, text)
+
+    # Section headers and bullets start on their own line
+    text = _GLUED_HEADER.sub('\n\n', text)
+    text = _GLUED_BULLET.sub('\n', text)
+
+    return text.strip()
@@ -0,0 +1,124 @@
+"""
+Streaming intake for uploaded resumes.
+
+The extract endpoint used to read the whole upload into memory, hash it
+again for the extraction cache, and only then compare its size with the
+limit, trusting the file extension for its type. Uploads are now read in
+chunks: the type is checked against the file's magic bytes as soon as the
+first chunk arrives, reading stops as soon as the size limit is passed, and
+the SHA-256 used as the extraction cache key is computed along the way. The
+chunks are collected into a single buffer, so no second copy of the upload
+is made.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import UploadFile
+
+
+CHUNK_SIZE = 64 * 1024
+
+# A PDF header may follow up to 1 KB of leading garbage
+_PDF_HEADER_WINDOW = 1024
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_TEXT_BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+
+
+class UploadRejected(Exception):
+    """Raised when an upload is empty, too large or not of an accepted type."""
+    pass
+
+
+class UploadIntake:
+    """
+    An accepted upload.
+
+    Attributes:
+        content: File contents
+        content_hash: SHA-256 of the contents, the extraction cache key
+        size: Size in bytes
+        file_type: Detected type, as a file extension (e.g. ".pdf")
+    """
+
+    __slots__ = ("content", "content_hash", "size", "file_type")
+
+    def __init__(self, content: bytearray, content_hash: str, file_type: str):
+        self.content = content
+        self.content_hash = content_hash
+        self.size = len(content)
+        self.file_type = file_type
+
+
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """
+    Return the file type the first bytes of a file indicate (".pdf",
+    ".docx", ".doc" or ".txt"), or None if they match none of them.
+
+    Every zip archive is reported as ".docx"; the DOCX parser rejects
+    archives that are not Word documents.
+    """
+    if b"%PDF-" in head[:_PDF_HEADER_WINDOW]:
+        return ".pdf"
+    if head.startswith(_ZIP_MAGIC):
+        return ".docx"
+    if head.startswith(_OLE_MAGIC):
+        return ".doc"
+    if head.startswith(_TEXT_BOMS) or b"\x00" not in head:
+        return ".txt"
+    return None
+
+
+def _size_limit_message(max_size: int) -> str:
+    return f"File size exceeds maximum allowed size of {max_size // (1024 * 1024)}MB"
+
+
+async def read_upload(upload: UploadFile, max_size: int, allowed_types: Iterable[str]) -> UploadIntake:
+    """
+    Read ``upload`` in chunks, validating it as it arrives.
+
+    The declared extension must be one of ``allowed_types`` and match the
+    type sniffed from the first chunk.
+
+    Raises:
+        UploadRejected: If the upload has no filename, is empty, larger
+            than ``max_size`` bytes, or of a type that is not accepted
+    """
+    allowed_types = list(allowed_types)
+
+    if not upload.filename:
+        raise UploadRejected("Filename is required")
+
+    declared_type = "." + upload.filename.lower().split('.')[-1]
+    if declared_type not in allowed_types:
+        raise UploadRejected(f"Only {', '.join(allowed_types)} files are supported")
+
+    # The multipart parser knows the size of the part it spooled
+    if upload.size is not None and upload.size > max_size:
+        raise UploadRejected(_size_limit_message(max_size))
+
+    content = bytearray()
+    hasher = hashlib.sha256()
+
+    while True:
+        chunk = await upload.read(CHUNK_SIZE)
+        if not chunk:
+            break
+
+        if not content:
+            sniffed_type = sniff_file_type(chunk)
+            if sniffed_type != declared_type:
+                raise UploadRejected(
+                    f"File content does not match its {declared_type} extension"
+                )
+
+        if len(content) + len(chunk) > max_size:
+            raise UploadRejected(_size_limit_message(max_size))
+
+        hasher.update(chunk)
+        content += chunk
+
+    if not content:
+        raise UploadRejected("Empty file provided")
+
+    return UploadIntake(content, hasher.hexdigest(), declared_type)
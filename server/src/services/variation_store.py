@@ -0,0 +1,147 @@
+"""
+Persistent store of AI skill-variation answers.
+
+The in-process skill variation cache starts empty after every deploy or
+restart, so a fresh worker used to re-ask the LLM about every skill it met.
+Answers are kept here instead, in a SQLite file shared by all local workers,
+and loaded into the process cache in the background at startup.
+
+Rows are only ever inserted (re-asking about a skill replaces its row) and
+each row records the model that produced it. Only rows of the configured
+``settings.openai_model`` are read, so switching models invalidates the
+stored answers; rows of other models are purged during warm-up.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class SkillVariationStore:
+    """
+    SQLite table of skill variations keyed by (model, skill).
+
+    Methods are synchronous and meant to run in a worker thread.
+
+    Args:
+        path: SQLite file, created if missing
+        model: Model whose answers are read and written
+    """
+
+    # SQLite's default limit on host parameters per statement is 999
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: Path, model: str):
+        self.path = path
+        self.model = model
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS skill_variations ("
+                " model TEXT NOT NULL,"
+                " skill TEXT NOT NULL,"
+                " variations TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (model, skill)"
+                ")"
+            )
+            self._conn.commit()
+
+    def get_many(self, skills: Iterable[str]) -> Dict[str, List[str]]:
+        """Return the stored variations of the given skills that have any."""
+        skills = list(skills)
+        found: Dict[str, List[str]] = {}
+
+        for i in range(0, len(skills), self.QUERY_CHUNK):
+            chunk = skills[i:i + self.QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT skill, variations FROM skill_variations"
+                    f" WHERE model = ? AND skill IN ({placeholders})",
+                    (self.model, *chunk)
+                ).fetchall()
+            for skill, payload in rows:
+                found[skill] = json.loads(payload)
+
+        return found
+
+    def put_many(self, variations_by_skill: Dict[str, List[str]]) -> None:
+        """Store (or replace) the variations of several skills."""
+        if not variations_by_skill:
+            return
+
+        now = time.time()
+        rows = [
+            (self.model, skill, json.dumps(variations, ensure_ascii=False), now)
+            for skill, variations in variations_by_skill.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO skill_variations (model, skill, variations, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def load_recent(self, limit: int = 0) -> Dict[str, List[str]]:
+        """Return the newest ``limit`` entries of the current model (0 for all)."""
+        query = "SELECT skill, variations FROM skill_variations WHERE model = ? ORDER BY created_at DESC"
+        params: tuple = (self.model,)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {skill: json.loads(payload) for skill, payload in rows}
+
+    def purge_stale(self) -> int:
+        """Delete entries written by other models. Returns the rows deleted."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM skill_variations WHERE model != ?", (self.model,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[SkillVariationStore] = None
+_store_opened = False
+_store_lock = threading.Lock()
+
+
+def get_variation_store() -> Optional[SkillVariationStore]:
+    """
+    Return the process-wide store, opening it on first use. None when
+    SKILL_VARIATION_STORE_PATH is empty or the file cannot be opened, in
+    which case variations are only cached in process memory.
+    """
+    global _store, _store_opened
+    if not _store_opened:
+        with _store_lock:
+            if not _store_opened:
+                if settings.skill_variation_store_path:
+                    try:
+                        _store = SkillVariationStore(
+                            Path(settings.skill_variation_store_path),
+                            settings.openai_model or "gpt-4o-mini"
+                        )
+                    except Exception as e:
+                        logger.warning("Could not open skill variation store: %s", e)
+                _store_opened = True
+    return _store
@@ -0,0 +1,555 @@
+"""
+Benchmark suite for the analysis service.
+
+Builds a deterministic synthetic corpus - text PDFs, scanned (image-only)
+PDFs, resumes of 1 to 20 pages and job descriptions of 10 to 500 phrases -
+and measures extraction, normalization, section detection, keyword analysis
+and ATS scoring on it, reporting throughput and p50/p99 latency per case.
+
+Runs offline: the OpenAI client is replaced by an in-process stub that
+answers instantly with well-formed JSON, and the persistent caches are
+switched to memory. Caches are cleared before every round, so each round
+measures a cold request. Scanned PDF cases need Poppler and Tesseract and
+are skipped when they are not installed.
+
+Results can be saved as a baseline and later runs compared against it; a
+case whose p50 is more than --tolerance slower than its baseline fails the
+comparison (exit status 1). Baselines are machine-specific, so none is
+committed: run --save-baseline once on the machine the comparison runs on
+(baselines/ is git-ignored), then --compare later runs against it. Save and
+compare full runs: --quick rounds are too short to tell a regression from
+scheduling noise.
+
+Usage (from the server directory):
+    python -m src.test.AnalysisServiceBenchmark [--quick] [--only analyze] [--min-time 1]
+    python -m src.test.AnalysisServiceBenchmark --save-baseline
+    python -m src.test.AnalysisServiceBenchmark --compare [--tolerance 0.25]
+    python -m src.test.AnalysisServiceBenchmark --write-corpus /tmp/corpus
+"""
+import os
+
+# Benchmarks must neither read nor fill the persistent caches, whatever the
+# shell exports; settings are read from the environment on first import
+os.environ.update({
+    "CACHE_BACKEND": "memory",
+    "EXTRACTION_CACHE_BACKEND": "memory",
+    "SKILL_VARIATION_STORE_PATH": "",
+    "ARTIFACT_SINK_ENABLED": "false",
+})
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import math
+import platform
+import random
+import re
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from src.services.analysis_service import (
+    analyze_resume_against_job,
+    calculate_ats_score,
+    clean_encoding_artifacts,
+    detect_resume_sections,
+    extract_text_from_pdf,
+    normalize_bullet_points,
+    verify_keyword_integration,
+)
+from src.services.cache import list_caches
+from src.services.extraction_engine import extraction_engine
+from src.services.llm_gateway import LLMGateway, set_llm_gateway
+from src.services.text_normalizer import normalize_extracted_text
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "AnalysisServiceBenchmark.json"
+
+RESUME_PAGES = (1, 5, 20)
+SCANNED_PAGES = (1, 3)
+JOB_PHRASES = (10, 100, 500)
+QUICK_RESUME_PAGES = (1, 5)
+QUICK_JOB_PHRASES = (10, 100)
+
+LINES_PER_PAGE = 45
+
+
+# Skills the synthetic resumes mention
+RESUME_SKILLS = [
+    "Python", "SQL", "Docker", "Kubernetes", "AWS", "Terraform", "React", "TypeScript",
+    "Go", "Kafka", "Spark", "Airflow", "PostgreSQL", "Redis", "GraphQL", "FastAPI",
+    "Django", "CI/CD", "Git", "Linux", "Tableau", "Excel", "Agile", "Scrum",
+    "machine learning", "data analysis", "A/B testing", "ETL pipelines", "microservices",
+    "REST APIs", "stakeholder communication", "project management", "JavaScript", "Node.js",
+]
+
+# Skills they never mention
+OTHER_SKILLS = [
+    "Rust", "Scala", "Snowflake", "dbt", "Looker", "Elixir", "Haskell", "Salesforce",
+    "SAP", "Figma", "Azure", "GCP", "Jenkins", "Ansible", "Prometheus", "Grafana",
+    "MongoDB", "Cassandra", "Flink", "PyTorch", "TensorFlow", "Power BI", "Jira", "Six Sigma",
+]
+
+PHRASE_QUALIFIERS = [
+    "distributed", "cloud", "data", "platform", "security", "product", "customer",
+    "backend", "frontend", "mobile", "realtime", "financial", "clinical", "marketing",
+]
+PHRASE_SUBJECTS = [
+    "systems", "infrastructure", "modeling", "analytics", "automation", "operations",
+    "architecture", "reporting", "testing", "governance", "integrations", "pipelines",
+]
+REQUIREMENT_PHRASES = [
+    "5+ years of experience", "Bachelor's degree in Computer Science", "Master's degree preferred",
+    "ability to travel", "Security Clearance", "strong communication", "team player",
+]
+
+BULLET_MARKERS = ["• ", "•   ", "- ", "o ", "· "]
+ROLES = ["Senior Software Engineer", "Data Engineer", "Platform Engineer", "Analytics Lead", "Backend Developer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Analytics"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Automated", "Optimized", "Delivered", "Scaled"]
+OBJECTS = [
+    "a distributed ingestion pipeline", "the billing platform", "customer-facing dashboards",
+    "an internal deployment tool", "the company’s public API", "“critical” reporting jobs",
+]
+
+
+# =========================================================
+# ---------------- FIXTURE CORPUS -------------------------
+# =========================================================
+
+def build_resume(pages: int, seed: int = 11) -> str:
+    """
+    Return raw resume text of ``pages`` pages, with the artifacts of PDF
+    extraction: mixed bullet markers, tabs, runs of spaces and curly quotes.
+    Only characters Windows-1252 can encode are used, so it fits in a PDF.
+    """
+    rng = random.Random(seed)
+    lines = [
+        "Jane Doe",
+        "jane.doe@example.com  |  555-0100  |  Austin, TX",
+        "PROFESSIONAL SUMMARY",
+        "Engineer with a track record of shipping data and platform work in "
+        + ", ".join(rng.sample(RESUME_SKILLS, 4)) + ".",
+        "WORK EXPERIENCE",
+    ]
+    # The last page holds projects, education and skills
+    body_lines = pages * LINES_PER_PAGE - len(lines) - 12
+
+    while body_lines > 0:
+        year = rng.randint(2005, 2022)
+        lines.append(f"{rng.choice(ROLES)}\t\t{rng.choice(COMPANIES)}  –  {year} – {year + rng.randint(1, 4)}")
+        body_lines -= 1
+        for _ in range(min(body_lines, rng.randint(3, 6))):
+            skills = rng.sample(RESUME_SKILLS, 2)
+            lines.append(
+                f"{rng.choice(BULLET_MARKERS)}{rng.choice(VERBS)} {rng.choice(OBJECTS)} with "
+                f"{skills[0]} and {skills[1]}, cutting  latency by {rng.randint(5, 80)}%"
+            )
+            body_lines -= 1
+
+    lines += [
+        "PROJECTS",
+        f"• Open-source contributor to a {rng.choice(RESUME_SKILLS)} library",
+        f"• Built a side project with {rng.choice(RESUME_SKILLS)}",
+        "EDUCATION",
+        "B.S. Computer Science — State University",
+        "",
+        "",
+        "TECHNICAL SKILLS",
+        ", ".join(RESUME_SKILLS[:18]),
+        ", ".join(RESUME_SKILLS[18:]),
+        "CERTIFICATIONS",
+        "AWS Certified Solutions Architect",
+    ]
+    return "\r\n".join(lines)
+
+
+def build_generated_resume(resume: str) -> str:
+    """Return ``resume`` as garbled as LLM output can be: UTF-8 read as Windows-1252."""
+    return resume.replace("\r\n", "\n").encode("utf-8").decode("cp1252", errors="ignore")
+
+
+def build_job(phrases: int, seed: int = 5) -> Dict[str, Any]:
+    """
+    Return job data with ``phrases`` distinct phrases: skills the resumes
+    mention, skills they do not, multi-word phrases and non-actionable
+    requirements, spread over the job data fields.
+    """
+    rng = random.Random(seed)
+    pool = list(dict.fromkeys(
+        RESUME_SKILLS
+        + OTHER_SKILLS
+        + REQUIREMENT_PHRASES
+        + [f"{q} {s}" for q in PHRASE_QUALIFIERS for s in PHRASE_SUBJECTS]
+        + [f"{q} {s} {t}" for q in PHRASE_QUALIFIERS for s in PHRASE_SUBJECTS for t in ("design", "tooling")]
+    ))
+    rng.shuffle(pool)
+
+    fields = ["skills", "requirements", "technologies", "tools", "qualifications"]
+    job: Dict[str, Any] = {"title": "Senior Data Platform Engineer", "description": ""}
+    for field in fields:
+        job[field] = []
+    for i, phrase in enumerate(pool[:phrases]):
+        job[fields[i % len(fields)]].append(phrase)
+    return job
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return b"(" + escaped.encode("cp1252", errors="replace") + b")"
+
+
+def make_text_pdf(text: str) -> bytes:
+    """Return a PDF with a text layer holding ``text``, LINES_PER_PAGE lines per page."""
+    lines = text.splitlines()
+    page_lines = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Object 1 is the catalog, 2 the page tree, 3 the font; pages follow in pairs
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for chunk in page_lines:
+        stream = b"BT /F1 10 Tf 40 760 Td 16 TL " + b" ".join(_pdf_string(line) + b" '" for line in chunk) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_scanned_pdf(text: str) -> bytes:
+    """Return an image-only PDF of ``text`` rendered at 150 DPI, as a scanner would produce."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    font = ImageFont.load_default(size=22)
+    lines = text.splitlines()
+    images = []
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        image = Image.new("L", (1275, 1650), 255)
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(lines[start:start + LINES_PER_PAGE]):
+            draw.text((75, 75 + row * 33), line.replace("\t", "    "), fill=0, font=font)
+        images.append(image)
+
+    buffer = BytesIO()
+    images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=150)
+    return buffer.getvalue()
+
+
+def ocr_available() -> bool:
+    """Whether the Poppler and Tesseract binaries OCR needs are installed."""
+    return bool(shutil.which("pdftoppm") and shutil.which("tesseract"))
+
+
+def write_corpus(directory: Path) -> None:
+    """Write the fixture corpus to ``directory`` for inspection or other tools."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for pages in RESUME_PAGES:
+        resume = build_resume(pages)
+        (directory / f"resume_{pages}p.txt").write_text(resume, encoding="utf-8")
+        (directory / f"resume_{pages}p.pdf").write_bytes(make_text_pdf(resume))
+    for pages in SCANNED_PAGES:
+        (directory / f"resume_{pages}p_scanned.pdf").write_bytes(make_scanned_pdf(build_resume(pages)))
+    for phrases in JOB_PHRASES:
+        (directory / f"job_{phrases}.json").write_text(json.dumps(build_job(phrases), indent=2), encoding="utf-8")
+
+
+# =========================================================
+# ---------------- STUB LLM -------------------------------
+# =========================================================
+
+def _prompt_list(prompt: str, heading: str) -> List[str]:
+    section = prompt.split(heading, 1)[-1]
+    return re.findall(r"^- (.+)$", section, flags=re.MULTILINE)
+
+
+def _stub_content(messages: List[Dict[str, str]], **kwargs: Any) -> str:
+    system, prompt = messages[0]["content"], messages[-1]["content"]
+
+    if "ATS keyword" in system:
+        keywords = _prompt_list(prompt, "KEYWORDS TO FILTER:")
+        return json.dumps({"actionableKeywords": [
+            {"keyword": keyword, "category": "Skill", "priority": "medium",
+             "suggestedIntegration": f"Mention {keyword} in a relevant bullet"}
+            for keyword in keywords[:25]
+        ]})
+
+    if "skill variation" in system:
+        if kwargs.get("response_format"):
+            skills = _prompt_list(prompt, "Skills:")
+            return json.dumps({skill: [skill, f"{skill}s"] for skill in skills})
+        skill = re.search(r'Skill: "(.+)"', prompt).group(1)
+        return json.dumps([skill, f"{skill}s"])
+
+    return "{}"
+
+
+class _StubCompletions:
+    """Answers chat completions instantly with the JSON each prompt asks for."""
+
+    async def create(self, messages: List[Dict[str, str]], timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        content = _stub_content(messages, **kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=sum(len(m["content"]) for m in messages) // 4,
+                                  completion_tokens=len(content) // 4)
+        )
+
+
+def install_stub_llm() -> None:
+    """Route the analysis service's LLM calls to the in-process stub."""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=_StubCompletions()))
+    set_llm_gateway(LLMGateway(client=client))
+
+
+# =========================================================
+# ---------------- HARNESS --------------------------------
+# =========================================================
+
+class Case:
+    """
+    One benchmark: ``run`` is called without arguments and timed once per
+    round, including awaiting its result if it returns an awaitable, after
+    ``setup`` (untimed) prepares the round. ``size_bytes`` is the input size
+    throughput in MB/s is reported for, if any.
+    """
+
+    __slots__ = ("name", "run", "setup", "size_bytes")
+
+    def __init__(self, name: str, run: Callable[[], Any], setup: Optional[Callable[[], Any]] = None,
+                 size_bytes: int = 0):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.size_bytes = size_bytes
+
+
+def clear_caches() -> None:
+    """Empty every in-process cache, so the next round runs cold."""
+    for cache in list_caches():
+        cache.clear()
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+async def measure(case: Case, min_time: float, min_rounds: int, max_rounds: int) -> Dict[str, float]:
+    """Run ``case`` for at least ``min_time`` seconds and ``min_rounds`` rounds, after one warm-up round."""
+    samples: List[float] = []
+
+    for round_number in range(max_rounds + 1):
+        if case.setup is not None:
+            case.setup()
+        # Garbage left by earlier rounds is not charged to this one
+        gc.collect()
+        start = time.perf_counter()
+        outcome = case.run()
+        if inspect.isawaitable(outcome):
+            await outcome
+        elapsed = time.perf_counter() - start
+
+        if round_number == 0:
+            continue  # Warm-up: imports, worker start-up, lazily built tables
+        samples.append(elapsed)
+        if len(samples) >= min_rounds and sum(samples) >= min_time:
+            break
+
+    samples.sort()
+    total = sum(samples)
+    result = {
+        "rounds": len(samples),
+        "p50Ms": round(statistics.median(samples) * 1000, 4),
+        "p99Ms": round(percentile(samples, 0.99) * 1000, 4),
+        "opsPerSec": round(len(samples) / total, 2),
+    }
+    if case.size_bytes:
+        result["mbPerSec"] = round(case.size_bytes * len(samples) / total / (1024 * 1024), 2)
+    return result
+
+
+def build_cases(quick: bool = False) -> List[Case]:
+    """Return every benchmark case over the fixture corpus."""
+    resume_pages = QUICK_RESUME_PAGES if quick else RESUME_PAGES
+    job_phrases = QUICK_JOB_PHRASES if quick else JOB_PHRASES
+    cases: List[Case] = []
+
+    resumes = {pages: build_resume(pages) for pages in resume_pages}
+    normalized = {pages: normalize_extracted_text(text) for pages, text in resumes.items()}
+    jobs = {phrases: build_job(phrases) for phrases in job_phrases}
+
+    for pages, resume in resumes.items():
+        pdf = make_text_pdf(resume)
+        cases.append(Case(f"extract/text_pdf/{pages}p", lambda pdf=pdf: extract_text_from_pdf(pdf),
+                          setup=clear_caches, size_bytes=len(pdf)))
+
+    if ocr_available():
+        for pages in SCANNED_PAGES[:1] if quick else SCANNED_PAGES:
+            pdf = make_scanned_pdf(build_resume(pages))
+            cases.append(Case(f"extract/scanned_pdf/{pages}p", lambda pdf=pdf: extract_text_from_pdf(pdf),
+                              setup=clear_caches, size_bytes=len(pdf)))
+
+    for pages, resume in resumes.items():
+        size = len(resume.encode("utf-8"))
+        generated = build_generated_resume(resume)
+        cases += [
+            Case(f"normalize/extracted_text/{pages}p", lambda text=resume: normalize_extracted_text(text), size_bytes=size),
+            Case(f"normalize/bullet_points/{pages}p", lambda text=resume: normalize_bullet_points(text), size_bytes=size),
+            Case(f"normalize/encoding_artifacts/{pages}p", lambda text=generated: clean_encoding_artifacts(text),
+                 size_bytes=len(generated.encode("utf-8"))),
+        ]
+
+    for pages, text in normalized.items():
+        cases.append(Case(f"sections/{pages}p", lambda text=text: detect_resume_sections(text),
+                          setup=clear_caches, size_bytes=len(text.encode("utf-8"))))
+
+    for pages, text in normalized.items():
+        for phrases, job in jobs.items():
+            cases.append(Case(f"analyze/{pages}p/{phrases}_phrases",
+                              lambda text=text, job=job: analyze_resume_against_job(text, job),
+                              setup=clear_caches))
+
+    for pages, text in normalized.items():
+        for phrases, job in jobs.items():
+            keywords = job["skills"]
+            # An "optimized" resume: the original with the selected keywords worked in
+            optimized = text + "\nADDITIONAL SKILLS\n• " + ", ".join(keywords)
+            verification = verify_keyword_integration(optimized, keywords)
+            cases.append(Case(
+                f"ats_score/{pages}p/{phrases}_phrases",
+                lambda optimized=optimized, text=text, job=job, verification=verification: calculate_ats_score(
+                    optimized_text=optimized, original_text=text, job_data=job, keyword_verification=verification
+                ),
+                setup=clear_caches
+            ))
+
+    return cases
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    """Return the per-case results stored in the baseline at ``path``."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    """Store ``results`` as the baseline at ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+        },
+        "cases": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _format_row(name: str, result: Dict[str, float], baseline: Optional[Dict[str, float]] = None) -> str:
+    mb_per_sec = f"{result['mbPerSec']:.1f}" if "mbPerSec" in result else "-"
+    row = (f"{name:<40}{result['rounds']:>7}{result['p50Ms']:>11.3f}{result['p99Ms']:>11.3f}"
+           f"{result['opsPerSec']:>11.1f}{mb_per_sec:>9}")
+    if baseline is not None:
+        change = (result["p50Ms"] / baseline["p50Ms"] - 1) * 100 if baseline["p50Ms"] else 0.0
+        row += f"{baseline['p50Ms']:>12.3f}{change:>+9.1f}%"
+    return row
+
+
+async def run(args: argparse.Namespace) -> int:
+    if args.compare and not args.baseline.exists():
+        print(f"No baseline at {args.baseline}. Run with --save-baseline on this machine first", file=sys.stderr)
+        return 2
+    if args.compare and args.quick:
+        print("--quick runs are too noisy for a reliable comparison; compare full runs", file=sys.stderr)
+
+    install_stub_llm()
+    baseline = load_baseline(args.baseline) if args.compare else None
+
+    cases = [case for case in build_cases(args.quick) if not args.only or any(o in case.name for o in args.only)]
+    if not ocr_available():
+        print("Poppler/Tesseract not installed: skipping scanned PDF cases", file=sys.stderr)
+
+    header = f"{'case':<40}{'rounds':>7}{'p50 ms':>11}{'p99 ms':>11}{'ops/s':>11}{'MB/s':>9}"
+    if baseline is not None:
+        header += f"{'base p50':>12}{'change':>10}"
+    print(header)
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+    try:
+        for case in cases:
+            result = await measure(case, args.min_time, args.min_rounds, args.max_rounds)
+            results[case.name] = result
+
+            case_baseline = baseline.get(case.name) if baseline is not None else None
+            print(_format_row(case.name, result, case_baseline), flush=True)
+            if case_baseline and result["p50Ms"] > case_baseline["p50Ms"] * (1 + args.tolerance):
+                regressions.append(case.name)
+    finally:
+        clear_caches()
+        await extraction_engine.aclose()
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Smaller corpus and shorter runs")
+    parser.add_argument("--only", nargs="+", help="Run only cases whose name contains one of these")
+    parser.add_argument("--min-time", type=float, default=None, help="Seconds to run each case (default 1, quick 0.2)")
+    parser.add_argument("--min-rounds", type=int, default=5, help="Minimum timed rounds per case")
+    parser.add_argument("--max-rounds", type=int, default=2000, help="Maximum timed rounds per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown against the baseline")
+    parser.add_argument("--write-corpus", type=Path, metavar="DIR", help="Write the fixture corpus to DIR and exit")
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        write_corpus(args.write_corpus)
+        return
+    if args.min_time is None:
+        args.min_time = 0.2 if args.quick else 1.0
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
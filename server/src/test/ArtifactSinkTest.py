@@ -0,0 +1,69 @@
+"""
+Tests for the debug artifact sink and where its counters are reported.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.config import settings
+from src.services import artifact_sink
+from src.services.artifact_sink import ArtifactSink
+from src.services.metrics import render_metrics
+
+
+@pytest.fixture
+def sink(tmp_path, monkeypatch):
+    """Install an enabled sink writing to a temporary directory."""
+    enabled = ArtifactSink(tmp_path, max_files=2, max_queue=8)
+    monkeypatch.setattr(artifact_sink, "_sink", enabled)
+    monkeypatch.setattr(artifact_sink, "_sink_created", True)
+    yield enabled
+    enabled.close()
+
+
+def test_writes_and_prunes_artifacts(sink, tmp_path):
+    for i in range(3):
+        assert sink.record("base", f"resume {i}", request_id=f"req{i}") == f"req{i}"
+    # Writes everything still queued before stopping the writer
+    sink.close()
+
+    names = sorted(path.name for path in tmp_path.glob("*.txt"))
+    assert len(names) == 2
+    assert names[-1].endswith("-req2-base.txt")
+    assert sink.stats()["written"] == 3
+    assert sink.stats()["pruned"] == 1
+
+
+def test_sampled_out_artifacts_are_counted(tmp_path):
+    sink = ArtifactSink(tmp_path, sample_rate=0)
+
+    assert sink.record("base", "resume", request_id="req") is None
+    assert sink.stats()["skipped"] == 1
+
+
+def test_counters_are_exported_as_metrics(sink):
+    sink.dropped = 4
+    sink.errors = 1
+
+    text = render_metrics()
+
+    assert "ats_artifacts_dropped_total 4" in text
+    assert "ats_artifact_write_errors_total 1" in text
+    assert "# TYPE ats_artifact_queue_depth gauge" in text
+
+
+def test_disabled_sink_exports_no_metrics(monkeypatch):
+    monkeypatch.setattr(artifact_sink, "_sink", None)
+    monkeypatch.setattr(artifact_sink, "_sink_created", True)
+
+    assert "ats_artifacts_" not in render_metrics()
+
+
+def test_admin_cache_stats_include_the_sink(sink, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    sink.dropped = 2
+
+    response = TestClient(main.app).get("/api/admin/caches", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.json()["artifactSink"]["dropped"] == 2
@@ -0,0 +1,102 @@
+"""
+Tests for the NDJSON batch keyword analysis endpoint.
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.config import settings
+
+
+RESUMES = [
+    "WORK EXPERIENCE\nSenior engineer building Python and Django services on AWS with Docker.",
+    "WORK EXPERIENCE\nFrontend developer working with React, TypeScript and Node.js.",
+    "WORK EXPERIENCE\nData analyst using SQL, Excel and Tableau for machine learning reports.",
+]
+
+JOBS = [
+    {"skills": ["Python", "Django", "Kubernetes"], "technologies": ["AWS", "Docker"]},
+    {"skills": ["React", "TypeScript"], "tools": ["Git"], "requirements": ["unit testing"]},
+    {"skills": ["SQL", "Tableau"], "qualifications": ["machine learning experience"]},
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def analyze_one(client, resume_text, job_data):
+    response = client.post("/api/analyze-keywords", json={"resume_text": resume_text, "job_data": job_data})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_one_resume_against_many_jobs(client):
+    response = client.post("/api/analyze-keywords/batch", json={"resume_text": RESUMES[0], "jobs": JOBS})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+
+    lines = read_ndjson(response)
+    assert sorted(line["index"] for line in lines) == list(range(len(JOBS)))
+    for line in lines:
+        result = {key: value for key, value in line.items() if key != "index"}
+        assert result == analyze_one(client, RESUMES[0], JOBS[line["index"]])
+
+
+def test_one_job_against_many_resumes(client):
+    response = client.post("/api/analyze-keywords/batch", json={"job_data": JOBS[0], "resumes": RESUMES})
+
+    assert response.status_code == 200
+    lines = read_ndjson(response)
+    assert sorted(line["index"] for line in lines) == list(range(len(RESUMES)))
+
+    scores = {line["index"]: line["matchScore"] for line in lines}
+    assert scores[0] > scores[1]
+    for line in lines:
+        result = {key: value for key, value in line.items() if key != "index"}
+        assert result == analyze_one(client, RESUMES[line["index"]], JOBS[0])
+
+
+def test_each_line_is_one_json_object(client):
+    response = client.post(
+        "/api/analyze-keywords/batch",
+        json={"resume_text": "WORK EXPERIENCE\nBuilt \"quoted\" tools\nwith C++ and Rust.", "jobs": JOBS[:2]}
+    )
+
+    raw_lines = response.text.split("\n")
+    assert raw_lines[-1] == ""
+    assert len(raw_lines) == 3
+    assert all(isinstance(json.loads(line), dict) for line in raw_lines[:-1])
+
+
+@pytest.mark.parametrize("payload", [
+    {"resume_text": RESUMES[0], "jobs": JOBS, "job_data": JOBS[0], "resumes": RESUMES},
+    {},
+    {"resume_text": RESUMES[0], "jobs": []},
+    {"job_data": JOBS[0], "resumes": []},
+    {"resume_text": "too short", "jobs": JOBS},
+    {"resume_text": RESUMES[0], "jobs": [JOBS[0], {}]},
+    {"job_data": JOBS[0], "resumes": [RESUMES[0], " "]},
+])
+def test_rejects_invalid_batches(client, payload):
+    response = client.post("/api/analyze-keywords/batch", json=payload)
+
+    assert response.status_code == 400
+
+
+def test_rejects_oversized_batches(client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_analysis_max_items", 2)
+    response = client.post("/api/analyze-keywords/batch", json={"resume_text": RESUMES[0], "jobs": JOBS})
+
+    assert response.status_code == 400
+    assert "maximum of 2" in response.json()["detail"]
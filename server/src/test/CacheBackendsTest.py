@@ -0,0 +1,187 @@
+"""
+Tests for the pluggable result cache backends.
+"""
+import asyncio
+import logging
+
+import pytest
+
+from src.services import cache_backends
+from src.services.cache_backends import (
+    CacheBackend,
+    InProcessCacheBackend,
+    SQLiteCacheBackend,
+    TieredCacheBackend,
+    create_cache_backend,
+)
+
+
+class FailingBackend(CacheBackend):
+    """Shared store that is down: every operation raises."""
+
+    name = "failing"
+
+    async def get(self, key):
+        raise ConnectionError("store unavailable")
+
+    async def set(self, key, value):
+        raise ConnectionError("store unavailable")
+
+    async def delete(self, key):
+        raise ConnectionError("store unavailable")
+
+    async def clear(self):
+        raise ConnectionError("store unavailable")
+
+
+class FakeClock:
+    """Stand-in for time.time() that only moves when told to."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_backends.time, "time", fake)
+    return fake
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_in_process_round_trip():
+    backend = InProcessCacheBackend("test_in_process_round_trip")
+
+    async def scenario():
+        await backend.set("key", {"score": 42, "phrases": ["python"]})
+        assert await backend.get("key") == {"score": 42, "phrases": ["python"]}
+        await backend.delete("key")
+        assert await backend.get("key") is None
+
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        await backend.clear()
+        assert await backend.get("a") is None
+        assert await backend.get("b") is None
+
+    asyncio.run(scenario())
+
+
+def test_in_process_evicts_least_recently_used():
+    backend = InProcessCacheBackend("test_in_process_evicts", max_entries=2)
+
+    async def scenario():
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        assert await backend.get("a") == 1  # "b" is now the least recently used
+        await backend.set("c", 3)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [1, None, 3]
+    assert backend.cache.stats()["evictions"] == 1
+
+
+def test_sqlite_round_trip_is_shared_through_the_file(tmp_path):
+    path = tmp_path / "results.sqlite3"
+    writer = SQLiteCacheBackend("analysis", path)
+    reader = SQLiteCacheBackend("analysis", path)
+    other_namespace = SQLiteCacheBackend("keywords", path)
+
+    async def scenario():
+        await writer.set("key", {"text": "Résumé ✓", "items": [1, 2]})
+        assert await reader.get("key") == {"text": "Résumé ✓", "items": [1, 2]}
+        assert await other_namespace.get("key") is None
+
+        await reader.delete("key")
+        assert await writer.get("key") is None
+
+        await writer.set("a", 1)
+        await other_namespace.set("a", 2)
+        await writer.clear()
+        assert await reader.get("a") is None
+        assert await other_namespace.get("a") == 2
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_ignores_expired_entries(tmp_path, clock):
+    backend = SQLiteCacheBackend("analysis", tmp_path / "results.sqlite3", ttl=60)
+
+    async def scenario():
+        await backend.set("key", "value")
+        clock.now += 59
+        fresh = await backend.get("key")
+        clock.now += 2
+        return fresh, await backend.get("key")
+
+    assert asyncio.run(scenario()) == ("value", None)
+
+
+def test_sqlite_prunes_oldest_entries_beyond_limit(tmp_path, clock):
+    backend = SQLiteCacheBackend("analysis", tmp_path / "results.sqlite3", max_entries=3)
+    backend.PRUNE_EVERY = 5
+
+    async def scenario():
+        for i in range(5):
+            clock.now += 1
+            await backend.set(f"key{i}", i)
+        return [await backend.get(f"key{i}") for i in range(5)]
+
+    assert asyncio.run(scenario()) == [None, None, 2, 3, 4]
+
+
+def test_tiered_reads_through_and_fills_local_tier(tmp_path):
+    local = InProcessCacheBackend("test_tiered_reads_through")
+    shared = SQLiteCacheBackend("test_tiered_reads_through", tmp_path / "results.sqlite3")
+    tiered = TieredCacheBackend(local, shared)
+
+    async def scenario():
+        await shared.set("key", [1, 2, 3])
+        assert await local.get("key") is None
+        assert await tiered.get("key") == [1, 2, 3]
+        assert await local.get("key") == [1, 2, 3]
+
+        await tiered.set("other", "value")
+        assert await shared.get("other") == "value"
+
+        await tiered.delete("other")
+        assert await local.get("other") is None
+        assert await shared.get("other") is None
+
+    asyncio.run(scenario())
+
+
+def test_tiered_falls_back_to_local_tier_when_shared_store_fails(caplog):
+    local = InProcessCacheBackend("test_tiered_falls_back")
+    tiered = TieredCacheBackend(local, FailingBackend())
+
+    async def scenario():
+        assert await tiered.get("missing") is None
+        await tiered.set("key", "value")
+        assert await tiered.get("key") == "value"
+        await tiered.delete("key")
+        await tiered.set("key", "value")
+        await tiered.clear()
+        return await local.get("key")
+
+    with caplog.at_level(logging.WARNING, logger=cache_backends.__name__):
+        assert asyncio.run(scenario()) is None
+
+    messages = [record.getMessage() for record in caplog.records]
+    for operation in ("read", "write", "delete", "clear"):
+        assert f"Shared cache 'test_tiered_falls_back' {operation} failed: store unavailable" in messages
+
+
+def test_memory_setting_creates_in_process_backend(monkeypatch):
+    monkeypatch.setattr(cache_backends.settings, "cache_backend", "memory")
+    backend = create_cache_backend("test_memory_setting", max_entries=4)
+
+    assert isinstance(backend, InProcessCacheBackend)
+    assert backend not in cache_backends.list_shared_backends()
@@ -0,0 +1,126 @@
+"""
+Tests for KeywordMatcher against the per-phrase regexes it replaced.
+"""
+import random
+import re
+
+import pytest
+
+from src.services.keyword_matcher import KeywordMatcher, get_matcher
+
+
+def regex_find(entries, text):
+    """The previous implementation: one search per pattern."""
+    found = set()
+    for pattern, key, word_boundary in entries:
+        if not pattern:
+            continue
+        if word_boundary:
+            if re.search(r'\b' + re.escape(pattern) + r'\b', text):
+                found.add(key)
+        elif pattern in text:
+            found.add(key)
+    return found
+
+
+WORD_BOUNDARY_CASES = [
+    # pattern, text
+    ("java", "java developer"),
+    ("java", "javascript developer"),
+    ("script", "javascript developer"),
+    ("sql", "mysql and postgresql"),
+    ("sql", "sql, nosql"),
+    ("python", "(python)"),
+    ("python", "python_3 scripts"),
+    ("python", "python3"),
+    ("c++", "c++ and c#"),
+    ("c++", "c++17"),
+    ("c++", "c++, java"),
+    ("c#", "c#."),
+    (".net", "asp.net core"),
+    (".net", "experience with .net"),
+    ("node.js", "node.js/express"),
+    ("node.js", "node.jsx"),
+    ("ci/cd", "ci/cd pipelines"),
+    ("machine learning", "machine learning engineer"),
+    ("machine learning", "machine  learning"),
+    ("résumé", "a résumé writer"),
+    ("café", "cafés"),
+    ("r", "r, python and sas"),
+    ("r", "our team"),
+    ("go", "go-to person"),
+    ("go", "golang"),
+    ("aws", "aws"),
+    ("aws", ""),
+]
+
+
+@pytest.mark.parametrize("pattern,text", WORD_BOUNDARY_CASES)
+def test_word_boundary_matches_regex(pattern, text):
+    entries = [(pattern, pattern, True)]
+
+    assert KeywordMatcher(entries).find(text) == regex_find(entries, text)
+
+
+@pytest.mark.parametrize("pattern,text", WORD_BOUNDARY_CASES)
+def test_substring_matches_in_operator(pattern, text):
+    entries = [(pattern, pattern, False)]
+
+    assert KeywordMatcher(entries).find(text) == regex_find(entries, text)
+
+
+def test_overlapping_and_nested_patterns():
+    entries = [
+        ("java", "java", True),
+        ("javascript", "javascript", True),
+        ("script", "script", True),
+        ("machine learning", "ml", True),
+        ("learning", "learning", True),
+        ("earn", "earn", False),
+    ]
+    text = "javascript and machine learning"
+
+    assert KeywordMatcher(entries).find(text) == regex_find(entries, text) == {
+        "javascript", "ml", "learning", "earn"
+    }
+
+
+def test_several_patterns_share_a_key():
+    entries = [("kubernetes", "k8s", True), ("k8s", "k8s", True), ("docker", "docker", True)]
+
+    assert KeywordMatcher(entries).find("deployed on k8s") == {"k8s"}
+
+
+def test_later_occurrence_matches_after_rejected_one():
+    entries = [("java", "java", True)]
+
+    assert KeywordMatcher(entries).find("javascript, then java") == {"java"}
+
+
+def test_matches_regex_on_random_text():
+    rng = random.Random(1234)
+    alphabet = "ab_.+ 1é"
+    patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)}
+    entries = [(pattern, pattern, rng.random() < 0.7) for pattern in sorted(patterns)]
+    matcher = KeywordMatcher(entries)
+
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert matcher.find(text) == regex_find(entries, text), text
+
+
+def test_patterns_added_after_build_are_found():
+    matcher = KeywordMatcher([("python", "python", True)])
+    matcher.add("docker", "docker")
+
+    assert matcher.find("python and docker") == {"python", "docker"}
+
+
+def test_empty_patterns_are_ignored():
+    assert KeywordMatcher([("", "empty", True)]).find("anything") == set()
+
+
+def test_get_matcher_reuses_compiled_matchers():
+    entries = [("get_matcher_test_pattern", "key", True)]
+
+    assert get_matcher(entries) is get_matcher(iter(entries))
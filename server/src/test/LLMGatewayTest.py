@@ -0,0 +1,153 @@
+"""
+Tests for the LLMGateway retry policy, against a fake OpenAI client.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from src.services import llm_gateway
+from src.services.llm_gateway import LLMGateway, LLMUnavailable
+
+
+REQUEST = httpx.Request("POST", "https://api.openai.test/v1/chat/completions")
+
+
+def status_error(error_class, status_code: int, headers=None):
+    """Build the openai exception the SDK raises for an HTTP error status."""
+    response = httpx.Response(status_code, headers=headers, request=REQUEST)
+    return error_class(f"HTTP {status_code}", response=response, body=None)
+
+
+class FakeCompletions:
+    """Answers create() calls from a script of results or exceptions."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def fake_client(*outcomes) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(outcomes)))
+
+
+def completion(content: str = "ok") -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of waiting for them."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(llm_gateway.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def chat(gateway: LLMGateway):
+    return asyncio.run(gateway.chat(model="gpt-test", messages=[{"role": "user", "content": "hi"}]))
+
+
+@pytest.mark.parametrize("error", [
+    status_error(openai.RateLimitError, 429),
+    status_error(openai.InternalServerError, 500),
+    status_error(openai.InternalServerError, 503),
+    openai.APIConnectionError(request=REQUEST),
+    openai.APITimeoutError(request=REQUEST),
+])
+def test_retries_transient_errors(error, sleeps):
+    client = fake_client(error, error, completion("done"))
+    gateway = LLMGateway(client=client, max_retries=3, backoff_base=0.5, backoff_max=8)
+
+    assert chat(gateway).choices[0].message.content == "done"
+    assert len(client.chat.completions.calls) == 3
+    assert len(sleeps) == 2
+    # Full jitter stays within the capped exponential delay of each attempt
+    assert 0 <= sleeps[0] <= 0.5
+    assert 0 <= sleeps[1] <= 1.0
+
+
+@pytest.mark.parametrize("error", [
+    status_error(openai.BadRequestError, 400),
+    status_error(openai.AuthenticationError, 401),
+    status_error(openai.PermissionDeniedError, 403),
+    status_error(openai.NotFoundError, 404),
+    status_error(openai.UnprocessableEntityError, 422),
+])
+def test_does_not_retry_client_errors(error, sleeps):
+    client = fake_client(error, completion())
+    gateway = LLMGateway(client=client, max_retries=3)
+
+    with pytest.raises(type(error)):
+        chat(gateway)
+    assert len(client.chat.completions.calls) == 1
+    assert sleeps == []
+
+
+def test_raises_last_error_when_retries_run_out(sleeps):
+    errors = [status_error(openai.InternalServerError, 502) for _ in range(3)]
+    client = fake_client(*errors)
+    gateway = LLMGateway(client=client, max_retries=2)
+
+    with pytest.raises(openai.InternalServerError) as excinfo:
+        chat(gateway)
+    assert excinfo.value is errors[-1]
+    assert len(client.chat.completions.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_backoff_is_capped(sleeps):
+    errors = [status_error(openai.RateLimitError, 429) for _ in range(6)]
+    client = fake_client(*errors, completion())
+    gateway = LLMGateway(client=client, max_retries=6, backoff_base=1.0, backoff_max=2.0)
+
+    chat(gateway)
+    assert len(sleeps) == 6
+    assert all(0 <= delay <= 2.0 for delay in sleeps)
+
+
+def test_honours_retry_after_header(sleeps):
+    client = fake_client(status_error(openai.RateLimitError, 429, headers={"retry-after": "3"}), completion())
+    gateway = LLMGateway(client=client, max_retries=1, backoff_max=8)
+
+    chat(gateway)
+    assert sleeps == [3.0]
+
+
+def test_retry_after_is_capped_by_backoff_max(sleeps):
+    client = fake_client(status_error(openai.RateLimitError, 429, headers={"retry-after": "120"}), completion())
+    gateway = LLMGateway(client=client, max_retries=1, backoff_max=8)
+
+    chat(gateway)
+    assert sleeps == [8.0]
+
+
+def test_passes_default_timeout_to_client(sleeps):
+    client = fake_client(completion())
+    gateway = LLMGateway(client=client, timeout=12.5)
+
+    chat(gateway)
+    assert client.chat.completions.calls[0]["timeout"] == 12.5
+
+
+def test_unavailable_without_key_or_client():
+    gateway = LLMGateway(api_key="")
+
+    assert not gateway.available
+    with pytest.raises(LLMUnavailable):
+        chat(gateway)
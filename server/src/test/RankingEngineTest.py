@@ -0,0 +1,122 @@
+"""
+Tests for CandidateIndex ranking.
+"""
+import asyncio
+import random
+
+import pytest
+
+from src.services.analysis_service import analyze_resume_against_job
+from src.services.ranking_engine import CandidateIndex, build_candidate_index, get_candidate_index
+
+
+JOB = {
+    "skills": ["Python", "Docker"],
+    "tools": ["Git"],
+    "requirements": ["machine learning"],
+    "qualifications": ["Kubernetes"],
+}
+
+
+def ranked_indexes(result):
+    return [ranking["index"] for ranking in result["rankings"]]
+
+
+def test_ranks_by_weighted_score():
+    index = CandidateIndex([
+        "Used Git daily.",  # weight 1.0
+        "Python, Docker and Git with machine learning and Kubernetes.",  # 4.25, everything
+        "Python and Docker.",  # 2.0
+        "Kubernetes clusters.",  # 0.5
+        "Python, Docker, Git and machine learning.",  # 3.75
+    ])
+
+    result = index.rank(JOB, top_k=5)
+
+    assert ranked_indexes(result) == [1, 4, 2, 0, 3]
+    assert [ranking["rank"] for ranking in result["rankings"]] == [1, 2, 3, 4, 5]
+    best = result["rankings"][0]
+    assert best["matchScore"] == 100.0
+    assert best["weightedScore"] == 100.0
+    assert best["missingPhrases"] == []
+    assert result["rankings"][-1]["matchingPhrases"] == ["Kubernetes"]
+
+
+def test_ties_break_by_match_score_then_input_order():
+    job = {"skills": ["Python"], "qualifications": ["Go", "Rust"]}
+    index = CandidateIndex([
+        "Go and Rust.",          # weighted 1.0 with two phrases
+        "Python.",               # weighted 1.0 with one phrase
+        "Rust and Go.",          # same as 0
+        "Nothing relevant.",
+        "Python.",               # same as 1
+    ])
+
+    assert ranked_indexes(index.rank(job, top_k=5)) == [0, 2, 1, 4, 3]
+
+
+@pytest.mark.parametrize("top_k", [1, 2, 3, 4])
+def test_top_k_picks_tied_candidates_in_input_order(top_k):
+    index = CandidateIndex(["Python and Docker."] * 4 + ["Docker only."])
+
+    assert ranked_indexes(index.rank({"skills": ["Python", "Docker"]}, top_k=top_k)) == list(range(top_k))
+
+
+def test_top_k_matches_full_ranking_prefix():
+    rng = random.Random(7)
+    words = ["python", "docker", "git", "kubernetes", "machine", "learning", "java", "team", "built"]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 12))) for _ in range(300)]
+    index = CandidateIndex(texts)
+
+    full = ranked_indexes(index.rank(JOB, top_k=len(texts)))
+    for top_k in (1, 7, 50, 299):
+        assert ranked_indexes(index.rank(JOB, top_k=top_k)) == full[:top_k]
+
+
+def test_matches_keyword_analysis():
+    job = {
+        "skills": ["C++", "Node.js", "CI/CD", "Python"],
+        "tools": ["Git"],
+        "requirements": ["project management", "machine learning models"],
+    }
+    resumes = [
+        "Managed the project with C++ and git.",
+        "node.js services, Python scripts",
+        "Built machine learning models; management of the project plan.",
+        "Plain text.",
+    ]
+
+    rankings = {ranking["index"]: ranking for ranking in CandidateIndex(resumes).rank(job, top_k=4)["rankings"]}
+
+    for i, resume in enumerate(resumes):
+        analysis = asyncio.run(analyze_resume_against_job(resume, job))
+        assert sorted(rankings[i]["matchingPhrases"]) == sorted(analysis["matchingPhrases"])
+        assert rankings[i]["matchScore"] == analysis["matchScore"]
+
+
+def test_explicit_weights_override_field_weights():
+    index = CandidateIndex(["Python.", "Kubernetes."])
+
+    result = index.rank({"skills": ["Python"], "qualifications": ["Kubernetes"]}, weights={"Kubernetes": 5.0})
+
+    assert ranked_indexes(result) == [1, 0]
+
+
+def test_candidate_ids_and_empty_jobs():
+    index = CandidateIndex(["Python.", "Docker."], candidate_ids=["alice", "bob"])
+
+    assert index.rank({"skills": ["Docker"]}, top_k=1)["rankings"][0]["candidateId"] == "bob"
+    assert index.rank({}, top_k=2) == {"totalKeywords": 0, "totalCandidates": 2, "rankings": []}
+
+    with pytest.raises(ValueError):
+        CandidateIndex(["Python."], candidate_ids=["alice", "bob"])
+
+
+def test_build_candidate_index_reuses_cached_pool():
+    resumes = ["RankingEngineTest resume one with Python.", "RankingEngineTest resume two with Docker."]
+
+    index = build_candidate_index(resumes, ["a", "b"])
+
+    assert build_candidate_index(resumes, ["a", "b"]) is index
+    assert get_candidate_index(index.index_id) is index
+    assert build_candidate_index(resumes, ["b", "a"]) is not index
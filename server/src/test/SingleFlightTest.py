@@ -0,0 +1,155 @@
+"""
+Tests for request coalescing with SingleFlight.
+"""
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+class Work:
+    """Async work that blocks until released and counts its executions."""
+
+    def __init__(self, result="result"):
+        self.result = result
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test_concurrent_calls_share")
+
+    async def scenario():
+        work = Work()
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+        await work.started.wait()
+        assert len(flight) == 1
+        work.release.set()
+        return work, await asyncio.gather(*callers)
+
+    work, results = asyncio.run(scenario())
+    assert results == ["result"] * 5
+    assert work.calls == 1
+    assert len(flight) == 0
+    assert flight.stats()["executions"] == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight("test_different_keys")
+
+    async def scenario():
+        first, second = Work("first"), Work("second")
+        first.release.set()
+        second.release.set()
+        return await asyncio.gather(flight.do("a", first), flight.do("b", second)), first, second
+
+    results, first, second = asyncio.run(scenario())
+    assert results == ["first", "second"]
+    assert first.calls == second.calls == 1
+
+
+def test_finished_call_is_not_reused():
+    flight = SingleFlight("test_finished_call")
+
+    async def scenario():
+        work = Work()
+        work.release.set()
+        await flight.do("key", work)
+        await flight.do("key", work)
+        return work
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_exception_reaches_every_caller():
+    flight = SingleFlight("test_exception_reaches")
+
+    async def scenario():
+        work = Work(ValueError("boom"))
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(3)]
+        await work.started.wait()
+        work.release.set()
+        return work, await asyncio.gather(*callers, return_exceptions=True)
+
+    work, results = asyncio.run(scenario())
+    assert work.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+def test_cancelling_one_caller_does_not_cancel_the_others():
+    flight = SingleFlight("test_cancelling_one")
+
+    async def scenario():
+        work = Work()
+        leaving = asyncio.create_task(flight.do("key", work))
+        staying = asyncio.create_task(flight.do("key", work))
+        await work.started.wait()
+
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+        work.release.set()
+        return work, await staying
+
+    work, result = asyncio.run(scenario())
+    assert result == "result"
+    assert not work.cancelled
+    assert work.calls == 1
+
+
+def test_cancelling_every_caller_cancels_the_work():
+    flight = SingleFlight("test_cancelling_every")
+
+    async def scenario():
+        work = Work()
+        callers = [asyncio.create_task(flight.do("key", work)) for _ in range(2)]
+        await work.started.wait()
+
+        for caller in callers:
+            caller.cancel()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        # Let the cancelled execution run its handlers
+        await asyncio.sleep(0)
+        return work, results
+
+    work, results = asyncio.run(scenario())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert work.cancelled
+    assert len(flight) == 0
+
+
+def test_claim_and_publish_share_batched_results():
+    flight = SingleFlight("test_claim_and_publish")
+
+    async def scenario():
+        led, joined = flight.claim(["python", "java"])
+        assert set(led) == {"python", "java"} and joined == {}
+
+        led_again, joined_again = flight.claim(["java", "docker"])
+        assert set(led_again) == {"docker"} and set(joined_again) == {"java"}
+
+        flight.publish(led, {"python": ["py"], "java": ["jdk"]})
+        flight.publish(led_again, {})
+        return await joined_again["java"], await led_again["docker"]
+
+    assert asyncio.run(scenario()) == (["jdk"], None)
+    assert len(flight) == 0
+    assert flight.stats()["coalesced"] == 1
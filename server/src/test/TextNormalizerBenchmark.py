@@ -0,0 +1,91 @@
+"""
+Micro-benchmark for the text normalization engine.
+
+Builds large synthetic resumes with the artifacts the normalizers handle
+(mixed bullets, tabs and runs of spaces, CRLF line endings, curly quotes,
+zero-width characters, mojibake and glued section headers) and reports the
+throughput of each normalizer in MB/s.
+
+Usage (from the server directory):
+    python -m src.test.TextNormalizerBenchmark [--sizes 1 8] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from src.services.text_normalizer import clean_encoding_artifacts, normalize_bullets, normalize_extracted_text
+
+
+EXTRACTED_LINES = [
+    "PROFESSIONAL EXPERIENCES",
+    "Senior Software Engineer\t\tAcme Corp  –  2019 – Present",
+    "•   Built a distributed ingestion pipeline in Python and Kafka",
+    "- Reduced p99 latency by 40% across “critical” services",
+    "▪  Led a team of 6 engineers\u200b delivering the company’s API",
+    "o Migrated infrastructure to Kubernetes on AWS",
+    "    · Mentored interns on testing and code review",
+    "\ufeffEDUCATION",
+    "B.S. Computer Science — State University",
+    "",
+    "",
+    "",
+    "TECHNICAL SKILLS: Python, Go, SQL, Docker, Terraform",
+]
+
+GENERATED_LINES = [
+    "PROFESSIONAL   EXPERIENCES",
+    "• %ÏDesigned event-driven services handling 2M requests/day",
+    "â€¢ Improved build times by 3x with caching â€“ CI and CD",
+    "Owned the on-call rotationâ€™s tooling• Automated incident reports",
+    "Shipped features end to end  \t for 4 product teamsTECHNICAL PROJECTS",
+    "● Open-source contributor to a â€œpopularâ€\u009d parser",
+    "  ",
+    "EDUCATION",
+]
+
+
+def build_text(lines: List[str], size_bytes: int, line_ending: str, seed: int = 7) -> str:
+    """Return text of roughly ``size_bytes`` UTF-8 bytes made of shuffled sample lines."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size_bytes:
+        line = rng.choice(lines)
+        parts.append(line)
+        total += len(line.encode("utf-8")) + len(line_ending)
+    return line_ending.join(parts)
+
+
+def measure(fn: Callable[[str], str], text: str, repeat: int) -> float:
+    """Return the best throughput of ``fn`` over ``repeat`` runs, in MB/s."""
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8], help="Input sizes in MB")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    benchmarks = [
+        ("normalize_extracted_text", normalize_extracted_text, EXTRACTED_LINES, "\r\n"),
+        ("normalize_bullets", normalize_bullets, EXTRACTED_LINES, "\n"),
+        ("clean_encoding_artifacts", clean_encoding_artifacts, GENERATED_LINES, "\n"),
+    ]
+
+    print(f"{'normalizer':<28}{'size':>8}{'MB/s':>12}")
+    for size in args.sizes:
+        for name, fn, lines, line_ending in benchmarks:
+            text = build_text(lines, size * 1024 * 1024, line_ending)
+            print(f"{name:<28}{size:>6}MB{measure(fn, text, args.repeat):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Shared test setup.
+
+Settings are read from the environment when src.config is first imported,
+so the environment is fixed here, before any test module imports the app:
+caches stay in process memory, nothing is written under server/.cache and no
+OpenAI key is configured, so the services use their rule-based paths.
+"""
+import os
+
+
+os.environ.update({
+    "CACHE_BACKEND": "memory",
+    "EXTRACTION_CACHE_BACKEND": "memory",
+    "SKILL_VARIATION_STORE_PATH": "",
+    "ARTIFACT_SINK_ENABLED": "false",
+    "OPENAI_API_KEY": "",
+    "ADMIN_TOKEN": "",
+})